@@ -0,0 +1,69 @@
+"""Scaling benchmark for the keyword fallback extractor.
+
+Runs `_extract_with_keywords` on synthetic text of increasing size where every
+field keyword and title marker only appears at the very end. That forces a
+full scan, which is the worst case for the single-pass matcher. Throughput
+should stay flat as the input grows, i.e. cost is linear in its size.
+
+    python -m benchmarks.keyword_matcher --sizes 1 5 10 25 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from project_agents.intake.analyzer import _extract_with_keywords
+
+_FILLER = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+    "Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.\n"
+)
+_TAIL = (
+    "The project called Atlas is a scheduling assistant for dental clinics. "
+    "The problem is churn. Our solution is reminders. Users are clinic staff. "
+    "Success is retention. The main risk is adoption. Timeline is Q3. "
+    "Resources include the pilot report.\n"
+)
+
+
+def synthetic_text(megabytes: float) -> str:
+    target = int(megabytes * 1024 * 1024)
+    repeats = max(target - len(_TAIL), 0) // len(_FILLER) + 1
+    return _FILLER * repeats + _TAIL
+
+
+def run(sizes: list[float], repeat: int) -> list[dict[str, float]]:
+    results = []
+    for size in sizes:
+        text = synthetic_text(size)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            summary = _extract_with_keywords(text)
+            timings.append(time.perf_counter() - started)
+        assert summary.problem == "The problem is churn", summary.problem
+        best = min(timings)
+        megabytes = len(text) / (1024 * 1024)
+        results.append(
+            {"megabytes": megabytes, "seconds": best, "mb_per_second": megabytes / best}
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    print(f"{'size (MB)':>10} {'seconds':>10} {'MB/s':>10}")
+    for row in results:
+        print(f"{row['megabytes']:>10.1f} {row['seconds']:>10.4f} {row['mb_per_second']:>10.1f}")
+    rates = [row["mb_per_second"] for row in results]
+    print(f"throughput spread (max/min): {max(rates) / min(rates):.2f}x; ~1x means linear")
+
+
+if __name__ == "__main__":
+    main()
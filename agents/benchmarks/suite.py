@@ -0,0 +1,137 @@
+"""Micro-benchmarks for the agents hot paths.
+
+    python -m benchmarks.suite                       # compare with baseline.json
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --update-baseline
+
+The full-workflow cases run against a stubbed OpenAI endpoint (an
+`httpx.MockTransport`) and an `InMemorySaver`, so they measure our own
+overhead rather than network or database latency.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable
+
+import httpx
+from langgraph.checkpoint.memory import InMemorySaver
+from project_brief_common.benchmarks import Case, main
+
+from project_agents.brief.formatter import build_brief
+from project_agents.config.settings import Settings
+from project_agents.graphs import checkpointing
+from project_agents.graphs.registry import clear_graph_registry
+from project_agents.graphs.state import initialize_state
+from project_agents.intake.analyzer import analyze_prompt
+from project_agents.llm import LLMClient
+from project_agents.llm import client as llm_client_module
+from project_agents.models import SummaryPayload
+from project_agents.service import run_project_brief_workflow
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+_PARAGRAPH = (
+    "The project called Atlas is a scheduling assistant for dental clinics. "
+    "The main problem is patient churn after the first visit. Our solution is "
+    "automated reminders and easy rebooking. Target users are clinic front-desk "
+    "staff and patients. Success is measured by 90-day retention. The biggest "
+    "risk is adoption by older staff. The timeline is a pilot in Q3.\n\n"
+)
+
+_EXTRACTION = {
+    "project_title": "Atlas",
+    "problem": "Patient churn after the first visit",
+    "solution": "Automated reminders and easy rebooking",
+    "target_users": ["front-desk staff", "patients"],
+    "success_metrics": ["90-day retention"],
+    "constraints": ["adoption by older staff"],
+    "timeline": "Pilot in Q3",
+    "resources": [],
+}
+
+
+def _text_of_size(size: int) -> str:
+    return (_PARAGRAPH * (size // len(_PARAGRAPH) + 1))[:size]
+
+
+def _stub_completion(request: httpx.Request) -> httpx.Response:
+    body = json.loads(request.content)
+    if body.get("response_format"):
+        content = json.dumps(_EXTRACTION)
+    else:
+        content = "Thanks! What budget and team do you have for the pilot?"
+    return httpx.Response(
+        200,
+        json={
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": content},
+                }
+            ],
+        },
+    )
+
+
+def _use_llm(enabled: bool) -> None:
+    settings = Settings(
+        OPENAI_API_KEY="bench-key" if enabled else "",
+        LLM_CACHE_ENABLED=False,
+    )
+    llm_client_module._client = LLMClient(  # noqa: SLF001 - benchmark wiring
+        settings, transport=httpx.MockTransport(_stub_completion)
+    )
+
+
+def _use_memory_checkpointer() -> None:
+    checkpointing._saver = InMemorySaver()  # noqa: SLF001 - benchmark wiring
+    clear_graph_registry()
+
+
+def _keyword_case(size: int) -> Callable[[], None]:
+    text = _text_of_size(size)
+    _use_llm(False)
+    return lambda: analyze_prompt(text, ["notes.pdf"])
+
+
+def _workflow_case() -> Callable[[], None]:
+    conversation = [
+        {"role": "user", "content": _PARAGRAPH},
+        {"role": "assistant", "content": "Thanks! Who will use it day to day?"},
+        {"role": "user", "content": "Front-desk staff at 40 clinics."},
+    ]
+    _use_llm(True)
+    _use_memory_checkpointer()
+    return lambda: run_project_brief_workflow(conversation)
+
+
+def build_cases() -> list[Case]:
+    summary = SummaryPayload(**_EXTRACTION, documents=["notes.pdf"])
+    conversation = [
+        {"role": "user" if index % 2 == 0 else "assistant", "content": _PARAGRAPH}
+        for index in range(20)
+    ]
+    documents = [{"id": f"doc-{index}", "name": f"doc-{index}.pdf"} for index in range(5)]
+
+    return [
+        ("agents.analyze_prompt.keywords.1kb", lambda: _keyword_case(1_000)),
+        ("agents.analyze_prompt.keywords.100kb", lambda: _keyword_case(100_000)),
+        ("agents.analyze_prompt.keywords.1mb", lambda: _keyword_case(1_000_000)),
+        ("agents.build_brief", lambda: lambda: build_brief(summary)),
+        (
+            "agents.initialize_state.20_turns",
+            lambda: lambda: initialize_state(conversation, documents),
+        ),
+        ("agents.workflow.stubbed_llm", _workflow_case),
+    ]
+
+
+if __name__ == "__main__":
+    main("agents", build_cases(), BASELINE)
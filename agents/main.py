@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 from pathlib import Path
 
+from project_agents.batch import run_batch
 from project_agents.service import run_project_brief_workflow
 
 
@@ -42,6 +44,60 @@ def parse_args() -> argparse.Namespace:
         help="Path to a file containing the user prompt.",
     )
 
+    batch_parser = subparsers.add_parser(
+        "run-batch",
+        help="Execute the workflow for every line of a JSONL file.",
+    )
+    batch_parser.add_argument(
+        "--input",
+        dest="input_path",
+        type=Path,
+        required=True,
+        help='JSONL file with one {"prompt": ...} or {"conversation": [...]} per line.',
+    )
+    batch_parser.add_argument(
+        "--output",
+        dest="output_path",
+        type=Path,
+        required=True,
+        help="JSONL file receiving one result per input line.",
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Maximum number of workflows running concurrently.",
+    )
+
+    standin_parser = subparsers.add_parser(
+        "llm-standin",
+        help="Start a local OpenAI-compatible stand-in for load testing.",
+    )
+    standin_parser.add_argument("--host", default="127.0.0.1")
+    standin_parser.add_argument("--port", type=int, default=8090)
+    standin_parser.add_argument(
+        "--latency-ms", type=float, default=300.0, help="Median time to first token."
+    )
+    standin_parser.add_argument(
+        "--latency-distribution",
+        choices=["fixed", "uniform", "lognormal"],
+        default="lognormal",
+    )
+    standin_parser.add_argument(
+        "--latency-spread",
+        type=float,
+        default=0.5,
+        help="Lognormal sigma, or the +/- fraction of the latency for uniform.",
+    )
+    standin_parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    standin_parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of requests failing with 500."
+    )
+    standin_parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="Share of requests failing with 429."
+    )
+    standin_parser.add_argument("--seed", type=int, default=None)
+
     parser.set_defaults(command="serve")
     return parser.parse_args()
 
@@ -59,6 +115,28 @@ def main() -> None:
         )
         return
 
+    if args.command == "llm-standin":
+        import uvicorn
+
+        from project_agents.llm.standin import StandInConfig, create_standin_app
+
+        config = StandInConfig(
+            latency_ms=args.latency_ms,
+            latency_distribution=args.latency_distribution,
+            latency_spread=args.latency_spread,
+            tokens_per_second=args.tokens_per_second,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            seed=args.seed,
+        )
+        uvicorn.run(create_standin_app(config), host=args.host, port=args.port)
+        return
+
+    if args.command == "run-batch":
+        summary = asyncio.run(run_batch(args.input_path, args.output_path, args.workers))
+        print(summary.format())  # noqa: T201
+        return
+
     input_text = args.input_text
     if not input_text and args.input_file:
         input_text = args.input_file.read_text(encoding="utf-8")
@@ -66,7 +144,7 @@ def main() -> None:
     if not input_text:
         raise SystemExit("Provide --input or --input-file.")
 
-    state = run_project_brief_workflow(input_text)
+    state = run_project_brief_workflow([{"role": "user", "content": input_text}])
     print(json.dumps(state, indent=2, ensure_ascii=False))  # noqa: T201
 
 
@@ -0,0 +1,155 @@
+"""Run the brief workflow over a JSONL file of projects.
+
+Each input line is either ``{"prompt": "..."}`` or a workflow payload with
+``conversation`` (and optionally ``documents`` and ``thread_id``); an ``id``
+key is echoed back so results can be joined to their inputs. Lines are read
+lazily, at most ``workers`` workflows run at once, and each result is written
+as soon as it finishes, so memory stays flat for arbitrarily large inputs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import time
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple, TextIO
+
+from project_agents.service import arun_project_brief_workflow
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSummary(NamedTuple):
+    """Throughput and latency figures for a finished batch."""
+
+    total: int
+    succeeded: int
+    failed: int
+    elapsed_seconds: float
+    latencies_ms: list[float]
+
+    @property
+    def runs_per_second(self) -> float:
+        return self.total / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Nearest-rank percentile of the run latencies, in milliseconds."""
+
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def format(self) -> str:
+        return (
+            f"{self.total} runs ({self.succeeded} ok, {self.failed} failed) in "
+            f"{self.elapsed_seconds:.2f}s: {self.runs_per_second:.2f} runs/sec, "
+            f"p50 {self.percentile(50):.0f} ms, p95 {self.percentile(95):.0f} ms, "
+            f"p99 {self.percentile(99):.0f} ms"
+        )
+
+
+async def run_batch(input_path: Path, output_path: Path, workers: int) -> BatchSummary:
+    """Execute one workflow per input line and write one result line each.
+
+    Output lines are ``{"id", "line", "ok", "latency_ms"}`` plus ``result`` on
+    success or ``error`` on failure, in completion order.
+    """
+
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+
+    slots = asyncio.Semaphore(workers)
+    pending: set[asyncio.Task[None]] = set()
+    latencies: list[float] = []
+    counts = {"ok": 0, "failed": 0}
+    started = time.perf_counter()
+
+    with input_path.open(encoding="utf-8") as source, output_path.open(
+        "w", encoding="utf-8"
+    ) as sink:
+
+        async def _run(line_number: int, record: dict[str, Any] | None, error: str | None) -> None:
+            try:
+                row = await _execute(line_number, record, error)
+                latencies.append(row["latency_ms"])
+                counts["ok" if row["ok"] else "failed"] += 1
+                _write(sink, row)
+            finally:
+                slots.release()
+
+        for line_number, record, error in _read_records(source):
+            # Acquire before creating the task so unread lines stay on disk.
+            await slots.acquire()
+            task = asyncio.create_task(_run(line_number, record, error))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+
+    return BatchSummary(
+        total=counts["ok"] + counts["failed"],
+        succeeded=counts["ok"],
+        failed=counts["failed"],
+        elapsed_seconds=time.perf_counter() - started,
+        latencies_ms=latencies,
+    )
+
+
+def _read_records(source: TextIO) -> Iterator[tuple[int, dict[str, Any] | None, str | None]]:
+    for line_number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_number, None, f"invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "each line must be a JSON object"
+            continue
+        yield line_number, record, None
+
+
+async def _execute(
+    line_number: int, record: dict[str, Any] | None, error: str | None
+) -> dict[str, Any]:
+    row: dict[str, Any] = {
+        "id": record.get("id") if record else None,
+        "line": line_number,
+    }
+    started = time.perf_counter()
+    if record is not None:
+        try:
+            result = await arun_project_brief_workflow(
+                _conversation(record),
+                documents=record.get("documents"),
+                thread_id=record.get("thread_id"),
+            )
+            row.update(ok=True, result=result)
+        except Exception as exc:  # noqa: BLE001 - one bad line must not stop the batch
+            logger.warning("Batch line %d failed: %s", line_number, exc)
+            error = str(exc)
+    if error is not None:
+        row.update(ok=False, error=error)
+    row["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return row
+
+
+def _conversation(record: dict[str, Any]) -> list[dict[str, str]]:
+    conversation = record.get("conversation")
+    if conversation:
+        return conversation
+    prompt = record.get("prompt")
+    if not prompt:
+        raise ValueError("each line needs a prompt or a conversation.")
+    return [{"role": "user", "content": prompt}]
+
+
+def _write(sink: TextIO, row: dict[str, Any]) -> None:
+    sink.write(json.dumps(row, ensure_ascii=False) + "\n")
+    sink.flush()
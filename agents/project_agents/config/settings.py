@@ -2,6 +2,7 @@
 
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -19,11 +20,45 @@ class Settings(BaseSettings):
     environment: str = Field(default="development", alias="ENVIRONMENT")
     openai_api_key: str = Field(default="", alias="OPENAI_API_KEY")
 
+    llm_base_url: str = Field(
+        default="",
+        alias="LLM_BASE_URL",
+        description="OpenAI-compatible endpoint; empty means the official API.",
+    )
+    llm_model: str = Field(default="gpt-4o-mini", alias="LLM_MODEL")
+
+    llm_timeout_seconds: float = Field(default=30.0, alias="LLM_TIMEOUT_SECONDS")
+    llm_max_retries: int = Field(default=3, alias="LLM_MAX_RETRIES")
+    llm_backoff_base_seconds: float = Field(
+        default=0.5, alias="LLM_BACKOFF_BASE_SECONDS"
+    )
+    llm_backoff_max_seconds: float = Field(default=8.0, alias="LLM_BACKOFF_MAX_SECONDS")
+    llm_max_in_flight: int = Field(default=16, alias="LLM_MAX_IN_FLIGHT")
+    llm_max_connections: int = Field(default=32, alias="LLM_MAX_CONNECTIONS")
+    llm_max_keepalive_connections: int = Field(
+        default=16, alias="LLM_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    llm_keepalive_expiry_seconds: float = Field(
+        default=30.0, alias="LLM_KEEPALIVE_EXPIRY_SECONDS"
+    )
+
+    llm_cache_enabled: bool = Field(default=True, alias="LLM_CACHE_ENABLED")
+    llm_cache_max_entries: int = Field(default=1024, alias="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_ttl_seconds: int = Field(default=3600, alias="LLM_CACHE_TTL_SECONDS")
+    llm_cache_mongo_enabled: bool = Field(default=True, alias="LLM_CACHE_MONGO_ENABLED")
+    llm_cache_collection: str = Field(default="llm_cache", alias="LLM_CACHE_COLLECTION")
+    llm_cache_mongo_timeout_ms: int = Field(
+        default=2000, alias="LLM_CACHE_MONGO_TIMEOUT_MS"
+    )
+
     mongo_uri: str = Field(
         default="mongodb://localhost:27017/project_brief", alias="MONGODB_URI"
     )
     mongo_database: str = Field(default="project_brief", alias="MONGODB_DATABASE")
     mongo_collection: str = Field(default="agent_state", alias="MONGODB_COLLECTION")
+    document_pages_mongo_timeout_ms: int = Field(
+        default=2000, alias="DOCUMENT_PAGES_MONGO_TIMEOUT_MS"
+    )
 
     uploads_dir: Path = Field(
         default=Path("/var/project-brief/uploads"), alias="UPLOADS_DIR"
@@ -38,6 +73,35 @@ class Settings(BaseSettings):
         alias="BRIEF_SYSTEM_PROMPT_PATH",
     )
 
+    intake_mode: Literal["two_call", "fused"] = Field(
+        default="two_call", alias="INTAKE_MODE"
+    )
+
+    intake_input_token_budget: int = Field(
+        default=6000, alias="INTAKE_INPUT_TOKEN_BUDGET"
+    )
+    intake_chunk_tokens: int = Field(default=400, alias="INTAKE_CHUNK_TOKENS")
+    intake_retrieval_top_k: int = Field(default=3, alias="INTAKE_RETRIEVAL_TOP_K")
+
+    graph_warmup_enabled: bool = Field(default=False, alias="GRAPH_WARMUP_ENABLED")
+
+    trace_exporter: Literal["none", "file", "otlp"] = Field(
+        default="none", alias="TRACE_EXPORTER"
+    )
+    trace_file: Path = Field(default=Path("traces.jsonl"), alias="TRACE_FILE")
+    trace_otlp_endpoint: str = Field(
+        default="http://localhost:4318/v1/traces", alias="TRACE_OTLP_ENDPOINT"
+    )
+
+    profiling_token: str = Field(
+        default="",
+        alias="PROFILING_TOKEN",
+        description="Secret enabling per-request profiling; empty disables it.",
+    )
+    profiling_interval_ms: float = Field(default=5.0, alias="PROFILING_INTERVAL_MS")
+    profiling_dir: Path = Field(default=Path("profiles"), alias="PROFILING_DIR")
+    profiling_max_files: int = Field(default=100, alias="PROFILING_MAX_FILES")
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -1,7 +1,7 @@
 """Graph utilities exported for external usage."""
 
+from .registry import get_project_brief_graph
 from .workflow import build_project_brief_graph
 
-__all__ = ["build_project_brief_graph"]
-
+__all__ = ["build_project_brief_graph", "get_project_brief_graph"]
 
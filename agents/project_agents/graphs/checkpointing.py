@@ -1,5 +1,7 @@
 """Checkpointing utilities for LangGraph workflows."""
 
+import asyncio
+import threading
 from contextlib import AbstractContextManager
 from typing import Optional
 
@@ -13,6 +15,7 @@ from project_agents.config.settings import get_settings
 CheckpointType = Optional[MongoDBSaver | InMemorySaver]
 
 _saver: CheckpointType = None
+_saver_lock = threading.Lock()
 
 
 def get_checkpointer() -> MongoDBSaver | InMemorySaver:
@@ -20,20 +23,35 @@ def get_checkpointer() -> MongoDBSaver | InMemorySaver:
     global _saver  # noqa: PLW0603 - module-level cache
 
     if _saver is None:
-        settings = get_settings()
-        try:
-            _mongo_saver = MongoDBSaver.from_conn_string(
-                connection_string=settings.mongo_uri,
-                database_name=settings.mongo_database,
-                collection_name=settings.mongo_collection,
-            )
-            _mongo_saver.setup()
-            _saver = _mongo_saver
-        except (PyMongoError, Exception):  # noqa: BLE001 - fallback to in-memory
-            _saver = InMemorySaver()
+        with _saver_lock:
+            if _saver is None:
+                settings = get_settings()
+                try:
+                    _mongo_saver = MongoDBSaver.from_conn_string(
+                        connection_string=settings.mongo_uri,
+                        database_name=settings.mongo_database,
+                        collection_name=settings.mongo_collection,
+                    )
+                    _mongo_saver.setup()
+                    _saver = _mongo_saver
+                except (PyMongoError, Exception):  # noqa: BLE001 - fallback to in-memory
+                    _saver = InMemorySaver()
     return _saver
 
 
+async def aget_checkpointer() -> MongoDBSaver | InMemorySaver:
+    """Return the singleton saver without blocking the event loop.
+
+    Connecting to MongoDB is blocking I/O, so the first call is resolved in a
+    worker thread. Graphs driven through `ainvoke` use the saver's async
+    interface (`aget_tuple`/`aput`/`aput_writes`) afterwards.
+    """
+
+    if _saver is not None:
+        return _saver
+    return await asyncio.to_thread(get_checkpointer)
+
+
 def close_checkpointer() -> None:
     """Close the underlying MongoDB saver."""
     global _saver  # noqa: PLW0603
@@ -2,60 +2,298 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+from typing import Callable, NamedTuple
+
 from langchain_core.messages import AIMessage
-from langchain_core.runnables import RunnableLambda
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langgraph.config import get_stream_writer
 
 from project_agents.brief.formatter import build_brief
-from project_agents.graphs.state import ProjectState
-from project_agents.intake.analyzer import analyze_prompt
-from project_agents.intake.tone import generate_follow_up_message
+from project_agents.config.settings import get_settings
+from project_agents.graphs.state import DocumentReference, ProjectState
+from project_agents.intake.analyzer import aanalyze_prompt, analyze_prompt
+from project_agents.intake.chunking import DroppedChunk, assemble_prompt
+from project_agents.intake.fused import arun_fused_intake, run_fused_intake
+from project_agents.intake import pages
+from project_agents.intake.pages import MissingPagesError, PagedText
+from project_agents.intake.retrieval import select_passages
+from project_agents.intake.tone import (
+    agenerate_follow_up_message,
+    generate_follow_up_message,
+)
+from project_agents.metrics import NODE_SECONDS
 from project_agents.models import LovableBrief, SummaryPayload
+from project_agents.tracing import start_span
+
+logger = logging.getLogger(__name__)
 
 
 def build_intake_node() -> RunnableLambda:
-    """Return a runnable that summarizes intake conversations."""
+    """Return a runnable that summarizes intake conversations.
+
+    The runnable exposes both a sync and an async implementation so the graph
+    can be driven with either `invoke` or `ainvoke`. With ``INTAKE_MODE=fused``
+    extraction and the assistant reply come from a single LLM call.
+
+    Intake is incremental: only user turns and documents added since the last
+    checkpoint for the thread are analyzed, and the findings are merged into
+    the checkpointed summary. Runs configured with ``stream_tokens`` emit the
+    assistant reply token by token on the graph's custom stream. The async
+    path selects document evidence and assembles the prompt in worker threads.
+    """
 
     def _run(state: ProjectState) -> ProjectState:
-        conversation = state.get("conversation", [])
-        documents = state.get("documents", [])
-        user_messages = [
-            turn["content"]
-            for turn in conversation
-            if turn.get("role", "user").lower() == "user"
-        ]
-        document_texts = [doc.get("text", "") for doc in documents if doc.get("text")]
-        prompt_segments = user_messages + document_texts
-        prompt_text = "\n".join(segment for segment in prompt_segments if segment)
-        document_names = [doc.get("name", "") or doc.get("id", "") for doc in documents]
-
-        summary_payload, follow_ups, insights = analyze_prompt(prompt_text, document_names)
-        assistant_text = generate_follow_up_message(summary_payload, follow_ups, insights)
-        summary_message = AIMessage(content=assistant_text, name="intake_agent")
-
-        return {
-            "messages": state.get("messages", []) + [summary_message],
-            "conversation": conversation,
-            "documents": documents,
-            "summary": summary_payload.model_dump(),
-            "follow_up_questions": follow_ups,
-            "assistant_message": assistant_text,
-        }
-
-    return RunnableLambda(_run)
+        with NODE_SECONDS.labels(node="intake_agent").time(), start_span("node intake_agent"):
+            delta = _intake_delta(state)
+            if get_settings().intake_mode == "fused":
+                summary_payload, follow_ups, _, assistant_text = run_fused_intake(
+                    delta.prompt_text, delta.document_names, delta.previous
+                )
+            else:
+                summary_payload, follow_ups, insights = analyze_prompt(
+                    delta.prompt_text, delta.document_names, delta.previous
+                )
+                assistant_text = generate_follow_up_message(
+                    summary_payload, follow_ups, insights
+                )
+            return _intake_update(state, delta, summary_payload, follow_ups, assistant_text)
+
+    async def _arun(state: ProjectState, config: RunnableConfig) -> ProjectState:
+        with NODE_SECONDS.labels(node="intake_agent").time(), start_span("node intake_agent"):
+            delta = await _aintake_delta(state)
+            on_token = _token_writer(config)
+            if get_settings().intake_mode == "fused":
+                summary_payload, follow_ups, _, assistant_text = await arun_fused_intake(
+                    delta.prompt_text, delta.document_names, delta.previous
+                )
+                if on_token is not None:
+                    # The reply is embedded in the JSON payload, so it arrives whole.
+                    on_token(assistant_text)
+            else:
+                summary_payload, follow_ups, insights = await aanalyze_prompt(
+                    delta.prompt_text, delta.document_names, delta.previous
+                )
+                assistant_text = await agenerate_follow_up_message(
+                    summary_payload, follow_ups, insights, on_token=on_token
+                )
+            return _intake_update(state, delta, summary_payload, follow_ups, assistant_text)
+
+    return RunnableLambda(_run, afunc=_arun, name="intake_agent")
 
 
 def build_brief_node() -> RunnableLambda:
     """Return a runnable that structures the Lovable-style brief."""
 
     def _run(state: ProjectState) -> ProjectState:
-        summary_dict = state.get("summary", {})
-        summary_payload = SummaryPayload(**summary_dict)
-        brief_payload: LovableBrief = build_brief(summary_payload)
-        message = AIMessage(content="Project brief structured.", name="brief_agent")
-        return {
-            "messages": state.get("messages", []) + [message],
-            "brief": brief_payload.model_dump(),
-            "assistant_message": state.get("assistant_message", ""),
-        }
-
-    return RunnableLambda(_run)
+        with NODE_SECONDS.labels(node="brief_agent").time(), start_span("node brief_agent"):
+            summary_dict = state.get("summary", {})
+            summary_payload = SummaryPayload(**summary_dict)
+            brief_payload: LovableBrief = build_brief(summary_payload)
+            message = AIMessage(content="Project brief structured.", name="brief_agent")
+            return {
+                "messages": state.get("messages", []) + [message],
+                "brief": brief_payload.model_dump(),
+                "assistant_message": state.get("assistant_message", ""),
+            }
+
+    async def _arun(state: ProjectState) -> ProjectState:
+        # Formatting is a handful of attribute lookups; no need for a thread hop.
+        return _run(state)
+
+    return RunnableLambda(_run, afunc=_arun, name="brief_agent")
+
+
+def _token_writer(config: RunnableConfig) -> Callable[[str], None] | None:
+    """Return a callback that forwards reply tokens to `graph.astream` consumers."""
+
+    if not config.get("configurable", {}).get("stream_tokens"):
+        return None
+    writer = get_stream_writer()
+
+    def _write(token: str) -> None:
+        writer({"event": "assistant_token", "token": token})
+
+    return _write
+
+
+class IntakeDelta(NamedTuple):
+    """Content added to a thread since its last checkpointed summary."""
+
+    prompt_text: str
+    document_names: list[str]
+    previous: SummaryPayload | None
+    user_turn_count: int
+    document_ids: list[str]
+    prompt_tokens: int
+    dropped: list[DroppedChunk]
+
+
+class _IntakeScope(NamedTuple):
+    """What `_intake_delta` needs besides the document evidence."""
+
+    new_messages: list[str]
+    pending: list[tuple[DocumentReference, str]]
+    processed_documents: set[str]
+    document_ids: list[str]
+    document_names: list[str]
+    previous: SummaryPayload | None
+    user_turn_count: int
+
+
+def _intake_delta(state: ProjectState) -> IntakeDelta:
+    """Collect the user turns and document texts the summary has not seen yet."""
+
+    scope = _intake_scope(state)
+    top_k = get_settings().intake_retrieval_top_k
+    evidence = [_document_evidence(doc, key, top_k) for doc, key in scope.pending]
+    return _assemble_delta(scope, evidence)
+
+
+async def _aintake_delta(state: ProjectState) -> IntakeDelta:
+    """Async `_intake_delta`; evidence selection and prompt assembly run off the event loop."""
+
+    scope = _intake_scope(state)
+    top_k = get_settings().intake_retrieval_top_k
+    evidence = await asyncio.gather(
+        *(_adocument_evidence(doc, key, top_k) for doc, key in scope.pending)
+    )
+    # Chunking and scoring a large paste would otherwise stall every other run.
+    return await asyncio.to_thread(_assemble_delta, scope, evidence)
+
+
+def _intake_scope(state: ProjectState) -> _IntakeScope:
+    conversation = state.get("conversation", [])
+    documents = state.get("documents", [])
+    user_messages = [
+        turn["content"]
+        for turn in conversation
+        if turn.get("role", "user").lower() == "user"
+    ]
+    document_ids = [_document_key(doc) for doc in documents]
+
+    previous_dict = state.get("summary")
+    processed_turns = state.get("processed_user_turns", 0)
+    processed_documents = set(state.get("processed_document_ids", []))
+    previous = SummaryPayload(**previous_dict) if previous_dict else None
+    if previous is None or processed_turns > len(user_messages):
+        # New thread, or the client rewrote history: analyze everything.
+        previous = None
+        processed_turns = 0
+        processed_documents = set()
+
+    return _IntakeScope(
+        new_messages=user_messages[processed_turns:],
+        pending=[
+            (doc, key)
+            for doc, key in zip(documents, document_ids)
+            if _has_text(doc) and key not in processed_documents
+        ],
+        processed_documents=processed_documents,
+        document_ids=document_ids,
+        document_names=[doc.get("name", "") or doc.get("id", "") for doc in documents],
+        previous=previous,
+        user_turn_count=len(user_messages),
+    )
+
+
+def _assemble_delta(scope: _IntakeScope, evidence: list[str | None]) -> IntakeDelta:
+    settings = get_settings()
+    new_documents = []
+    processed_documents = set(scope.processed_documents)
+    for (doc, key), text in zip(scope.pending, evidence):
+        # Documents without usable text yet stay unprocessed for a later run.
+        if text is not None:
+            new_documents.append((doc.get("name") or key, text))
+            processed_documents.add(key)
+    assembly = assemble_prompt(
+        [message for message in scope.new_messages if message],
+        new_documents,
+        budget_tokens=settings.intake_input_token_budget,
+        chunk_tokens=settings.intake_chunk_tokens,
+    )
+    if assembly.dropped:
+        logger.info(
+            "Intake prompt over its %d-token budget; dropped %d chunks (%d tokens)",
+            settings.intake_input_token_budget,
+            len(assembly.dropped),
+            sum(chunk.tokens for chunk in assembly.dropped),
+        )
+    return IntakeDelta(
+        prompt_text=assembly.text,
+        document_names=scope.document_names,
+        previous=scope.previous,
+        user_turn_count=scope.user_turn_count,
+        document_ids=[key for key in scope.document_ids if key in processed_documents],
+        prompt_tokens=assembly.tokens,
+        dropped=assembly.dropped,
+    )
+
+
+def _document_evidence(doc: DocumentReference, key: str, top_k: int) -> str | None:
+    """Top BM25 passages per summary field, or the full text without an index.
+
+    The index is loaded by content hash. None means stored pages could not be
+    loaded; the document is retried on the next run instead of being analyzed
+    without its text.
+    """
+
+    text = _document_text(doc)
+    try:
+        if top_k <= 0:
+            return str(text)
+        search_index = pages.load_search_index(doc["sha256"]) if doc.get("sha256") else None
+        selected = select_passages(text, search_index, top_k)
+        return str(text) if selected is None else selected
+    except MissingPagesError as exc:
+        logger.warning("Skipping document %s for now: %s", key, exc)
+        return None
+
+
+async def _adocument_evidence(doc: DocumentReference, key: str, top_k: int) -> str | None:
+    # BM25 scoring is CPU-bound and stored indexes and pages come from Mongo
+    # (pymongo is synchronous), so neither runs on the event loop.
+    return await asyncio.to_thread(_document_evidence, doc, key, top_k)
+
+
+def _has_text(doc: DocumentReference) -> bool:
+    return bool(doc.get("text") or (doc.get("sha256") and doc.get("pages")))
+
+
+def _document_text(doc: DocumentReference) -> str | PagedText:
+    """Inline text, or a lazy view of the pages stored by the backend."""
+
+    if doc.get("text"):
+        return doc["text"]
+    if doc.get("sha256") and doc.get("pages"):
+        return PagedText(doc["sha256"], doc["pages"])
+    return ""
+
+
+def _document_key(doc: DocumentReference) -> str:
+    return doc.get("id") or doc.get("name", "")
+
+
+def _intake_update(
+    state: ProjectState,
+    delta: IntakeDelta,
+    summary_payload: SummaryPayload,
+    follow_ups: list[str],
+    assistant_text: str,
+) -> ProjectState:
+    summary_message = AIMessage(content=assistant_text, name="intake_agent")
+    return {
+        "messages": state.get("messages", []) + [summary_message],
+        "conversation": state.get("conversation", []),
+        "documents": state.get("documents", []),
+        "summary": summary_payload.model_dump(),
+        "follow_up_questions": follow_ups,
+        "assistant_message": assistant_text,
+        "processed_user_turns": delta.user_turn_count,
+        "processed_document_ids": delta.document_ids,
+        "intake_context": {
+            "prompt_tokens": delta.prompt_tokens,
+            "dropped_chunks": [chunk._asdict() for chunk in delta.dropped],
+        },
+    }
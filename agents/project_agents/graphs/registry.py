@@ -0,0 +1,101 @@
+"""Process-wide registry of compiled workflow graphs.
+
+Compiling the StateGraph is pure overhead once the node set is known, so the
+compiled graph is cached per checkpointer and shared by every request. A
+compiled graph keeps no per-run state (everything lives in the checkpointer,
+keyed by ``thread_id``), which makes concurrent invocations safe.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph.state import CompiledStateGraph
+
+from project_agents.graphs.checkpointing import aget_checkpointer, get_checkpointer
+from project_agents.graphs.state import initialize_state
+from project_agents.graphs.workflow import build_project_brief_graph
+from project_agents.metrics import instrument_checkpointer
+
+logger = logging.getLogger(__name__)
+
+_graphs: list[tuple[BaseCheckpointSaver, CompiledStateGraph]] = []
+_graphs_lock = threading.Lock()
+
+_WARMUP_CONVERSATION = [
+    {
+        "role": "user",
+        "content": (
+            "Project called Warmup. The problem is slow cold starts for our users. "
+            "Success is measured by latency and the timeline is one sprint."
+        ),
+    }
+]
+
+
+def get_project_brief_graph(
+    checkpointer: BaseCheckpointSaver | None = None,
+) -> CompiledStateGraph:
+    """Return the compiled graph bound to ``checkpointer``, compiling it once."""
+
+    if checkpointer is None:
+        checkpointer = get_checkpointer()
+
+    cached = _lookup(checkpointer)
+    if cached is not None:
+        return cached
+
+    with _graphs_lock:
+        cached = _lookup(checkpointer)
+        if cached is None:
+            started = time.perf_counter()
+            cached = build_project_brief_graph(instrument_checkpointer(checkpointer))
+            _graphs.append((checkpointer, cached))
+            logger.info(
+                "Compiled project brief graph for %s in %.1f ms",
+                type(checkpointer).__name__,
+                (time.perf_counter() - started) * 1000,
+            )
+    return cached
+
+
+async def aget_project_brief_graph() -> CompiledStateGraph:
+    """Return the graph bound to the process-wide checkpointer."""
+
+    return get_project_brief_graph(await aget_checkpointer())
+
+
+async def warm_up_graph() -> float:
+    """Run one throwaway workflow to prime imports, schemas, and clients.
+
+    The warm-up runs against a private in-memory saver so no checkpoint lands
+    in the shared store. Returns the elapsed time in milliseconds.
+    """
+
+    started = time.perf_counter()
+    graph = build_project_brief_graph(InMemorySaver())
+    await graph.ainvoke(
+        initialize_state(_WARMUP_CONVERSATION, []),
+        config={"configurable": {"thread_id": "warmup"}},
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info("Project brief graph warm-up finished in %.1f ms", elapsed_ms)
+    return elapsed_ms
+
+
+def clear_graph_registry() -> None:
+    """Drop every cached graph (used on shutdown and in tests)."""
+
+    with _graphs_lock:
+        _graphs.clear()
+
+
+def _lookup(checkpointer: BaseCheckpointSaver) -> CompiledStateGraph | None:
+    for saver, graph in _graphs:
+        if saver is checkpointer:
+            return graph
+    return None
@@ -22,6 +22,8 @@ class DocumentReference(TypedDict, total=False):
     url: str | None
     notes: str | None
     text: str | None
+    sha256: str | None
+    pages: list[list[int]] | None
 
 
 class ProjectState(TypedDict, total=False):
@@ -34,6 +36,9 @@ class ProjectState(TypedDict, total=False):
     brief: dict[str, Any]
     follow_up_questions: list[str]
     assistant_message: str
+    processed_user_turns: int
+    processed_document_ids: list[str]
+    intake_context: dict[str, Any]
 
 
 def initialize_state(
@@ -50,6 +55,39 @@ def initialize_state(
     }
 
 
+def extend_state(
+    previous: ProjectState,
+    new_turns: list[ConversationTurn],
+    new_documents: list[DocumentReference],
+) -> ProjectState:
+    """Append a continuation delta to a checkpointed state.
+
+    Only the new turns are converted to messages. The assistant reply from the
+    previous run is folded into the conversation first, since continuation
+    clients send just their own new turns.
+    """
+
+    conversation = list(previous.get("conversation", []))
+    messages = list(previous.get("messages", []))
+    last_reply = previous.get("assistant_message")
+    if last_reply and (not conversation or conversation[-1].get("content") != last_reply):
+        conversation.append(ConversationTurn(role="assistant", content=last_reply))
+
+    documents = list(previous.get("documents", []))
+    known_ids = {doc.get("id") or doc.get("name") for doc in documents}
+    for doc in new_documents:
+        key = doc.get("id") or doc.get("name")
+        if key not in known_ids:
+            known_ids.add(key)
+            documents.append(doc)
+
+    return {
+        "messages": messages + [_to_message(turn) for turn in new_turns],
+        "conversation": conversation + list(new_turns),
+        "documents": documents,
+    }
+
+
 def _to_message(turn: ConversationTurn) -> BaseMessage:
     role = turn.get("role", "user").lower()
     content = turn.get("content", "")
@@ -1,5 +1,6 @@
 """Graph compilation helpers."""
 
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, START, StateGraph
 
 from project_agents.graphs.checkpointing import get_checkpointer
@@ -7,8 +8,13 @@ from project_agents.graphs.nodes import build_brief_node, build_intake_node
 from project_agents.graphs.state import ProjectState
 
 
-def build_project_brief_graph() -> StateGraph[ProjectState]:
-    """Compile the project brief workflow graph."""
+def build_project_brief_graph(
+    checkpointer: BaseCheckpointSaver | None = None,
+) -> StateGraph[ProjectState]:
+    """Compile the project brief workflow graph.
+
+    Uses the process-wide checkpointer unless one is supplied explicitly.
+    """
 
     graph_builder: StateGraph[ProjectState] = StateGraph(ProjectState)
 
@@ -19,7 +25,8 @@ def build_project_brief_graph() -> StateGraph[ProjectState]:
     graph_builder.add_edge("intake_agent", "brief_agent")
     graph_builder.add_edge("brief_agent", END)
 
-    checkpointer = get_checkpointer()
+    if checkpointer is None:
+        checkpointer = get_checkpointer()
     return graph_builder.compile(checkpointer=checkpointer)
 
 
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import List, Tuple
-
-from openai import OpenAI
-
-from project_agents.config.settings import get_settings
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Tuple
+
+from project_agents.intake.matcher import KeywordMatcher, KeywordMatches, first_sentence
+from project_agents.llm import LLMError, get_llm_client
+from project_agents.metrics import record_fallback
 from project_agents.models import IntakeInsights, SummaryPayload
 
+logger = logging.getLogger(__name__)
+
 
 SUMMARY_FIELDS = {
     "project_title": "What is the working title or name of the project?",
@@ -32,22 +38,48 @@ KEYWORD_MAP = {
     "resources": ["resource", "document", "tool", "asset", "reference"],
 }
 
+# In priority order: the first marker in this list that occurs anywhere wins.
+_TITLE_MARKERS = ["project called", "project name is", "initiative", "product"]
 
-def _extract_with_llm(
-    prompt: str,
-    documents: list[str] | None = None,
-) -> SummaryPayload | None:
-    """Extract structured information using OpenAI LLM. Returns None if extraction fails."""
-    settings = get_settings()
-    if not settings.openai_api_key:
-        return None
+_KEYWORD_MATCHER = KeywordMatcher(KEYWORD_MAP, _TITLE_MARKERS)
 
-    documents = documents or []
+# Separators for splitting a sentence into list items.
+_LIST_SEPARATORS = re.compile(r";|,|\n| and ")
+
+# (field, follow-up question, short label for `IntakeInsights.missing_fields`)
+_FIELD_QUESTIONS = [
+    (
+        field,
+        question,
+        question.replace("What ", "").replace("How ", "").replace("Are ", "").rstrip("?"),
+    )
+    for field, question in SUMMARY_FIELDS.items()
+]
+
+
+_EXTRACTION_SYSTEM_PROMPT = (
+    "You are a helpful assistant that extracts structured information from project descriptions. "
+    "Always respond with valid JSON only."
+)
+
+
+def _build_extraction_prompt(
+    prompt: str,
+    documents: list[str],
+    previous: SummaryPayload | None = None,
+) -> str:
+    """Render the user message sent to the LLM for structured extraction."""
     document_context = ""
     if documents:
         document_context = f"\n\nUploaded documents: {', '.join(documents)}"
+    if previous is not None:
+        document_context += (
+            "\n\nAlready captured earlier in this conversation (JSON). Use it as context and"
+            " keep these values unless the description above changes them:\n"
+            f"{previous.model_dump_json()}"
+        )
 
-    extraction_prompt = f"""You are a project intake assistant. Extract structured information from the following project description. The description may be in any language - extract information regardless of the language used.
+    return f"""You are a project intake assistant. Extract structured information from the following project description. The description may be in any language - extract information regardless of the language used.
 
 Project description:
 {prompt}{document_context}
@@ -78,51 +110,109 @@ Return ONLY valid JSON, no additional text. Example format:
   "opportunity_areas": ["Deliver the solution: Y"]
 }}"""
 
+
+def _extraction_messages(
+    prompt: str,
+    documents: list[str],
+    previous: SummaryPayload | None = None,
+) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": _EXTRACTION_SYSTEM_PROMPT},
+        {"role": "user", "content": _build_extraction_prompt(prompt, documents, previous)},
+    ]
+
+
+def _parse_extraction(content: str | None, documents: list[str]) -> SummaryPayload | None:
+    """Build a SummaryPayload from the raw JSON returned by the LLM."""
+    if not content:
+        return None
+
+    return _summary_from_data(_load_json_object(content), documents)
+
+
+def _load_json_object(content: str) -> dict:
+    """Parse an LLM JSON reply, raising ValueError unless it is an object."""
+    data = json.loads(content)
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+    return data
+
+
+def _summary_from_data(data: dict, documents: list[str]) -> SummaryPayload:
+    """Build a SummaryPayload from an extraction JSON object."""
+    summary = SummaryPayload(
+        project_title=data.get("project_title", "Untitled Project"),
+        problem=data.get("problem"),
+        solution=data.get("solution"),
+        target_users=data.get("target_users", []),
+        success_metrics=data.get("success_metrics", []),
+        constraints=data.get("constraints", []),
+        timeline=data.get("timeline"),
+        resources=data.get("resources", []),
+        documents=data.get("documents", documents),
+        opportunity_areas=data.get("opportunity_areas", []),
+    )
+
+    # Derive opportunity areas if not provided
+    if not summary.opportunity_areas:
+        summary.opportunity_areas = _derive_opportunities(summary)
+
+    return summary
+
+
+def _extract_with_llm(
+    prompt: str,
+    documents: list[str] | None = None,
+    previous: SummaryPayload | None = None,
+) -> SummaryPayload | None:
+    """Extract structured information using OpenAI LLM. Returns None if extraction fails."""
+    client = get_llm_client()
+    if not client.enabled:
+        return None
+
+    documents = documents or []
+
     try:
-        client = OpenAI(api_key=settings.openai_api_key)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that extracts structured information from project descriptions. Always respond with valid JSON only.",
-                },
-                {"role": "user", "content": extraction_prompt},
-            ],
+        content = client.complete(
+            _extraction_messages(prompt, documents, previous),
+            call_site="extraction",
             response_format={"type": "json_object"},
             temperature=0.3,
             max_tokens=1000,
+            documents=documents,
         )
+        return _parse_extraction(content, documents)
+    except (LLMError, ValueError) as exc:
+        # Return None to trigger the keyword fallback
+        logger.warning("LLM extraction failed, using keyword fallback: %s", exc)
+        return None
 
-        content = response.choices[0].message.content
-        if not content:
-            return None
-
-        # Parse JSON response
-        data = json.loads(content)
-
-        # Build SummaryPayload from extracted data
-        summary = SummaryPayload(
-            project_title=data.get("project_title", "Untitled Project"),
-            problem=data.get("problem"),
-            solution=data.get("solution"),
-            target_users=data.get("target_users", []),
-            success_metrics=data.get("success_metrics", []),
-            constraints=data.get("constraints", []),
-            timeline=data.get("timeline"),
-            resources=data.get("resources", []),
-            documents=data.get("documents", documents),
-            opportunity_areas=data.get("opportunity_areas", []),
-        )
 
-        # Derive opportunity areas if not provided
-        if not summary.opportunity_areas:
-            summary.opportunity_areas = _derive_opportunities(summary)
+async def _aextract_with_llm(
+    prompt: str,
+    documents: list[str] | None = None,
+    previous: SummaryPayload | None = None,
+) -> SummaryPayload | None:
+    """Async counterpart of `_extract_with_llm` that never blocks the event loop."""
+    client = get_llm_client()
+    if not client.enabled:
+        return None
 
-        return summary
+    documents = documents or []
 
-    except Exception:  # noqa: BLE001
-        # Return None on any error to trigger fallback
+    try:
+        content = await client.acomplete(
+            _extraction_messages(prompt, documents, previous),
+            call_site="extraction",
+            response_format={"type": "json_object"},
+            temperature=0.3,
+            max_tokens=1000,
+            documents=documents,
+        )
+        return _parse_extraction(content, documents)
+    except (LLMError, ValueError) as exc:
+        # Return None to trigger the keyword fallback
+        logger.warning("LLM extraction failed, using keyword fallback: %s", exc)
         return None
 
 
@@ -132,17 +222,18 @@ def _extract_with_keywords(
 ) -> SummaryPayload:
     """Extract structured information using keyword-based heuristics (fallback method)."""
     documents = documents or []
-    sentences = _sentences(prompt)
+    return _keyword_summary(prompt, documents, _KEYWORD_MATCHER.scan(prompt))
+
 
+def _keyword_summary(
+    prompt: str, documents: list[str], matches: KeywordMatches
+) -> SummaryPayload:
+    title, inferred = _extract_title(prompt, matches.markers)
     raw: dict[str, str | list[str] | None] = {
-        "project_title": _extract_title(prompt),
+        "project_title": title,
         "documents": list(documents),
     }
-
-    for key, keywords in KEYWORD_MAP.items():
-        value = _first_sentence_with_keyword(sentences, keywords)
-        if value:
-            raw[key] = value
+    raw.update(matches.sentences)
 
     if documents and not raw.get("resources"):
         raw["resources"] = ", ".join(documents)
@@ -158,6 +249,7 @@ def _extract_with_keywords(
         resources=_normalize_list(raw.get("resources")),
         documents=list(documents),
     )
+    summary._inferred_title = inferred
 
     if not summary.opportunity_areas:
         summary.opportunity_areas = _derive_opportunities(summary)
@@ -165,69 +257,163 @@ def _extract_with_keywords(
     return summary
 
 
+def analyze_prompts_batch(
+    prompts: Iterable[str],
+    documents: list[str] | None = None,
+    workers: int = 1,
+    chunk_size: int = 1000,
+) -> list[Tuple[SummaryPayload, list[str], IntakeInsights]]:
+    """Run the keyword extractor and missing-field check over many prompts.
+
+    Results match `analyze_prompt` with the LLM unavailable, in input order.
+    No LLM calls are made: this serves offline re-scoring and batch backfills,
+    where the heuristics are the point. Each chunk of ``chunk_size`` prompts
+    goes through one regex pass of the shared compiled matcher; with
+    ``workers`` > 1 chunks are spread over a process pool.
+    """
+    documents = list(documents or [])
+    prompts = list(prompts)
+    chunks = [prompts[start:start + chunk_size] for start in range(0, len(prompts), chunk_size)]
+    if workers <= 1 or len(chunks) <= 1:
+        return [result for chunk in chunks for result in _analyze_chunk(chunk, documents)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        analyzed = pool.map(_analyze_chunk, chunks, [documents] * len(chunks))
+        return [result for chunk_results in analyzed for result in chunk_results]
+
+
+def _analyze_chunk(
+    prompts: list[str], documents: list[str]
+) -> list[Tuple[SummaryPayload, list[str], IntakeInsights]]:
+    results = []
+    for prompt, matches in zip(prompts, _KEYWORD_MATCHER.scan_many(prompts)):
+        summary = _keyword_summary(prompt, documents, matches)
+        missing, insights = _collect_insights(summary)
+        results.append((summary, missing, insights))
+    return results
+
+
 def analyze_prompt(
     prompt: str,
     documents: list[str] | None = None,
+    previous: SummaryPayload | None = None,
 ) -> Tuple[SummaryPayload, list[str], IntakeInsights]:
     """Parse the prompt into a structured summary and collect follow-up questions.
     
     Tries LLM-based extraction first, falls back to keyword-based extraction if LLM fails.
+    When ``previous`` is given, ``prompt`` only holds content added since that
+    summary was produced; the new findings are merged into it field by field.
     """
     documents = documents or []
 
-    # Try LLM extraction first
-    summary = _extract_with_llm(prompt, documents)
+    if previous is not None and not prompt.strip():
+        summary = merge_summaries(previous, SummaryPayload(documents=documents))
+    else:
+        # Try LLM extraction first
+        summary = _extract_with_llm(prompt, documents, previous)
 
-    # Fallback to keyword-based extraction if LLM fails
-    if summary is None:
-        summary = _extract_with_keywords(prompt, documents)
+        # Fallback to keyword-based extraction if LLM fails
+        if summary is None:
+            record_fallback("extraction", get_llm_client().enabled)
+            summary = _extract_with_keywords(prompt, documents)
 
-    # Generate follow-up questions and insights
+        if previous is not None:
+            summary = merge_summaries(previous, summary)
+
+    missing, insights = _collect_insights(summary)
+    return summary, missing, insights
+
+
+async def aanalyze_prompt(
+    prompt: str,
+    documents: list[str] | None = None,
+    previous: SummaryPayload | None = None,
+) -> Tuple[SummaryPayload, list[str], IntakeInsights]:
+    """Async variant of `analyze_prompt`.
+
+    The LLM call is awaited and the keyword fallback runs in a worker thread so
+    large prompts never stall the event loop.
+    """
+    documents = documents or []
+
+    if previous is not None and not prompt.strip():
+        summary = merge_summaries(previous, SummaryPayload(documents=documents))
+    else:
+        summary = await _aextract_with_llm(prompt, documents, previous)
+        if summary is None:
+            record_fallback("extraction", get_llm_client().enabled)
+            summary = await asyncio.to_thread(_extract_with_keywords, prompt, documents)
+        if previous is not None:
+            summary = merge_summaries(previous, summary)
+
+    missing, insights = _collect_insights(summary)
+    return summary, missing, insights
+
+
+def merge_summaries(previous: SummaryPayload, update: SummaryPayload) -> SummaryPayload:
+    """Fold a summary extracted from new turns into the checkpointed one.
+
+    Scalar fields take the newer value when one was found; list fields are
+    unioned in order of first appearance. An explicit title in ``update`` (a
+    title marker hit or an LLM value) replaces the previous one; the default
+    placeholder and the first-sentence guess never replace a real title.
+    """
+    default_title = SummaryPayload.model_fields["project_title"].default
+    title, inferred = update.project_title or default_title, update._inferred_title
+    has_real_title = previous.project_title not in ("", default_title)
+    if has_real_title and (title == default_title or inferred):
+        title, inferred = previous.project_title, previous._inferred_title
+
+    merged = SummaryPayload(
+        project_title=title,
+        problem=update.problem or previous.problem,
+        solution=update.solution or previous.solution,
+        target_users=_union(previous.target_users, update.target_users),
+        success_metrics=_union(previous.success_metrics, update.success_metrics),
+        constraints=_union(previous.constraints, update.constraints),
+        timeline=update.timeline or previous.timeline,
+        resources=_union(previous.resources, update.resources),
+        documents=_union(previous.documents, update.documents),
+        opportunity_areas=_union(previous.opportunity_areas, update.opportunity_areas),
+    )
+    merged._inferred_title = inferred
+    return merged
+
+
+def _collect_insights(summary: SummaryPayload) -> Tuple[list[str], IntakeInsights]:
+    """Generate follow-up questions and insights for a summary."""
     captured_fields: list[str] = []
     missing: list[str] = []
+    missing_labels: list[str] = []
 
-    for field, question in SUMMARY_FIELDS.items():
+    for field, question, label in _FIELD_QUESTIONS:
         value = getattr(summary, field)
         if value:
             captured_fields.append(field.replace("_", " "))
         else:
             missing.append(question)
+            missing_labels.append(label)
 
     insights = IntakeInsights(
         captured_fields=captured_fields,
-        missing_fields=[question.replace("What ", "").replace("How ", "").replace("Are ", "").rstrip("?") for question in missing],
+        missing_fields=missing_labels,
     )
 
-    return summary, missing, insights
-
+    return missing, insights
 
-def _sentences(text: str) -> list[str]:
-    raw = [segment.strip() for segment in text.replace("\n", ". ").split(".")]
-    return [segment for segment in raw if segment]
-
-
-def _extract_title(prompt: str) -> str | None:
-    lowered = prompt.lower()
-    markers = ["project called", "project name is", "initiative", "product"]
-    for marker in markers:
-        if marker in lowered:
-            idx = lowered.index(marker)
-            snippet = prompt[idx:].split("\n", 1)[0]
-            return snippet.split(" ", len(marker.split()) + 5)[-1].strip().strip(":")
-    first_sentence = _sentences(prompt)
-    if first_sentence:
-        fragment = first_sentence[0]
-        if len(fragment.split()) > 3:
-            return fragment[:120].strip()
-    return None
 
-
-def _first_sentence_with_keyword(sentences: list[str], keywords: list[str]) -> str | None:
-    for sentence in sentences:
-        lowered = sentence.lower()
-        if any(keyword in lowered for keyword in keywords):
-            return sentence.strip()
-    return None
+def _extract_title(prompt: str, markers: dict[str, int]) -> tuple[str | None, bool]:
+    """Return the title and whether it is only the first-sentence guess."""
+    for marker in _TITLE_MARKERS:
+        if marker in markers:
+            idx = markers[marker]
+            line_end = prompt.find("\n", idx)
+            snippet = prompt[idx:line_end] if line_end != -1 else prompt[idx:]
+            return snippet.split(" ", len(marker.split()) + 5)[-1].strip().strip(":"), False
+    fragment = first_sentence(prompt)
+    if fragment and len(fragment.split()) > 3:
+        return fragment[:120].strip(), True
+    return None, False
 
 
 def _normalize_list(value: str | list[str] | None) -> list[str]:
@@ -239,14 +425,18 @@ def _normalize_list(value: str | list[str] | None) -> list[str]:
 
 
 def _split_str(value: str) -> list[str]:
-    separators = [";", ",", "\n", " and "]
-    items = [value]
-    for sep in separators:
-        new_items: list[str] = []
-        for item in items:
-            new_items.extend(item.split(sep))
-        items = new_items
-    return [item.strip(" -•").strip() for item in items if item.strip()]
+    return [item.strip(" -•").strip() for item in _LIST_SEPARATORS.split(value) if item.strip()]
+
+
+def _union(first: list[str], second: list[str]) -> list[str]:
+    seen: set[str] = set()
+    merged: list[str] = []
+    for item in [*first, *second]:
+        key = item.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            merged.append(item)
+    return merged
 
 
 def _derive_opportunities(summary: SummaryPayload) -> list[str]:
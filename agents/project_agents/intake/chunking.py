@@ -0,0 +1,190 @@
+"""Token-budgeted assembly of the intake prompt.
+
+Uploaded documents can be far larger than the model's context window. Their
+text is split into bounded chunks, and the prompt is filled up to an input
+token budget: conversation turns first (newest first when even they do not
+fit), then document chunks ranked by how informative they look. Everything
+left out is reported so callers can log or surface it.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import NamedTuple
+
+from project_agents.intake.analyzer import KEYWORD_MAP
+
+# Rough average for English prose with OpenAI tokenizers.
+_CHARS_PER_TOKEN = 4
+
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"\w+")
+_KEYWORDS = frozenset(keyword for keywords in KEYWORD_MAP.values() for keyword in keywords)
+
+
+class Chunk(NamedTuple):
+    """A bounded slice of one document."""
+
+    document: str
+    index: int
+    text: str
+    tokens: int
+
+
+class DroppedChunk(NamedTuple):
+    """Content that did not fit in the budget."""
+
+    document: str
+    index: int
+    tokens: int
+
+
+class PromptAssembly(NamedTuple):
+    """The assembled prompt and what was left out of it."""
+
+    text: str
+    tokens: int
+    dropped: list[DroppedChunk]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate; avoids shipping a tokenizer for budgeting."""
+
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def chunk_text(text: str, max_tokens: int) -> list[str]:
+    """Split ``text`` into chunks of at most ``max_tokens`` estimated tokens.
+
+    Paragraph boundaries are preferred, then sentence boundaries; a single
+    sentence longer than the limit is split at whitespace.
+    """
+
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    chunks: list[str] = []
+    current: list[str] = []
+    for paragraph in _PARAGRAPH_SPLIT.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            # Short paragraphs share a chunk with their neighbours.
+            current = _pack(chunks, current, [paragraph], max_chars)
+            continue
+        # An oversized paragraph is packed on its own so its sentences never
+        # dilute (or get diluted by) an unrelated paragraph.
+        _flush(chunks, current)
+        pieces = [
+            piece
+            for sentence in _SENTENCE_SPLIT.split(paragraph)
+            for piece in _split_long(sentence, max_chars)
+        ]
+        _flush(chunks, _pack(chunks, [], pieces, max_chars))
+        current = []
+    _flush(chunks, current)
+    return chunks
+
+
+def score_chunk(text: str) -> float:
+    """Rank chunks by intake keyword hits and vocabulary diversity."""
+
+    words = [word.lower() for word in _WORD.findall(text)]
+    if not words:
+        return 0.0
+    keyword_hits = sum(1 for word in words if _stem_hit(word))
+    diversity = len(set(words)) / len(words)
+    return keyword_hits + diversity
+
+
+def assemble_prompt(
+    messages: list[str],
+    documents: list[tuple[str, str]],
+    budget_tokens: int,
+    chunk_tokens: int,
+) -> PromptAssembly:
+    """Fit conversation turns and document chunks into ``budget_tokens``.
+
+    ``documents`` holds ``(name, text)`` pairs. Included chunks keep their
+    original document order so the prompt still reads coherently.
+    """
+
+    dropped: list[DroppedChunk] = []
+    remaining = budget_tokens
+
+    kept_messages: list[str] = []
+    for position in range(len(messages) - 1, -1, -1):
+        message = messages[position]
+        cost = estimate_tokens(message)
+        if cost <= remaining:
+            kept_messages.append(message)
+            remaining -= cost
+        else:
+            dropped.append(DroppedChunk(document="conversation", index=position, tokens=cost))
+    kept_messages.reverse()
+
+    chunks = [
+        Chunk(document=name, index=index, text=text, tokens=estimate_tokens(text))
+        for name, document_text in documents
+        for index, text in enumerate(chunk_text(document_text, chunk_tokens))
+    ]
+    ranked = sorted(
+        range(len(chunks)), key=lambda position: score_chunk(chunks[position].text), reverse=True
+    )
+    selected: set[int] = set()
+    for position in ranked:
+        chunk = chunks[position]
+        if chunk.tokens <= remaining:
+            selected.add(position)
+            remaining -= chunk.tokens
+        else:
+            dropped.append(DroppedChunk(chunk.document, chunk.index, chunk.tokens))
+
+    segments = kept_messages + [
+        chunk.text for position, chunk in enumerate(chunks) if position in selected
+    ]
+    return PromptAssembly(
+        text="\n".join(segments),
+        tokens=budget_tokens - remaining,
+        dropped=dropped,
+    )
+
+
+def _pack(chunks: list[str], current: list[str], pieces: list[str], max_chars: int) -> list[str]:
+    current_len = len("\n\n".join(current))
+    for piece in pieces:
+        added = len(piece) + (2 if current else 0)
+        if current and current_len + added > max_chars:
+            _flush(chunks, current)
+            current, current_len = [], 0
+            added = len(piece)
+        current.append(piece)
+        current_len += added
+    return current
+
+
+def _flush(chunks: list[str], current: list[str]) -> None:
+    if current:
+        chunks.append("\n\n".join(current))
+
+
+def _split_long(sentence: str, max_chars: int) -> list[str]:
+    sentence = sentence.strip()
+    if len(sentence) <= max_chars:
+        return [sentence] if sentence else []
+    parts: list[str] = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(" ", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        parts.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        parts.append(sentence)
+    return parts
+
+
+def _stem_hit(word: str) -> bool:
+    # Matches the analyzer's substring semantics ("users" counts for "user").
+    return any(word.startswith(keyword) for keyword in _KEYWORDS)
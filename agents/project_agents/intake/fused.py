@@ -0,0 +1,170 @@
+"""Single-call intake: structured extraction and the assistant reply in one round trip.
+
+The two-call path (`analyzer.analyze_prompt` followed by
+`tone.generate_follow_up_message`) waits for the extraction JSON before it can
+ask for the reply. Here one JSON-mode completion returns the `SummaryPayload`
+fields plus an ``assistant_message`` key, halving per-turn LLM latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Tuple
+
+from project_agents.intake.analyzer import (
+    _build_extraction_prompt,
+    _collect_insights,
+    _extract_with_keywords,
+    _load_json_object,
+    _summary_from_data,
+    aanalyze_prompt,
+    analyze_prompt,
+    merge_summaries,
+)
+from project_agents.intake.tone import (
+    _fallback_message,
+    agenerate_follow_up_message,
+    generate_follow_up_message,
+)
+from project_agents.llm import LLMError, get_llm_client
+from project_agents.metrics import record_fallback
+from project_agents.models import IntakeInsights, SummaryPayload
+
+logger = logging.getLogger(__name__)
+
+IntakeTurn = Tuple[SummaryPayload, list[str], IntakeInsights, str]
+
+_FUSED_SYSTEM_PROMPT = (
+    "You are an empathetic project intake assistant. You extract structured information "
+    "from project descriptions and reply to the user in a friendly, natural, conversational "
+    "tone. Always respond with valid JSON only."
+)
+
+_REPLY_INSTRUCTIONS = """
+
+In the same JSON object, also return:
+- assistant_message: Your reply to the user (string). Summarize what you just learned in a friendly tone and clearly ask for the most important details that are still missing (problem, solution, target users, success metrics, constraints, timeline, resources). Avoid sounding robotic or repetitive. End with a natural question when more info is needed."""
+
+
+def run_fused_intake(
+    prompt: str,
+    documents: list[str] | None = None,
+    previous: SummaryPayload | None = None,
+) -> IntakeTurn:
+    """Extract the summary and craft the assistant reply with a single LLM call.
+
+    ``previous`` has the same incremental meaning as in `analyze_prompt`.
+    """
+
+    documents = documents or []
+    if previous is not None and not prompt.strip():
+        # Nothing new to extract; only the reply needs the LLM.
+        summary, missing, insights = analyze_prompt(prompt, documents, previous)
+        return summary, missing, insights, generate_follow_up_message(summary, missing, insights)
+
+    client = get_llm_client()
+    parsed = None
+    if client.enabled:
+        try:
+            content = client.complete(
+                _fused_messages(prompt, documents, previous),
+                call_site="fused_intake",
+                response_format={"type": "json_object"},
+                temperature=0.3,
+                max_tokens=1300,
+                documents=documents,
+            )
+            parsed = _parse_fused(content, documents)
+        except (LLMError, ValueError) as exc:
+            logger.warning("Fused intake call failed, using heuristics: %s", exc)
+
+    if parsed is None:
+        record_fallback("fused_intake", client.enabled)
+        return _heuristic_turn(_extract_with_keywords(prompt, documents), previous)
+
+    summary, assistant_text = parsed
+    if previous is not None:
+        summary = merge_summaries(previous, summary)
+    missing, insights = _collect_insights(summary)
+    if not assistant_text:
+        assistant_text = generate_follow_up_message(summary, missing, insights)
+    return summary, missing, insights, assistant_text
+
+
+async def arun_fused_intake(
+    prompt: str,
+    documents: list[str] | None = None,
+    previous: SummaryPayload | None = None,
+) -> IntakeTurn:
+    """Async variant of `run_fused_intake`."""
+
+    documents = documents or []
+    if previous is not None and not prompt.strip():
+        summary, missing, insights = await aanalyze_prompt(prompt, documents, previous)
+        reply = await agenerate_follow_up_message(summary, missing, insights)
+        return summary, missing, insights, reply
+
+    client = get_llm_client()
+    parsed = None
+    if client.enabled:
+        try:
+            content = await client.acomplete(
+                _fused_messages(prompt, documents, previous),
+                call_site="fused_intake",
+                response_format={"type": "json_object"},
+                temperature=0.3,
+                max_tokens=1300,
+                documents=documents,
+            )
+            parsed = _parse_fused(content, documents)
+        except (LLMError, ValueError) as exc:
+            logger.warning("Fused intake call failed, using heuristics: %s", exc)
+
+    if parsed is None:
+        record_fallback("fused_intake", client.enabled)
+        summary = await asyncio.to_thread(_extract_with_keywords, prompt, documents)
+        return _heuristic_turn(summary, previous)
+
+    summary, assistant_text = parsed
+    if previous is not None:
+        summary = merge_summaries(previous, summary)
+    missing, insights = _collect_insights(summary)
+    if not assistant_text:
+        assistant_text = await agenerate_follow_up_message(summary, missing, insights)
+    return summary, missing, insights, assistant_text
+
+
+def _fused_messages(
+    prompt: str,
+    documents: list[str],
+    previous: SummaryPayload | None = None,
+) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": _FUSED_SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": _build_extraction_prompt(prompt, documents, previous)
+            + _REPLY_INSTRUCTIONS,
+        },
+    ]
+
+
+def _parse_fused(
+    content: str | None, documents: list[str]
+) -> Tuple[SummaryPayload, str] | None:
+    if not content:
+        return None
+    data = _load_json_object(content)
+    assistant_text = data.pop("assistant_message", None)
+    if not isinstance(assistant_text, str):
+        assistant_text = ""
+    return _summary_from_data(data, documents), assistant_text.strip()
+
+
+def _heuristic_turn(summary: SummaryPayload, previous: SummaryPayload | None) -> IntakeTurn:
+    # The LLM is unavailable, so a second (tone) call would fail the same way.
+    if previous is not None:
+        summary = merge_summaries(previous, summary)
+    missing, insights = _collect_insights(summary)
+    return summary, missing, insights, _fallback_message(insights)
@@ -0,0 +1,166 @@
+"""Single-pass keyword matching for the heuristic intake extractor.
+
+All field keywords and title markers are compiled into one case-insensitive
+alternation, so a single left-to-right scan finds the first sentence for every
+field and the first occurrence of every title marker. The scan stops as soon
+as nothing is left to find. Sentences are only cut out around hits and the
+text is lowercased once, so cost stays linear in the input even for
+multi-megabyte document text.
+
+Keywords match at the start of a word and behave like stems: ``user`` matches
+"users" but not "reuser", and ``pain`` no longer matches "Spain".
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterator, Mapping, NamedTuple, Sequence
+
+# Sentence boundaries used by the original heuristics: full stops and newlines.
+_BOUNDARY = re.compile(r"[.\n]")
+
+
+class KeywordMatches(NamedTuple):
+    """First hits found by `KeywordMatcher.scan`."""
+
+    sentences: dict[str, str]
+    """First sentence (stripped) mentioning each field, keyed by field."""
+
+    markers: dict[str, int]
+    """Offset of the first occurrence of each title marker."""
+
+
+class KeywordMatcher:
+    """Find the first sentence per field and the first offset per marker."""
+
+    def __init__(self, field_keywords: Mapping[str, Sequence[str]], markers: Sequence[str]) -> None:
+        self._owners: dict[str, list[str]] = {}
+        for field, keywords in field_keywords.items():
+            for keyword in keywords:
+                self._owners.setdefault(keyword.lower(), []).append(field)
+        self._markers = {marker.lower(): marker for marker in markers}
+        self._fields = frozenset(field_keywords)
+
+        # Alternatives are factored into a trie (``c(?:hallenge|on(?:cern|...)))``)
+        # so the regex engine rejects most positions after one character. The
+        # match sits in a lookahead so hits may overlap: "project name is"
+        # must not hide the "issue" in "project name issue".
+        alternation = _trie_pattern({*self._owners, *self._markers})
+        self._pattern = re.compile(r"\b(?=(" + alternation + "))")
+        self._folded_pattern = re.compile(r"\b(?=(" + alternation + "))", re.IGNORECASE)
+
+    def scan(self, text: str) -> KeywordMatches:
+        """Return the first hits in ``text``."""
+
+        # Scanning one lowercased copy case-sensitively is several times faster
+        # than IGNORECASE; the rare texts whose length changes when lowercased
+        # (e.g. "İ") are scanned in place so offsets stay valid.
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            found = self._pattern.finditer(lowered)
+        else:
+            found = self._folded_pattern.finditer(text)
+        return self._collect(text, found, [len(text)])[0]
+
+    def scan_many(self, texts: Sequence[str]) -> list[KeywordMatches]:
+        """Scan many texts with one regex pass over their concatenation.
+
+        Texts are joined with newlines, which are sentence boundaries, so no
+        sentence spans two texts. Marker offsets are relative to each text.
+        """
+
+        joined = "\n".join(texts)
+        lowered = joined.lower()
+        if len(lowered) != len(joined):
+            return [self.scan(text) for text in texts]
+        return self._collect(joined, self._pattern.finditer(lowered), [len(text) for text in texts])
+
+    def _collect(
+        self, text: str, found: Iterator[re.Match[str]], lengths: list[int]
+    ) -> list[KeywordMatches]:
+        """Assign hits to the newline-joined segments of ``lengths`` sizes."""
+
+        results = [KeywordMatches({}, {}) for _ in lengths]
+        if not results:
+            return results
+        single = len(results) == 1
+        index, start, end = 0, 0, lengths[0]
+        sentences, markers = results[0]
+        pending = len(self._fields) + len(self._markers)
+        sentence_end = -1
+
+        for match in found:
+            position = match.start()
+            if position > end:
+                # First hit in a later segment: move to it and reset.
+                while position > end:
+                    index += 1
+                    start = end + 1
+                    end = start + lengths[index]
+                sentences, markers = results[index]
+                pending = len(self._fields) + len(self._markers)
+                sentence_end = -1
+            elif not pending:
+                if single:
+                    break
+                continue
+            term = match.group(1).lower()
+
+            marker = self._markers.get(term)
+            if marker is not None and marker not in markers:
+                markers[marker] = position - start
+                pending -= 1
+
+            for field in self._owners.get(term, ()):
+                if field in sentences:
+                    continue
+                if position >= sentence_end:
+                    sentence_start, sentence_end = sentence_bounds(text, position)
+                    sentence = text[sentence_start:sentence_end].strip()
+                sentences[field] = sentence
+                pending -= 1
+
+        return results
+
+
+def _trie_pattern(terms: set[str]) -> str:
+    """Render ``terms`` as a prefix-factored regex alternation."""
+
+    trie: dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _render(node: dict[str, dict]) -> str:
+        branches = [re.escape(char) + _render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        # A term ending here makes the longer continuations optional.
+        optional = "" in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if optional else "")
+
+    return "(?:" + _render(trie) + ")"
+
+
+def sentence_bounds(text: str, position: int) -> tuple[int, int]:
+    """Return ``[start, end)`` of the sentence containing ``position``."""
+
+    start = max(text.rfind(".", 0, position), text.rfind("\n", 0, position)) + 1
+    boundary = _BOUNDARY.search(text, position)
+    return start, boundary.start() if boundary else len(text)
+
+
+def first_sentence(text: str) -> str | None:
+    """Return the first non-empty sentence without splitting the whole text."""
+
+    start = 0
+    for boundary in _BOUNDARY.finditer(text):
+        sentence = text[start:boundary.start()].strip()
+        if sentence:
+            return sentence
+        start = boundary.end()
+    return text[start:].strip() or None
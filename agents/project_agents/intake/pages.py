@@ -0,0 +1,169 @@
+"""Lazy access to document text stored page by page.
+
+The backend keeps every parsed upload's text in the ``document_pages``
+collection, one record per page keyed by content hash and page number, and
+sends only the page offsets with a workflow request (see
+``app.services.documents.store_pages``). `PagedText` stands in for the
+joined text in passage retrieval and fetches just the pages a slice touches,
+so intake reads a few pages of a long PDF instead of all of it.
+
+The document's search index is looked up the same way: the backend splits it
+into ``document_index_chunks`` records (see
+``app.services.documents.store_search_index``) and `load_search_index`
+merges them back, so the index never travels in the request or the
+checkpointed state.
+
+Loading is synchronous (pymongo); async callers run it in a worker thread.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+from typing import Any, Callable, Iterable
+
+from pymongo import MongoClient
+from pymongo.collection import Collection
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+
+from project_agents.config.settings import get_settings
+from project_agents.tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+# Must match ``PAGE_SEPARATOR`` in the backend.
+PAGE_SEPARATOR = "\n\n"
+
+PageLoader = Callable[[str, list[int]], dict[int, str]]
+
+
+class MissingPagesError(LookupError):
+    """Raised when stored pages of a document cannot be loaded."""
+
+    def __init__(self, sha256: str, pages: list[int]) -> None:
+        super().__init__(f"pages {pages} of {sha256} are unavailable")
+        self.sha256 = sha256
+        self.pages = pages
+
+
+class PagedText:
+    """Read-only, slice-able view of ``PAGE_SEPARATOR.join(pages)``, loaded on demand."""
+
+    def __init__(
+        self, sha256: str, spans: list[list[int]], loader: PageLoader | None = None
+    ) -> None:
+        self._sha256 = sha256
+        self._spans = spans
+        self._starts = [start for start, _ in spans]
+        self._loader = loader or load_pages
+        self._pages: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return self._spans[-1][1] if self._spans else 0
+
+    def __getitem__(self, key: slice) -> str:
+        start, stop, _ = key.indices(len(self))
+        pages = self._overlapping(start, stop)
+        if not pages:
+            return ""
+        self._load(pages)
+        base = self._spans[pages[0]][0]
+        joined = PAGE_SEPARATOR.join(self._pages[page] for page in range(pages[0], pages[-1] + 1))
+        return joined[max(start - base, 0):stop - base]
+
+    def __str__(self) -> str:
+        return self[:]
+
+    def load(self, ranges: Iterable[tuple[int, int] | list[int]]) -> None:
+        """Fetch every page the ``[start, end]`` ranges touch in one round trip."""
+
+        pages = sorted({page for start, end in ranges for page in self._overlapping(start, end)})
+        self._load(pages)
+
+    def _overlapping(self, start: int, stop: int) -> list[int]:
+        first = max(bisect.bisect_right(self._starts, start) - 1, 0)
+        last = bisect.bisect_left(self._starts, stop)
+        return [page for page in range(first, last) if self._spans[page][1] > start]
+
+    def _load(self, pages: list[int]) -> None:
+        missing = [page for page in pages if page not in self._pages]
+        if not missing:
+            return
+        loaded = self._loader(self._sha256, missing)
+        unavailable = [
+            page
+            for page in missing
+            if page not in loaded or len(loaded[page]) != _span_length(self._spans[page])
+        ]
+        if unavailable:
+            raise MissingPagesError(self._sha256, unavailable)
+        for page in missing:
+            self._pages[page] = loaded[page]
+
+
+def _span_length(span: list[int]) -> int:
+    return span[1] - span[0]
+
+
+_database: Database | None = None
+_database_lock = threading.Lock()
+
+
+def load_pages(sha256: str, pages: list[int]) -> dict[int, str]:
+    """Return ``{page: text}`` for the requested pages of a stored document."""
+
+    collection = _collection("document_pages")
+    with start_span("mongo load document pages", kind="client", pages=len(pages)):
+        try:
+            records = collection.find(
+                {"sha256": sha256, "page": {"$in": pages}}, {"_id": 0, "page": 1, "text": 1}
+            )
+            return {record["page"]: record["text"] for record in records}
+        except PyMongoError as exc:
+            logger.warning("Could not load pages of %s: %s", sha256, exc)
+            return {}
+
+
+def load_search_index(sha256: str) -> dict[str, Any] | None:
+    """Return the stored search index of a document, or None if it has none."""
+
+    collection = _collection("document_index_chunks")
+    with start_span("mongo load search index", kind="client"):
+        try:
+            chunks = list(
+                collection.find({"sha256": sha256}, {"_id": 0, "sha256": 0}).sort("chunk", 1)
+            )
+        except PyMongoError as exc:
+            logger.warning("Could not load the search index of %s: %s", sha256, exc)
+            return None
+    if not chunks:
+        return None
+    index: dict[str, Any] = {
+        "version": chunks[0].get("version"),
+        "passages": [],
+        "lengths": [],
+        "postings": {},
+    }
+    for chunk in chunks:
+        index["passages"].extend(chunk["passages"])
+        index["lengths"].extend(chunk["lengths"])
+        for term, postings in chunk["postings"].items():
+            index["postings"].setdefault(term, []).extend(postings)
+    return index
+
+
+def _collection(name: str) -> Collection:
+    global _database  # noqa: PLW0603 - module-level singleton
+
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                settings = get_settings()
+                client: MongoClient[dict[str, Any]] = MongoClient(
+                    settings.mongo_uri,
+                    serverSelectionTimeoutMS=settings.document_pages_mongo_timeout_ms,
+                )
+                _database = client[settings.mongo_database]
+    return _database[name]
@@ -0,0 +1,136 @@
+"""BM25 passage retrieval over the search indexes built at upload time.
+
+The backend stores an inverted index for every uploaded document (see
+``app.services.documents.build_search_index``). Instead of sending a whole
+document to the model, the intake queries that index once per summary field,
+using the field's `KEYWORD_MAP` keywords and its `SUMMARY_FIELDS` question, and
+keeps only the top passages for each. Paged documents (`PagedText`) then
+load only the pages those passages fall on.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+import numpy as np
+
+from project_agents.intake.analyzer import KEYWORD_MAP, SUMMARY_FIELDS
+from project_agents.intake.pages import PagedText
+
+# Must match ``SEARCH_INDEX_VERSION`` and tokenization in the backend.
+SEARCH_INDEX_VERSION = 1
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_QUERY_STOPWORDS = frozenset(
+    "a an and any are do for have how is of on or the to what who will with you your".split()
+)
+
+# Standard Okapi BM25 parameters.
+_K1 = 1.2
+_B = 0.75
+
+
+def index_terms(text: str) -> list[str]:
+    """Tokenize exactly like the backend index builder."""
+
+    return [_fold_plural(token) for token in _TOKEN.findall(text.lower())]
+
+
+def field_queries() -> dict[str, list[str]]:
+    """Return the query terms used for each summary field."""
+
+    queries: dict[str, list[str]] = {}
+    for field, question in SUMMARY_FIELDS.items():
+        terms = [term for term in index_terms(question) if term not in _QUERY_STOPWORDS]
+        terms.extend(_fold_plural(keyword) for keyword in KEYWORD_MAP.get(field, []))
+        queries[field] = list(dict.fromkeys(terms))
+    return queries
+
+
+class PassageIndex:
+    """Query-side view of a stored BM25 index."""
+
+    def __init__(self, text: str | PagedText, payload: dict[str, Any]) -> None:
+        self._text = text
+        self._spans = payload["passages"]
+        self._postings: dict[str, list[list[int]]] = payload["postings"]
+        self._lengths = np.asarray(payload["lengths"], dtype=np.float64)
+        average = self._lengths.mean() if self._lengths.size else 0.0
+        # Per-passage length normalisation, computed once per index.
+        self._norm = _K1 * (1 - _B + _B * self._lengths / average) if average else None
+
+    @classmethod
+    def from_document(cls, text: str | PagedText | None, payload: Any) -> PassageIndex | None:
+        """Return an index for a document, or None if it has no usable one."""
+
+        if not text or not isinstance(payload, dict):
+            return None
+        if payload.get("version") != SEARCH_INDEX_VERSION or not payload.get("passages"):
+            return None
+        return cls(text, payload)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def passage(self, position: int) -> str:
+        start, end = self._spans[position]
+        return self._text[start:end].strip()
+
+    def scores(self, terms: list[str]) -> np.ndarray:
+        """BM25 score of every passage for ``terms``."""
+
+        total = len(self._spans)
+        scores = np.zeros(total, dtype=np.float64)
+        if self._norm is None:
+            return scores
+        for term in dict.fromkeys(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            pairs = np.asarray(postings, dtype=np.int64)
+            positions = pairs[:, 0]
+            frequencies = pairs[:, 1].astype(np.float64)
+            frequency_in_docs = len(pairs)
+            idf = np.log1p((total - frequency_in_docs + 0.5) / (frequency_in_docs + 0.5))
+            scores[positions] += (
+                idf * frequencies * (_K1 + 1) / (frequencies + self._norm[positions])
+            )
+        return scores
+
+    def top_passages(self, terms: list[str], k: int) -> list[int]:
+        """Positions of the ``k`` best passages with a positive score."""
+
+        scores = self.scores(terms)
+        if k <= 0 or not scores.any():
+            return []
+        k = min(k, scores.size)
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [int(position) for position in ranked if scores[position] > 0]
+
+
+def select_passages(text: str | PagedText | None, payload: Any, top_k: int) -> str | None:
+    """Return the document's evidence for every summary field.
+
+    The union of the top ``top_k`` passages per field is returned in document
+    order. None means the document has no usable index and should be used as
+    is.
+    """
+
+    index = PassageIndex.from_document(text, payload)
+    if index is None:
+        return None
+    selected: set[int] = set()
+    for terms in field_queries().values():
+        selected.update(index.top_passages(terms, top_k))
+    positions = sorted(selected)
+    if isinstance(text, PagedText):
+        text.load(payload["passages"][position] for position in positions)
+    return "\n\n".join(index.passage(position) for position in positions)
+
+
+def _fold_plural(token: str) -> str:
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+import logging
 import random
-from typing import Iterable
+from typing import Callable, Iterable
 
-from openai import OpenAI
-
-from project_agents.config.settings import get_settings
+from project_agents.llm import LLMError, get_llm_client
+from project_agents.metrics import record_fallback
 from project_agents.models import IntakeInsights, SummaryPayload
 
+logger = logging.getLogger(__name__)
+
 _FALLBACK_ACKS = [
     "Great, I captured {captured}.",
     "Thanks! I now know {captured}.",
@@ -53,6 +55,22 @@ def _fallback_message(insights: IntakeInsights) -> str:
     return " ".join(parts)
 
 
+_TONE_SYSTEM_PROMPT = (
+    "You are an empathetic project intake assistant. Be friendly, natural, and conversational."
+)
+
+
+def _tone_messages(
+    summary: SummaryPayload,
+    follow_ups: list[str],
+    insights: IntakeInsights,
+) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": _TONE_SYSTEM_PROMPT},
+        {"role": "user", "content": _build_prompt(summary, follow_ups, insights)},
+    ]
+
+
 def generate_follow_up_message(
     summary: SummaryPayload,
     follow_ups: list[str],
@@ -60,32 +78,63 @@ def generate_follow_up_message(
 ) -> str:
     """Craft a conversational assistant reply."""
 
-    settings = get_settings()
-    if settings.openai_api_key:
+    client = get_llm_client()
+    if client.enabled:
         try:
-            client = OpenAI(api_key=settings.openai_api_key)
-            prompt = _build_prompt(summary, follow_ups, insights)
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an empathetic project intake assistant. Be friendly, natural, and conversational.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+            content = client.complete(
+                _tone_messages(summary, follow_ups, insights),
+                call_site="tone",
                 max_tokens=256,
                 temperature=0.4,
+                documents=summary.documents,
             )
-            content = response.choices[0].message.content
             if content and content.strip():
                 return content.strip()
-        except Exception:  # noqa: BLE001
-            pass
+        except LLMError as exc:
+            logger.warning("LLM follow-up failed, using template reply: %s", exc)
 
+    record_fallback("tone", client.enabled)
     return _fallback_message(insights)
 
 
+async def agenerate_follow_up_message(
+    summary: SummaryPayload,
+    follow_ups: list[str],
+    insights: IntakeInsights,
+    on_token: Callable[[str], None] | None = None,
+) -> str:
+    """Async variant of `generate_follow_up_message`.
+
+    When ``on_token`` is given the reply is streamed through it as it is
+    generated; the template fallback is delivered as a single token.
+    """
+
+    client = get_llm_client()
+    if client.enabled:
+        request = {
+            "call_site": "tone",
+            "max_tokens": 256,
+            "temperature": 0.4,
+            "documents": summary.documents,
+        }
+        messages = _tone_messages(summary, follow_ups, insights)
+        try:
+            if on_token is not None:
+                content = await client.astream(messages, on_token=on_token, **request)
+            else:
+                content = await client.acomplete(messages, **request)
+            if content and content.strip():
+                return content.strip()
+        except LLMError as exc:
+            logger.warning("LLM follow-up failed, using template reply: %s", exc)
+
+    record_fallback("tone", client.enabled)
+    message = _fallback_message(insights)
+    if on_token is not None:
+        on_token(message)
+    return message
+
+
 def _build_prompt(summary: SummaryPayload, follow_ups: list[str], insights: IntakeInsights) -> str:
     captured = _format_fields(insights.captured_fields) or "nothing yet"
     missing = "\n".join(f"- {item}" for item in follow_ups) or "- None"
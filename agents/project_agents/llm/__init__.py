@@ -0,0 +1,21 @@
+"""Shared LLM client layer."""
+
+from .cache import LLMResponseCache, get_llm_cache, make_cache_key
+from .client import (
+    LLMClient,
+    LLMError,
+    close_llm_client,
+    get_llm_client,
+    warm_up_llm_client,
+)
+
+__all__ = [
+    "LLMClient",
+    "LLMError",
+    "LLMResponseCache",
+    "close_llm_client",
+    "get_llm_cache",
+    "get_llm_client",
+    "make_cache_key",
+    "warm_up_llm_client",
+]
@@ -0,0 +1,265 @@
+"""Two-tier cache for LLM completions.
+
+Retries, page refreshes, and demo scripts replay identical prompts. Responses
+are cached under a normalized hash of the model, messages, sampling and output
+parameters, and document list: first in a bounded in-process LRU with TTL,
+then in a MongoDB collection whose TTL index expires entries server-side. The
+Mongo tier is best-effort; while the database is unreachable the cache serves
+from memory and retries Mongo every ``_MONGO_RETRY_SECONDS``. Mongo calls block,
+so async callers make them from worker threads and the service creates the TTL
+index during startup (`LLMResponseCache.ensure_index`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from pymongo import MongoClient
+from pymongo.collection import Collection
+from pymongo.errors import PyMongoError
+
+from project_agents.config.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+# After a failed Mongo call the tier is skipped for this long, then retried.
+_MONGO_RETRY_SECONDS = 30.0
+
+
+def make_cache_key(
+    model: str,
+    messages: Iterable[dict[str, str]],
+    temperature: float,
+    documents: Iterable[str] | None = None,
+    *,
+    max_tokens: int | None = None,
+    response_format: dict[str, Any] | None = None,
+) -> str:
+    """Return a stable hash for a completion request.
+
+    Whitespace runs in message content are collapsed and document names are
+    de-duplicated and sorted so cosmetic differences still hit the cache.
+    ``max_tokens`` and ``response_format`` change the reply, so they are part
+    of the key.
+    """
+
+    canonical = {
+        "model": model,
+        "messages": [
+            [message.get("role", ""), " ".join(message.get("content", "").split())]
+            for message in messages
+        ],
+        "temperature": round(float(temperature), 4),
+        "documents": sorted({name.strip() for name in documents or [] if name}),
+        "max_tokens": max_tokens,
+        "response_format": response_format,
+    }
+    encoded = json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """In-process LRU backed by an optional MongoDB collection."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        collection: Collection | None = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._collection = collection
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._index_ready = False
+        self._mongo_retry_at = 0.0
+        self._counters = {"memory_hits": 0, "mongo_hits": 0, "misses": 0, "stores": 0}
+
+    def get(self, key: str) -> str | None:
+        """Return the cached completion for ``key`` or None."""
+
+        value = self._memory_get(key)
+        if value is not None:
+            return value
+        value = self._mongo_get(key)
+        self._record_lookup(key, value)
+        return value
+
+    async def aget(self, key: str) -> str | None:
+        """Async lookup; the Mongo tier is consulted from a worker thread."""
+
+        value = self._memory_get(key)
+        if value is not None:
+            return value
+        value = None
+        if self._mongo_due():
+            value = await asyncio.to_thread(self._mongo_get, key)
+        self._record_lookup(key, value)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a completion in both tiers."""
+
+        self._memory_set(key, value)
+        self._mongo_set(key, value)
+
+    async def aset(self, key: str, value: str) -> None:
+        self._memory_set(key, value)
+        if self._mongo_due():
+            await asyncio.to_thread(self._mongo_set, key, value)
+
+    def ensure_index(self) -> bool:
+        """Create the Mongo tier's TTL index; return whether the tier is usable.
+
+        Blocks on Mongo, so async code runs it in a worker thread. A failure
+        puts the tier in backoff; lookups retry the index once it expires.
+        """
+
+        if self._collection is None:
+            return False
+        if self._index_ready:
+            return True
+        try:
+            self._collection.create_index(
+                "created_at",
+                expireAfterSeconds=int(self._ttl_seconds),
+                name="llm_cache_ttl",
+            )
+        except PyMongoError as exc:
+            self._mongo_failed("index creation", exc)
+            return False
+        self._index_ready = True
+        return True
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the current in-memory size."""
+
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        """Drop in-memory entries and reset counters."""
+
+        with self._lock:
+            self._entries.clear()
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def _memory_get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self._counters["memory_hits"] += 1
+            return value
+
+    def _memory_set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self._counters["stores"] += 1
+
+    def _record_lookup(self, key: str, value: str | None) -> None:
+        if value is None:
+            with self._lock:
+                self._counters["misses"] += 1
+            return
+        with self._lock:
+            self._counters["mongo_hits"] += 1
+        # Promote so the next lookup is served from memory.
+        self._memory_set(key, value)
+
+    def _mongo_due(self) -> bool:
+        return self._collection is not None and time.monotonic() >= self._mongo_retry_at
+
+    def _mongo_ready(self) -> bool:
+        return self._mongo_due() and self.ensure_index()
+
+    def _mongo_failed(self, action: str, exc: PyMongoError) -> None:
+        self._mongo_retry_at = time.monotonic() + _MONGO_RETRY_SECONDS
+        logger.warning(
+            "LLM cache %s failed; serving from memory for %.0fs: %s",
+            action,
+            _MONGO_RETRY_SECONDS,
+            exc,
+        )
+
+    def _mongo_get(self, key: str) -> str | None:
+        if not self._mongo_ready():
+            return None
+        try:
+            record = self._collection.find_one({"_id": key})
+        except PyMongoError as exc:
+            self._mongo_failed("lookup", exc)
+            return None
+        if not record:
+            return None
+        # The TTL monitor only sweeps once a minute, so check freshness here too.
+        created_at = record.get("created_at")
+        if created_at is not None:
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            age = datetime.now(timezone.utc) - created_at
+            if age > timedelta(seconds=self._ttl_seconds):
+                return None
+        value = record.get("value")
+        return value if isinstance(value, str) else None
+
+    def _mongo_set(self, key: str, value: str) -> None:
+        if not self._mongo_ready():
+            return
+        try:
+            self._collection.replace_one(
+                {"_id": key},
+                {"_id": key, "value": value, "created_at": datetime.now(timezone.utc)},
+                upsert=True,
+            )
+        except PyMongoError as exc:
+            self._mongo_failed("write", exc)
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide response cache (no Mongo round trip)."""
+    global _cache  # noqa: PLW0603 - module-level singleton
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                settings = get_settings()
+                _cache = LLMResponseCache(
+                    max_entries=settings.llm_cache_max_entries,
+                    ttl_seconds=settings.llm_cache_ttl_seconds,
+                    collection=_connect_collection(settings),
+                )
+    return _cache
+
+
+def _connect_collection(settings: Settings) -> Collection | None:
+    if not settings.llm_cache_mongo_enabled:
+        return None
+    # MongoClient connects in the background; nothing here waits on the server.
+    client: MongoClient[dict[str, Any]] = MongoClient(
+        settings.mongo_uri,
+        serverSelectionTimeoutMS=settings.llm_cache_mongo_timeout_ms,
+    )
+    return client[settings.mongo_database][settings.llm_cache_collection]
@@ -0,0 +1,456 @@
+"""Process-wide, pooled LLM client shared by every call site.
+
+A single OpenAI client (and one async client per event loop) keeps HTTP
+keep-alive connections and TLS sessions warm between calls. Every request is
+bounded by a max-in-flight semaphore, carries a per-call timeout, and is
+retried with jittered exponential backoff on rate limits, server errors, and
+connection failures. SDK-level retries are disabled so this module owns the
+retry budget. Successful completions are stored in the two-tier response
+cache (`project_agents.llm.cache`) so replayed prompts skip the round trip.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+import httpx
+import openai
+from openai import AsyncOpenAI, OpenAI
+
+from project_agents.config.settings import Settings, get_settings
+from project_agents.llm.cache import LLMResponseCache, get_llm_cache, make_cache_key
+from project_agents.metrics import (
+    LLM_CACHE_HITS,
+    LLM_REQUEST_SECONDS,
+    LLM_RETRIES,
+    LLM_TOKENS,
+)
+from project_agents.tracing import set_span_attributes, start_span
+
+logger = logging.getLogger(__name__)
+
+
+class LLMError(RuntimeError):
+    """Raised when an LLM call fails after exhausting its retry budget."""
+
+
+class _LoopState:
+    """Async client and semaphore bound to a single event loop."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        client: AsyncOpenAI,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        self.loop = loop
+        self.client = client
+        self.semaphore = semaphore
+
+
+class LLMClient:
+    """Chat-completions facade with pooling, concurrency limits, and retries."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport | None = None,
+        cache: LLMResponseCache | None = None,
+    ) -> None:
+        self._settings = settings
+        self._transport = transport
+        self._cache = cache
+        self._sync_client: OpenAI | None = None
+        self._sync_semaphore = threading.BoundedSemaphore(settings.llm_max_in_flight)
+        self._loop_state: _LoopState | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether an API key is configured."""
+
+        return bool(self._settings.openai_api_key)
+
+    def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        call_site: str,
+        model: str | None = None,
+        temperature: float,
+        max_tokens: int,
+        response_format: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        documents: list[str] | None = None,
+    ) -> str | None:
+        """Run a chat completion and return the first choice's content.
+
+        ``model`` defaults to the ``LLM_MODEL`` setting. ``documents`` only
+        feeds the cache key; the names are expected to be part of the prompt
+        already.
+        """
+
+        model = model or self._settings.llm_model
+
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache_key(
+                model, messages, temperature, documents, max_tokens, response_format
+            )
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                LLM_CACHE_HITS.labels(call_site=call_site).inc()
+                return cached
+
+        request = self._request_kwargs(
+            messages, model, temperature, max_tokens, response_format, timeout
+        )
+        client = self._get_sync_client()
+        attempt = 0
+        with _observe_call(call_site, model):
+            while True:
+                try:
+                    with self._sync_semaphore:
+                        response = client.chat.completions.create(**request)
+                    _record_usage(call_site, response.usage)
+                    content = _message_content(response, call_site)
+                    if cache_key is not None and content:
+                        self._cache.set(cache_key, content)
+                    return content
+                except openai.OpenAIError as exc:
+                    delay = self._retry_delay(exc, attempt, call_site)
+                    time.sleep(delay)
+                    attempt += 1
+
+    async def acomplete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        call_site: str,
+        model: str | None = None,
+        temperature: float,
+        max_tokens: int,
+        response_format: dict[str, Any] | None = None,
+        timeout: float | None = None,
+        documents: list[str] | None = None,
+    ) -> str | None:
+        """Async counterpart of `complete`."""
+
+        model = model or self._settings.llm_model
+
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache_key(
+                model, messages, temperature, documents, max_tokens, response_format
+            )
+            cached = await self._cache.aget(cache_key)
+            if cached is not None:
+                LLM_CACHE_HITS.labels(call_site=call_site).inc()
+                return cached
+
+        request = self._request_kwargs(
+            messages, model, temperature, max_tokens, response_format, timeout
+        )
+        state = self._get_loop_state()
+        attempt = 0
+        with _observe_call(call_site, model):
+            while True:
+                try:
+                    async with state.semaphore:
+                        response = await state.client.chat.completions.create(**request)
+                    _record_usage(call_site, response.usage)
+                    content = _message_content(response, call_site)
+                    if cache_key is not None and content:
+                        await self._cache.aset(cache_key, content)
+                    return content
+                except openai.OpenAIError as exc:
+                    delay = self._retry_delay(exc, attempt, call_site)
+                    await asyncio.sleep(delay)
+                    attempt += 1
+
+    async def astream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        call_site: str,
+        model: str | None = None,
+        temperature: float,
+        max_tokens: int,
+        on_token: Callable[[str], None],
+        timeout: float | None = None,
+        documents: list[str] | None = None,
+    ) -> str | None:
+        """Stream a chat completion, calling ``on_token`` for every delta.
+
+        Returns the full text. Retries only happen before the first token has
+        been delivered; a cached response is delivered as a single token.
+        """
+
+        model = model or self._settings.llm_model
+
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache_key(model, messages, temperature, documents, max_tokens)
+            cached = await self._cache.aget(cache_key)
+            if cached is not None:
+                LLM_CACHE_HITS.labels(call_site=call_site).inc()
+                on_token(cached)
+                return cached
+
+        request = self._request_kwargs(messages, model, temperature, max_tokens, None, timeout)
+        state = self._get_loop_state()
+        attempt = 0
+        with _observe_call(call_site, model):
+            while True:
+                parts: list[str] = []
+                try:
+                    async with state.semaphore:
+                        stream = await state.client.chat.completions.create(
+                            **request, stream=True, stream_options={"include_usage": True}
+                        )
+                        async for chunk in stream:
+                            # With include_usage the final chunk carries only usage.
+                            _record_usage(call_site, chunk.usage)
+                            if not chunk.choices:
+                                continue
+                            token = chunk.choices[0].delta.content
+                            if token:
+                                parts.append(token)
+                                on_token(token)
+                    content = "".join(parts)
+                    if cache_key is not None and content:
+                        await self._cache.aset(cache_key, content)
+                    return content
+                except openai.OpenAIError as exc:
+                    if parts:
+                        raise LLMError(f"{call_site} LLM stream interrupted: {exc}") from exc
+                    delay = self._retry_delay(exc, attempt, call_site)
+                    await asyncio.sleep(delay)
+                    attempt += 1
+
+    def close(self) -> None:
+        """Release pooled connections held by the sync client."""
+
+        with self._lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+            # Async pools are tied to their loop; dropping the reference lets
+            # them be collected once that loop shuts down.
+            self._loop_state = None
+
+    def _request_kwargs(
+        self,
+        messages: list[dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        response_format: dict[str, Any] | None,
+        timeout: float | None,
+    ) -> dict[str, Any]:
+        request: dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "timeout": timeout or self._settings.llm_timeout_seconds,
+        }
+        if response_format is not None:
+            request["response_format"] = response_format
+        return request
+
+    def _retry_delay(self, exc: openai.OpenAIError, attempt: int, call_site: str) -> float:
+        """Return the backoff delay for ``exc`` or raise if it should not be retried."""
+
+        if not _is_retryable(exc) or attempt >= self._settings.llm_max_retries:
+            raise LLMError(f"{call_site} LLM call failed: {exc}") from exc
+
+        LLM_RETRIES.labels(call_site=call_site).inc()
+        set_span_attributes(retries=attempt + 1)
+        ceiling = min(
+            self._settings.llm_backoff_max_seconds,
+            self._settings.llm_backoff_base_seconds * (2**attempt),
+        )
+        # Full jitter keeps a burst of clients from retrying in lockstep.
+        delay = random.uniform(0, ceiling)
+        retry_after = _retry_after_seconds(exc)
+        if retry_after is not None:
+            delay = min(max(delay, retry_after), self._settings.llm_backoff_max_seconds)
+        logger.warning(
+            "%s LLM call failed (%s); retry %d/%d in %.2fs",
+            call_site,
+            type(exc).__name__,
+            attempt + 1,
+            self._settings.llm_max_retries,
+            delay,
+        )
+        return delay
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self._settings.llm_max_connections,
+            max_keepalive_connections=self._settings.llm_max_keepalive_connections,
+            keepalive_expiry=self._settings.llm_keepalive_expiry_seconds,
+        )
+
+    def _cache_key(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        temperature: float,
+        documents: list[str] | None,
+        max_tokens: int,
+        response_format: dict[str, Any] | None = None,
+    ) -> str:
+        # A stand-in or proxy serving the same model name must not share
+        # cached completions with the official API.
+        if self._settings.llm_base_url:
+            model = f"{self._settings.llm_base_url}#{model}"
+        return make_cache_key(
+            model,
+            messages,
+            temperature,
+            documents,
+            max_tokens=max_tokens,
+            response_format=response_format,
+        )
+
+    def _get_sync_client(self) -> OpenAI:
+        if self._sync_client is None:
+            with self._lock:
+                if self._sync_client is None:
+                    http_client = httpx.Client(
+                        limits=self._limits(),
+                        timeout=self._settings.llm_timeout_seconds,
+                        transport=self._transport,  # type: ignore[arg-type]
+                    )
+                    self._sync_client = OpenAI(
+                        api_key=self._settings.openai_api_key,
+                        base_url=self._settings.llm_base_url or None,
+                        max_retries=0,
+                        http_client=http_client,
+                    )
+        return self._sync_client
+
+    def _get_loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loop_state
+        if state is None or state.loop is not loop:
+            http_client = httpx.AsyncClient(
+                limits=self._limits(),
+                timeout=self._settings.llm_timeout_seconds,
+                transport=self._transport,  # type: ignore[arg-type]
+            )
+            state = _LoopState(
+                loop=loop,
+                client=AsyncOpenAI(
+                    api_key=self._settings.openai_api_key,
+                    base_url=self._settings.llm_base_url or None,
+                    max_retries=0,
+                    http_client=http_client,
+                ),
+                semaphore=asyncio.Semaphore(self._settings.llm_max_in_flight),
+            )
+            self._loop_state = state
+        return state
+
+
+def _is_retryable(exc: openai.OpenAIError) -> bool:
+    if isinstance(exc, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return False
+
+
+@contextmanager
+def _observe_call(call_site: str, model: str) -> Iterator[None]:
+    """Time and trace one logical call, retries and backoff included."""
+
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        with start_span(f"llm {call_site}", kind="client", call_site=call_site, model=model):
+            yield
+        outcome = "ok"
+    finally:
+        LLM_REQUEST_SECONDS.labels(call_site=call_site, outcome=outcome).observe(
+            time.perf_counter() - started
+        )
+
+
+def _message_content(response: Any, call_site: str) -> str | None:
+    # A malformed reply is a failed call, not an IndexError at the call site.
+    if not response.choices:
+        raise LLMError(f"{call_site} LLM returned no choices")
+    return response.choices[0].message.content
+
+
+def _record_usage(call_site: str, usage: Any) -> None:
+    if usage is None:
+        return
+    LLM_TOKENS.labels(call_site=call_site, direction="prompt").inc(usage.prompt_tokens or 0)
+    LLM_TOKENS.labels(call_site=call_site, direction="completion").inc(
+        usage.completion_tokens or 0
+    )
+    set_span_attributes(
+        prompt_tokens=usage.prompt_tokens or 0, completion_tokens=usage.completion_tokens or 0
+    )
+
+
+def _retry_after_seconds(exc: openai.OpenAIError) -> float | None:
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    header = response.headers.get("retry-after")
+    try:
+        return float(header) if header is not None else None
+    except ValueError:
+        return None
+
+
+_client: LLMClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """Return the process-wide LLM client."""
+    global _client  # noqa: PLW0603 - module-level singleton
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                settings = get_settings()
+                cache = None
+                if settings.llm_cache_enabled and settings.openai_api_key:
+                    cache = get_llm_cache()
+                _client = LLMClient(settings, cache=cache)
+    return _client
+
+
+def warm_up_llm_client() -> None:
+    """Build the client and create its cache's Mongo index.
+
+    Blocks on Mongo; the service calls it from a worker thread at startup so
+    the first request does not pay for (or stall the loop on) index creation.
+    """
+
+    client = get_llm_client()
+    if client._cache is not None:
+        client._cache.ensure_index()
+
+
+def close_llm_client() -> None:
+    """Close pooled connections and drop the singleton."""
+    global _client  # noqa: PLW0603
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -0,0 +1,194 @@
+"""OpenAI-compatible stand-in for load testing without the real API.
+
+Serves ``POST /v1/chat/completions`` (plain, ``json_object`` and streaming)
+and ``GET /v1/models`` with tunable latency, error rates and token rates, so
+the real client path (pooling, retries, caching, streaming) can be exercised
+offline. Point the agents at it with::
+
+    python main.py llm-standin --port 8090 --latency-ms 400 --error-rate 0.02
+    LLM_BASE_URL=http://localhost:8090/v1 OPENAI_API_KEY=local python main.py serve
+
+JSON-mode requests get the keyword heuristics' reading of the project
+description in the last user message (plus an ``assistant_message``), so
+responses parse like real ones.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, AsyncIterator, Literal
+from uuid import uuid4
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from project_agents.intake.analyzer import _extract_with_keywords
+from project_agents.intake.chunking import estimate_tokens
+
+
+class StandInConfig(BaseModel):
+    """Behaviour knobs for the stand-in server."""
+
+    latency_ms: float = Field(default=300.0, ge=0, description="Median time to first token.")
+    latency_distribution: Literal["fixed", "uniform", "lognormal"] = "lognormal"
+    latency_spread: float = Field(
+        default=0.5,
+        ge=0,
+        description="Lognormal sigma, or the +/- fraction of latency_ms for uniform.",
+    )
+    tokens_per_second: float = Field(
+        default=80.0, gt=0, description="Generation speed after the first token."
+    )
+    error_rate: float = Field(default=0.0, ge=0, le=1, description="Share of HTTP 500s.")
+    rate_limit_rate: float = Field(default=0.0, ge=0, le=1, description="Share of HTTP 429s.")
+    retry_after_seconds: float = Field(default=1.0, ge=0)
+    seed: int | None = None
+
+
+def create_standin_app(config: StandInConfig | None = None) -> FastAPI:
+    """Build the stand-in FastAPI app."""
+
+    config = config or StandInConfig()
+    rng = random.Random(config.seed)
+    app = FastAPI(title="LLM stand-in")
+
+    @app.get("/v1/models")
+    async def list_models() -> dict[str, Any]:
+        return {"object": "list", "data": [{"id": "stand-in", "object": "model"}]}
+
+    @app.post("/v1/chat/completions", response_model=None)
+    async def chat_completions(request: Request) -> JSONResponse | StreamingResponse:
+        body = await request.json()
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            return _error(429, "Rate limit reached (stand-in).", config.retry_after_seconds)
+        if roll < config.rate_limit_rate + config.error_rate:
+            return _error(500, "Internal error (stand-in).")
+
+        model = body.get("model", "stand-in")
+        content = _reply(body)
+        prompt_tokens = sum(
+            estimate_tokens(str(message.get("content", ""))) for message in body.get("messages", [])
+        )
+        tokens = _tokens(content, body.get("max_tokens"))
+        first_token_delay = _sample_latency(config, rng)
+
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream(model, tokens, first_token_delay, config.tokens_per_second),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(first_token_delay + len(tokens) / config.tokens_per_second)
+        return JSONResponse(
+            {
+                "id": f"chatcmpl-{uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "".join(tokens)},
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(tokens),
+                    "total_tokens": prompt_tokens + len(tokens),
+                },
+            }
+        )
+
+    return app
+
+
+def _sample_latency(config: StandInConfig, rng: random.Random) -> float:
+    """Seconds until the first token."""
+
+    base = config.latency_ms / 1000
+    if config.latency_distribution == "fixed" or base == 0:
+        return base
+    if config.latency_distribution == "uniform":
+        return max(rng.uniform(base * (1 - config.latency_spread), base * (1 + config.latency_spread)), 0.0)
+    # lognormvariate(0, sigma) has median 1, so latency_ms stays the median.
+    return base * rng.lognormvariate(0, config.latency_spread)
+
+
+def _reply(body: dict[str, Any]) -> str:
+    messages = body.get("messages", [])
+    user_text = next(
+        (str(message.get("content", "")) for message in reversed(messages) if message.get("role") == "user"),
+        "",
+    )
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        data = _extract_with_keywords(_description(user_text)).model_dump()
+        data["assistant_message"] = (
+            "Thanks for the details! What timeline and resources do you have in mind?"
+        )
+        return json.dumps(data)
+    return (
+        "Thanks for sharing that! I have noted the main points. "
+        "Could you tell me more about your timeline and how you will measure success?"
+    )
+
+
+def _description(user_text: str) -> str:
+    """Cut the project description out of the intake extraction prompt."""
+
+    _, found, rest = user_text.partition("Project description:\n")
+    if not found:
+        return user_text
+    for marker in ("\n\nUploaded documents:", "\n\nAlready captured", "\n\nExtract the following"):
+        rest = rest.split(marker, 1)[0]
+    return rest
+
+
+def _tokens(content: str, max_tokens: int | None) -> list[str]:
+    """Split ``content`` into roughly token-sized pieces that join back to it."""
+
+    pieces = [content[start:start + 4] for start in range(0, len(content), 4)]
+    # JSON must stay parseable, so the limit only truncates plain text.
+    if max_tokens and not content.startswith("{"):
+        pieces = pieces[:max_tokens]
+    return pieces
+
+
+async def _stream(
+    model: str, tokens: list[str], first_token_delay: float, tokens_per_second: float
+) -> AsyncIterator[str]:
+    completion_id = f"chatcmpl-{uuid4().hex}"
+    created = int(time.time())
+
+    def _chunk(delta: dict[str, str], finish_reason: str | None = None) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    await asyncio.sleep(first_token_delay)
+    yield _chunk({"role": "assistant", "content": ""})
+    for index, token in enumerate(tokens):
+        if index:
+            await asyncio.sleep(1 / tokens_per_second)
+        yield _chunk({"content": token})
+    yield _chunk({}, finish_reason="stop")
+    yield "data: [DONE]\n\n"
+
+
+def _error(status_code: int, message: str, retry_after: float | None = None) -> JSONResponse:
+    headers = {"retry-after": f"{retry_after:g}"} if retry_after is not None else None
+    return JSONResponse(
+        {"error": {"message": message, "type": "stand_in_error", "code": status_code}},
+        status_code=status_code,
+        headers=headers,
+    )
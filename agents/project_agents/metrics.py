@@ -0,0 +1,145 @@
+"""Prometheus metrics for the agents service.
+
+Metrics live in a dedicated `prometheus_client` registry, rendered by
+`render_metrics` at ``/metrics``. Recording a sample is a lock and a few
+additions, so the hooks in the nodes, the LLM client and the checkpointer cost
+microseconds per request.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+from typing import Any, Callable
+
+from prometheus_client import (
+    CONTENT_TYPE_PLAIN_0_0_4,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+from project_agents.tracing import start_span
+
+# The classic text format; every Prometheus version scrapes it.
+CONTENT_TYPE = CONTENT_TYPE_PLAIN_0_0_4
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STORAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+REGISTRY = CollectorRegistry()
+
+NODE_SECONDS = Histogram(
+    "agents_node_duration_seconds",
+    "Time spent in each workflow node.",
+    ("node",),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "agents_llm_request_duration_seconds",
+    "LLM call latency per call site, including retries and backoff.",
+    ("call_site", "outcome"),
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+LLM_TOKENS = Counter(
+    "agents_llm_tokens_total",
+    "Tokens reported by the LLM API per call site.",
+    ("call_site", "direction"),
+    registry=REGISTRY,
+)
+LLM_RETRIES = Counter(
+    "agents_llm_retries_total",
+    "LLM call attempts that were retried.",
+    ("call_site",),
+    registry=REGISTRY,
+)
+LLM_CACHE_HITS = Counter(
+    "agents_llm_cache_hits_total",
+    "LLM calls answered from the response cache.",
+    ("call_site",),
+    registry=REGISTRY,
+)
+HEURISTIC_FALLBACKS = Counter(
+    "agents_heuristic_fallbacks_total",
+    "Turns answered by keyword heuristics or templates instead of the LLM.",
+    ("call_site", "reason"),
+    registry=REGISTRY,
+)
+CHECKPOINT_SECONDS = Histogram(
+    "agents_checkpointer_duration_seconds",
+    "Checkpointer read and write latency.",
+    ("operation",),
+    buckets=STORAGE_BUCKETS,
+    registry=REGISTRY,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "agents_requests_in_flight",
+    "Workflow requests currently being served.",
+    ("endpoint",),
+    registry=REGISTRY,
+)
+
+_CHECKPOINT_OPERATIONS = {
+    "get_tuple": "get",
+    "aget_tuple": "get",
+    "put": "put",
+    "aput": "put",
+    "put_writes": "put_writes",
+    "aput_writes": "put_writes",
+}
+
+
+def record_fallback(call_site: str, llm_enabled: bool) -> None:
+    """Count a heuristic fallback, split by whether the LLM was tried at all."""
+
+    reason = "error" if llm_enabled else "disabled"
+    HEURISTIC_FALLBACKS.labels(call_site=call_site, reason=reason).inc()
+
+
+def instrument_checkpointer(saver: Any) -> Any:
+    """Time and trace the read and write methods of ``saver`` in place and return it.
+
+    The methods are shadowed on the instance, so the saver keeps its type and
+    LangGraph still accepts it. Calling this twice on one saver is a no-op.
+    """
+
+    if getattr(saver, "_metrics_instrumented", False):
+        return saver
+    for method_name, operation in _CHECKPOINT_OPERATIONS.items():
+        method = getattr(saver, method_name, None)
+        if method is not None:
+            setattr(saver, method_name, _timed(method, operation))
+    saver._metrics_instrumented = True  # noqa: SLF001 - marker on our own wrapper
+    return saver
+
+
+def _timed(method: Callable[..., Any], operation: str) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def _async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with CHECKPOINT_SECONDS.labels(operation).time(), _checkpoint_span(operation):
+                return await method(*args, **kwargs)
+
+        return _async_wrapper
+
+    @functools.wraps(method)
+    def _wrapper(*args: Any, **kwargs: Any) -> Any:
+        with CHECKPOINT_SECONDS.labels(operation).time(), _checkpoint_span(operation):
+            return method(*args, **kwargs)
+
+    return _wrapper
+
+
+def _checkpoint_span(operation: str):
+    return start_span(f"checkpointer {operation}", kind="client", operation=operation)
+
+
+def render_metrics() -> bytes:
+    """Return every metric in the Prometheus text format."""
+
+    return generate_latest(REGISTRY)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class SummaryPayload(BaseModel):
@@ -21,6 +21,10 @@ class SummaryPayload(BaseModel):
     documents: List[str] = Field(default_factory=list)
     opportunity_areas: List[str] = Field(default_factory=list)
 
+    # True when project_title is the first-sentence guess rather than a named
+    # title. Not serialized: a checkpointed title counts as explicit.
+    _inferred_title: bool = PrivateAttr(default=False)
+
 
 class LovableBrief(BaseModel):
     """Final Lovable-style brief delivered to the frontend/backend."""
@@ -1,12 +1,39 @@
 """FastAPI service exposing LangGraph workflow endpoints."""
 
-from typing import Literal, Optional
-
-from fastapi import FastAPI, status
-from pydantic import BaseModel, Field
-
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Literal, Optional
+
+from fastapi import FastAPI, Header, Request, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from project_brief_common.profiling import (
+    PROFILE_HEADER,
+    PROFILE_ID_HEADER,
+    PROFILE_QUERY,
+    PROFILE_SAMPLES_HEADER,
+    SamplingProfiler,
+    is_authorized,
+)
+from project_brief_common.sse import format_sse
+from pydantic import BaseModel, Field, model_validator
+
+from project_agents.config.settings import get_settings
+from project_agents.graphs.checkpointing import close_checkpointer
+from project_agents.graphs.registry import (
+    aget_project_brief_graph,
+    clear_graph_registry,
+    warm_up_graph,
+)
+from project_agents.llm import close_llm_client, warm_up_llm_client
+from project_agents.metrics import CONTENT_TYPE, REQUESTS_IN_FLIGHT, render_metrics
 from project_agents.models import BriefPayload, LovableBrief, SummaryPayload
-from project_agents.service import run_project_brief_workflow
+from project_agents.service import (
+    arun_project_brief_workflow,
+    astream_project_brief_workflow,
+)
+from project_agents.tracing import parse_traceparent, shutdown_tracing, start_span
 
 
 class ConversationTurn(BaseModel):
@@ -24,6 +51,13 @@ class DocumentReference(BaseModel):
     url: Optional[str] = None
     notes: Optional[str] = None
     text: Optional[str] = None
+    sha256: Optional[str] = Field(
+        default=None,
+        description="Content hash; the search index and any pages are stored under it.",
+    )
+    pages: Optional[list[list[int]]] = Field(
+        default=None, description="[start, end] offsets of each stored page, sent instead of text."
+    )
 
 
 class WorkflowRequest(BaseModel):
@@ -32,6 +66,19 @@ class WorkflowRequest(BaseModel):
     conversation: list[ConversationTurn] = Field(..., min_length=1)
     documents: list[DocumentReference] = Field(default_factory=list)
     thread_id: Optional[str] = None
+    continuation: bool = Field(
+        default=False,
+        description=(
+            "When true, conversation and documents hold only what was added since the "
+            "last run on thread_id; earlier context is restored from the checkpoint."
+        ),
+    )
+
+    @model_validator(mode="after")
+    def ensure_thread_for_continuation(self) -> "WorkflowRequest":
+        if self.continuation and not self.thread_id:
+            raise ValueError("thread_id is required when continuation is true.")
+        return self
 
 
 class WorkflowResponse(BaseModel):
@@ -44,29 +91,106 @@ class WorkflowResponse(BaseModel):
     assistant_message: str
 
 
-app = FastAPI(title="Project Brief Agents Service")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):  # pragma: no cover - exercised by the ASGI server
+    """Compile the workflow graph, prepare the LLM cache, and optionally warm up.
+
+    Uvicorn only accepts requests once this startup half has finished, so
+    `/health/live` answering means the service is warmed up.
+    """
+
+    settings = get_settings()
+    started = time.perf_counter()
+
+    await aget_project_brief_graph()
+    await asyncio.to_thread(warm_up_llm_client)
+    if settings.graph_warmup_enabled:
+        await warm_up_graph()
+
+    logger.info(
+        "Agents service ready in %.1f ms", (time.perf_counter() - started) * 1000
+    )
+    yield
+    clear_graph_registry()
+    close_checkpointer()
+    close_llm_client()
+    shutdown_tracing()
+
+
+app = FastAPI(title="Project Brief Agents Service", lifespan=lifespan)
+
+_PROFILED_PATHS = frozenset({"/workflow/run"})
+
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    """Profile requests that carry a valid ``X-Profile`` token.
+
+    See `project_brief_common.profiling`.
+    """
+
+    supplied = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY)
+    if supplied is None or request.url.path not in _PROFILED_PATHS:
+        return await call_next(request)
+
+    settings = get_settings()
+    if not is_authorized(supplied, settings.profiling_token):
+        return JSONResponse(
+            {"detail": "Profiling is disabled or the token is invalid."},
+            status_code=status.HTTP_403_FORBIDDEN,
+        )
+    with SamplingProfiler(settings.profiling_interval_ms / 1000) as profiler:
+        response = await call_next(request)
+    profile_id = await asyncio.to_thread(
+        profiler.save, settings.profiling_dir, request.url.path, settings.profiling_max_files
+    )
+    logger.info(
+        "Profiled %s: %d samples, profile %s", request.url.path, profiler.samples, profile_id
+    )
+    response.headers[PROFILE_ID_HEADER] = profile_id
+    response.headers[PROFILE_SAMPLES_HEADER] = str(profiler.samples)
+    return response
 
 
 @app.get("/health/live", status_code=status.HTTP_200_OK)
 async def live() -> dict[str, str]:
-    """Liveness probe."""
+    """Liveness and readiness probe; served only after startup warm-up completes."""
 
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> Response:
+    """Prometheus scrape endpoint."""
+
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+
 @app.post(
     "/workflow/run",
     response_model=WorkflowResponse,
     status_code=status.HTTP_200_OK,
 )
-async def run_workflow(payload: WorkflowRequest) -> WorkflowResponse:
-    """Execute the LangGraph workflow and return structured results."""
-
-    state = run_project_brief_workflow(
-        conversation=[turn.model_dump() for turn in payload.conversation],
-        documents=[doc.model_dump() for doc in payload.documents],
-        thread_id=payload.thread_id,
-    )
+async def run_workflow(
+    payload: WorkflowRequest, traceparent: str | None = Header(default=None)
+) -> WorkflowResponse:
+    """Execute the LangGraph workflow and return structured results.
+
+    A W3C ``traceparent`` header makes the run's spans children of the caller's.
+    """
+
+    with REQUESTS_IN_FLIGHT.labels(endpoint="run").track_inprogress(), start_span(
+        "POST /workflow/run", parent=parse_traceparent(traceparent), kind="server"
+    ):
+        state = await arun_project_brief_workflow(
+            conversation=[turn.model_dump() for turn in payload.conversation],
+            documents=[doc.model_dump() for doc in payload.documents],
+            thread_id=payload.thread_id,
+            continuation=payload.continuation,
+        )
     agent_payload = BriefPayload(**state)
     return WorkflowResponse(
         summary=agent_payload.summary,
@@ -75,3 +199,38 @@ async def run_workflow(payload: WorkflowRequest) -> WorkflowResponse:
         thread_id=agent_payload.thread_id,
         assistant_message=agent_payload.assistant_message,
     )
+
+
+@app.post("/workflow/stream", status_code=status.HTTP_200_OK)
+async def stream_workflow(
+    payload: WorkflowRequest, traceparent: str | None = Header(default=None)
+) -> StreamingResponse:
+    """Execute the workflow and stream progress as Server-Sent Events.
+
+    Emits ``started``, ``assistant_token``, ``intake_summary``, ``brief`` and
+    a final ``result`` event shaped like the `/workflow/run` response. Failures
+    after the stream has started are reported as an ``error`` event.
+    """
+
+    async def _events() -> AsyncIterator[str]:
+        # Tracked inside the generator: the handler returns before streaming starts.
+        with REQUESTS_IN_FLIGHT.labels(endpoint="stream").track_inprogress(), start_span(
+            "POST /workflow/stream", parent=parse_traceparent(traceparent), kind="server"
+        ):
+            try:
+                async for event, data in astream_project_brief_workflow(
+                    conversation=[turn.model_dump() for turn in payload.conversation],
+                    documents=[doc.model_dump() for doc in payload.documents],
+                    thread_id=payload.thread_id,
+                    continuation=payload.continuation,
+                ):
+                    yield format_sse(event, data)
+            except Exception as exc:  # noqa: BLE001 - surfaced to the client
+                logger.exception("Workflow stream failed")
+                yield format_sse("error", {"detail": str(exc)})
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,14 +1,20 @@
 """High-level interface for running the LangGraph workflow."""
 
-from typing import Iterable, Mapping
+from typing import AsyncIterator, Iterable, Mapping
+
+from langgraph.graph.state import CompiledStateGraph
 
 from project_agents.graphs.state import (
     ConversationTurn,
     DocumentReference,
     ProjectState,
+    extend_state,
     initialize_state,
 )
-from project_agents.graphs.workflow import build_project_brief_graph
+from project_agents.graphs.registry import (
+    aget_project_brief_graph,
+    get_project_brief_graph,
+)
 from project_agents.models import BriefPayload, LovableBrief, SummaryPayload
 
 
@@ -16,9 +22,113 @@ def run_project_brief_workflow(
     conversation: Iterable[Mapping[str, str]],
     documents: Iterable[Mapping[str, str | None]] | None = None,
     thread_id: str | None = None,
+    continuation: bool = False,
+) -> dict:
+    """Execute the workflow using the provided user input.
+
+    With ``continuation`` the inputs hold only turns and documents added since
+    the last run on ``thread_id``; the rest is restored from the checkpointer.
+    """
+
+    conversation_list, document_list = _normalize_inputs(conversation, documents)
+    graph = get_project_brief_graph()
+    thread_identifier = _thread_identifier(thread_id, continuation)
+    config = {"configurable": {"thread_id": thread_identifier}}
+    if continuation:
+        snapshot = graph.get_state(config)
+        initial_state = extend_state(snapshot.values, conversation_list, document_list)
+    else:
+        initial_state = initialize_state(conversation_list, document_list)
+    result = graph.invoke(initial_state, config=config)
+    return _to_payload(result, thread_identifier)
+
+
+async def arun_project_brief_workflow(
+    conversation: Iterable[Mapping[str, str]],
+    documents: Iterable[Mapping[str, str | None]] | None = None,
+    thread_id: str | None = None,
+    continuation: bool = False,
 ) -> dict:
-    """Execute the workflow using the provided user input."""
+    """Execute the workflow without blocking the running event loop."""
+
+    graph, initial_state, config = await _aprepare_run(
+        conversation, documents, thread_id, continuation
+    )
+    result = await graph.ainvoke(initial_state, config=config)
+    return _to_payload(result, config["configurable"]["thread_id"])
 
+
+async def astream_project_brief_workflow(
+    conversation: Iterable[Mapping[str, str]],
+    documents: Iterable[Mapping[str, str | None]] | None = None,
+    thread_id: str | None = None,
+    continuation: bool = False,
+) -> AsyncIterator[tuple[str, dict]]:
+    """Execute the workflow and yield ``(event, data)`` pairs as it progresses.
+
+    Events, in order: ``started`` (thread id), ``assistant_token`` (reply
+    tokens), ``intake_summary`` (intake node finished), ``brief`` (brief node
+    finished), and ``result`` (the same payload `arun_project_brief_workflow`
+    returns).
+    """
+
+    graph, initial_state, config = await _aprepare_run(
+        conversation, documents, thread_id, continuation
+    )
+    thread_identifier = config["configurable"]["thread_id"]
+    config["configurable"]["stream_tokens"] = True
+    yield "started", {"thread_id": thread_identifier}
+
+    final_state: dict = {}
+    async for mode, chunk in graph.astream(
+        initial_state, config=config, stream_mode=["updates", "custom"]
+    ):
+        if mode == "custom":
+            if chunk.get("event") == "assistant_token":
+                yield "assistant_token", {"token": chunk["token"]}
+            continue
+        for node_name, update in chunk.items():
+            final_state.update(update or {})
+            if node_name == "intake_agent":
+                yield "intake_summary", {
+                    "summary": update.get("summary", {}),
+                    "follow_up_questions": update.get("follow_up_questions", []),
+                    "assistant_message": update.get("assistant_message", ""),
+                }
+            elif node_name == "brief_agent":
+                yield "brief", {"brief": update.get("brief", {})}
+
+    yield "result", _to_payload(final_state, thread_identifier)
+
+
+async def _aprepare_run(
+    conversation: Iterable[Mapping[str, str]],
+    documents: Iterable[Mapping[str, str | None]] | None,
+    thread_id: str | None,
+    continuation: bool,
+) -> tuple[CompiledStateGraph, ProjectState, dict]:
+    conversation_list, document_list = _normalize_inputs(conversation, documents)
+    graph = await aget_project_brief_graph()
+    thread_identifier = _thread_identifier(thread_id, continuation)
+    config = {"configurable": {"thread_id": thread_identifier}}
+    if continuation:
+        snapshot = await graph.aget_state(config)
+        initial_state = extend_state(snapshot.values, conversation_list, document_list)
+    else:
+        initial_state = initialize_state(conversation_list, document_list)
+    return graph, initial_state, config
+
+
+def _thread_identifier(thread_id: str | None, continuation: bool) -> str:
+    if continuation and not thread_id:
+        raise ValueError("continuation requires an existing thread_id.")
+    return thread_id or generate_thread_id()
+
+
+def _normalize_inputs(
+    conversation: Iterable[Mapping[str, str]],
+    documents: Iterable[Mapping[str, str | None]] | None,
+) -> tuple[list[ConversationTurn], list[DocumentReference]]:
     conversation_list = [
         ConversationTurn(role=turn.get("role", "user"), content=turn.get("content", ""))
         for turn in conversation
@@ -36,15 +146,15 @@ def run_project_brief_workflow(
                     url=doc.get("url"),
                     notes=doc.get("notes"),
                     text=doc.get("text"),
+                    sha256=doc.get("sha256"),
+                    pages=doc.get("pages"),
                 )
             )
 
-    graph = build_project_brief_graph()
-    initial_state = initialize_state(conversation_list, document_list)
-    thread_identifier = thread_id or generate_thread_id()
-    config = {"configurable": {"thread_id": thread_identifier}}
-    result = graph.invoke(initial_state, config=config)
+    return conversation_list, document_list
+
 
+def _to_payload(result: Mapping, thread_identifier: str) -> dict:
     summary_payload = SummaryPayload(**result.get("summary", {}))
     brief_payload = LovableBrief(**result.get("brief", {}))
     follow_ups = result.get("follow_up_questions", [])
@@ -0,0 +1,34 @@
+"""OpenTelemetry tracing for the agents service.
+
+The backend sends a ``traceparent`` header with every workflow call; the
+server endpoints continue that trace and the graph nodes, LLM calls and
+Mongo operations open child spans. The setup is shared with the backend
+(see `project_brief_common.tracing`).
+"""
+
+from project_brief_common.tracing import (
+    ServiceTracing,
+    parse_traceparent,
+    set_span_attributes,
+)
+
+from project_agents.config.settings import get_settings
+
+SERVICE_NAME = "project-brief-agents"
+
+_tracing = ServiceTracing(SERVICE_NAME, get_settings)
+
+get_tracer = _tracing.get_tracer
+set_exporter = _tracing.set_exporter
+shutdown_tracing = _tracing.shutdown
+start_span = _tracing.start_span
+
+__all__ = [
+    "SERVICE_NAME",
+    "get_tracer",
+    "parse_traceparent",
+    "set_exporter",
+    "set_span_attributes",
+    "shutdown_tracing",
+    "start_span",
+]
@@ -0,0 +1,46 @@
+"""Tests for the JSONL batch runner."""
+
+import asyncio
+import json
+
+from project_agents.batch import BatchSummary, run_batch
+
+
+def test_run_batch_writes_one_result_per_line(tmp_path) -> None:
+  source = tmp_path / "prompts.jsonl"
+  source.write_text(
+    "\n".join(
+      [
+        json.dumps({"id": "a", "prompt": "The problem is churn for dental clinics."}),
+        "not json",
+        json.dumps({"id": "b", "conversation": [{"role": "user", "content": "Our users are nurses."}]}),
+        "",
+      ]
+    ),
+    encoding="utf-8",
+  )
+  target = tmp_path / "briefs.jsonl"
+
+  summary = asyncio.run(run_batch(source, target, workers=2))
+
+  rows = {row["line"]: row for row in map(json.loads, target.read_text(encoding="utf-8").splitlines())}
+  assert set(rows) == {1, 2, 3}
+  assert rows[1]["ok"] and rows[1]["id"] == "a"
+  assert rows[1]["result"]["summary"]["problem"] == "The problem is churn for dental clinics"
+  assert rows[2]["ok"] is False and "invalid JSON" in rows[2]["error"]
+  assert rows[3]["result"]["thread_id"]
+  assert (summary.total, summary.succeeded, summary.failed) == (3, 2, 1)
+
+
+def test_batch_summary_percentiles() -> None:
+  summary = BatchSummary(
+    total=100,
+    succeeded=100,
+    failed=0,
+    elapsed_seconds=4.0,
+    latencies_ms=[float(value) for value in range(1, 101)],
+  )
+
+  assert summary.runs_per_second == 25.0
+  assert (summary.percentile(50), summary.percentile(95), summary.percentile(99)) == (50.0, 95.0, 99.0)
+  assert "p95 95 ms" in summary.format()
@@ -0,0 +1,310 @@
+"""Tests for the intake extraction paths."""
+
+import asyncio
+import json
+from collections import Counter
+
+import httpx
+
+from project_agents.config.settings import Settings
+from project_agents.intake.chunking import assemble_prompt, chunk_text, estimate_tokens
+from project_agents.intake.analyzer import (
+  _extract_with_keywords,
+  analyze_prompt,
+  analyze_prompts_batch,
+)
+from project_agents.intake.fused import arun_fused_intake, run_fused_intake
+from project_agents.intake.matcher import KeywordMatcher
+from project_agents.intake import pages as pages_module
+from project_agents.intake.pages import MissingPagesError, PagedText
+from project_agents.intake.retrieval import PassageIndex, index_terms, select_passages
+from project_agents.llm import LLMClient
+from project_agents.llm import client as llm_client_module
+
+
+def _install_llm(monkeypatch, handler) -> None:
+  settings = Settings(OPENAI_API_KEY="test-key", LLM_BACKOFF_BASE_SECONDS=0)
+  client = LLMClient(settings, transport=httpx.MockTransport(handler))
+  monkeypatch.setattr(llm_client_module, "_client", client)
+
+
+def _completion(content: str) -> httpx.Response:
+  return httpx.Response(
+    200,
+    json={
+      "id": "chatcmpl-test",
+      "object": "chat.completion",
+      "created": 0,
+      "model": "gpt-4o-mini",
+      "choices": [
+        {
+          "index": 0,
+          "finish_reason": "stop",
+          "message": {"role": "assistant", "content": content},
+        }
+      ],
+    },
+  )
+
+
+def test_fused_intake_uses_a_single_llm_call(monkeypatch) -> None:
+  requests: list[httpx.Request] = []
+
+  def handler(request: httpx.Request) -> httpx.Response:
+    requests.append(request)
+    return _completion(
+      json.dumps(
+        {
+          "project_title": "Atlas",
+          "problem": "Onboarding takes weeks",
+          "target_users": ["new hires"],
+          "assistant_message": "Thanks! What timeline are you working with?",
+        }
+      )
+    )
+
+  _install_llm(monkeypatch, handler)
+
+  summary, follow_ups, insights, reply = run_fused_intake("Atlas helps new hires onboard.")
+
+  assert len(requests) == 1
+  assert json.loads(requests[0].content)["response_format"] == {"type": "json_object"}
+  assert summary.project_title == "Atlas"
+  assert reply == "Thanks! What timeline are you working with?"
+  assert "problem" in insights.captured_fields
+  assert any("timeline" in question for question in follow_ups)
+
+
+def test_fused_intake_falls_back_to_heuristics(monkeypatch) -> None:
+  def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(400, json={"error": {"message": "bad request"}})
+
+  _install_llm(monkeypatch, handler)
+
+  summary, _, _, reply = asyncio.run(
+    arun_fused_intake("The problem is slow onboarding for our customers.")
+  )
+
+  assert summary.problem == "The problem is slow onboarding for our customers"
+  assert reply
+
+
+def test_malformed_llm_replies_fall_back_to_heuristics(monkeypatch) -> None:
+  no_choices = _completion("")
+  no_choices = httpx.Response(200, json={**json.loads(no_choices.content), "choices": []})
+  replies = iter([_completion(json.dumps(["not", "an", "object"])), no_choices])
+
+  _install_llm(monkeypatch, lambda request: next(replies))
+
+  prompt = "The problem is slow onboarding for our customers."
+  summary, _, _, _ = run_fused_intake(prompt)
+  assert summary.problem == "The problem is slow onboarding for our customers"
+
+  summary, _, _ = analyze_prompt(prompt)
+  assert summary.problem == "The problem is slow onboarding for our customers"
+
+
+def test_chunk_text_respects_the_token_limit() -> None:
+  text = "\n\n".join(f"Paragraph {index} " + "word " * 120 for index in range(10))
+
+  chunks = chunk_text(text, max_tokens=200)
+
+  assert len(chunks) > 1
+  assert all(estimate_tokens(chunk) <= 200 for chunk in chunks)
+  assert "".join(chunks).replace("\n", "").replace(" ", "") == text.replace("\n", "").replace(" ", "")
+
+
+def test_assemble_prompt_prefers_conversation_then_informative_chunks() -> None:
+  filler = "Lorem ipsum dolor sit amet. " * 60
+  informative = "The main problem is churn. Success is measured by retention. Our users are clinics."
+  documents = [("Appendix", f"{filler}\n\n{informative}\n\n{filler}")]
+
+  assembly = assemble_prompt(
+    ["We are building a scheduling tool."],
+    documents,
+    budget_tokens=60,
+    chunk_tokens=100,
+  )
+
+  assert assembly.text.startswith("We are building a scheduling tool.")
+  assert informative in assembly.text
+  assert "Lorem" not in assembly.text
+  assert assembly.tokens <= 60
+  assert {chunk.document for chunk in assembly.dropped} == {"Appendix"}
+
+
+def _search_index(passages: list[str]) -> tuple[str, dict]:
+  """Build an index the way the backend does at upload time."""
+
+  text = "\n\n".join(passages)
+  spans, lengths, postings, start = [], [], {}, 0
+  for position, passage in enumerate(passages):
+    spans.append([start, start + len(passage)])
+    start += len(passage) + 2
+    counts = Counter(index_terms(passage))
+    lengths.append(sum(counts.values()))
+    for term, frequency in counts.items():
+      postings.setdefault(term, []).append([position, frequency])
+  return text, {"version": 1, "passages": spans, "lengths": lengths, "postings": postings}
+
+
+def test_select_passages_keeps_field_evidence_only() -> None:
+  filler = [f"Appendix table {index} lists office furniture and floor plans." for index in range(40)]
+  evidence = [
+    "The core problem is patient churn after the first visit.",
+    "Our target users are small dental clinics.",
+    "Success is measured by the retention metric at 90 days.",
+  ]
+  text, payload = _search_index(filler[:20] + evidence + filler[20:])
+
+  selected = select_passages(text, payload, top_k=1)
+
+  assert selected is not None
+  assert all(passage in selected for passage in evidence)
+  assert len(selected) < len(text) / 3
+
+
+def test_bm25_prefers_rare_terms_and_ignores_unknown_indexes() -> None:
+  text, payload = _search_index(
+    ["timeline timeline timeline", "the timeline has a milestone", "nothing relevant here"]
+  )
+  index = PassageIndex(text, payload)
+
+  assert index.top_passages(["milestone", "timeline"], 2) == [1, 0]
+  assert index.top_passages(["absent"], 2) == []
+  assert select_passages(text, {**payload, "version": 0}, top_k=2) is None
+
+
+def test_keyword_matcher_finds_first_hits_in_one_scan() -> None:
+  matcher = KeywordMatcher(
+    {"problem": ["problem", "pain"], "target_users": ["user"]},
+    ["project called", "product"],
+  )
+  text = (
+    "We sell our product in Spain.\n"
+    "Our users are clinics. The main problem is churn. Another problem is cost.\n"
+    "The project called Atlas: scheduling"
+  )
+
+  matches = matcher.scan(text)
+
+  assert matches.sentences == {
+    "target_users": "Our users are clinics",
+    "problem": "The main problem is churn",
+  }
+  assert set(matches.markers) == {"product", "project called"}
+  assert text[matches.markers["project called"]:].startswith("project called")
+
+
+def test_keyword_extraction_prefers_marker_priority_over_position() -> None:
+  summary = _extract_with_keywords(
+    "Our product team is small.\nThe project called Atlas is a booking tool for dental clinics"
+  )
+
+  # The title keeps the legacy "skip the marker and five words" slicing.
+  assert summary.project_title == "for dental clinics"
+
+
+def test_analyze_prompts_batch_matches_single_prompt_analysis() -> None:
+  prompts = [
+    "The project called Atlas is a booking tool for dental clinics\nThe problem is churn",
+    "",
+    "Our users are nurses, doctors and admins. The timeline is Q3.",
+    "Our project name issue is unclear. Success means fewer no-shows.",
+  ]
+
+  results = analyze_prompts_batch(prompts, ["plan.pdf"], chunk_size=3)
+
+  assert results == [analyze_prompt(prompt, ["plan.pdf"]) for prompt in prompts]
+  assert results[2][0].target_users == ["Our users are nurses", "doctors", "admins"]
+  assert results[3][0].problem == "Our project name issue is unclear"
+
+
+def test_paged_text_slices_across_page_breaks() -> None:
+  pages = ["first page", "second page", "third page"]
+  calls = []
+
+  def loader(sha256: str, numbers: list[int]) -> dict[int, str]:
+    calls.append(numbers)
+    return {number: pages[number] for number in numbers}
+
+  text = "\n\n".join(pages)
+  spans, start = [], 0
+  for page in pages:
+    spans.append([start, start + len(page)])
+    start += len(page) + 2
+  paged = PagedText("abc", spans, loader=loader)
+
+  assert len(paged) == len(text)
+  assert paged[6:18] == text[6:18]
+  assert calls == [[0, 1]]
+  assert str(paged) == text
+  assert calls == [[0, 1], [2]]
+
+  truncated = PagedText("abc", spans, loader=lambda sha256, numbers: {0: pages[0]})
+  try:
+    str(truncated)
+  except MissingPagesError as exc:
+    assert exc.pages == [1, 2]
+  else:
+    raise AssertionError("missing pages must not be filled in")
+
+
+def test_select_passages_loads_only_pages_with_evidence() -> None:
+  filler = [f"Appendix table {index} lists office furniture and floor plans." for index in range(40)]
+  evidence = "The core problem is patient churn after the first visit."
+  text, payload = _search_index(filler[:30] + [evidence] + filler[30:])
+  # One stored page per passage, as a long PDF would have.
+  pages = [text[start:end] for start, end in payload["passages"]]
+  calls = []
+
+  def loader(sha256: str, numbers: list[int]) -> dict[int, str]:
+    calls.append(numbers)
+    return {number: pages[number] for number in numbers}
+
+  paged = PagedText("abc", payload["passages"], loader=loader)
+
+  selected = select_passages(paged, payload, top_k=1)
+
+  assert selected is not None and evidence in selected
+  assert len(calls) == 1
+  assert 30 in calls[0] and len(calls[0]) < len(pages) / 4
+
+
+class _ChunkCollection:
+  def __init__(self, records: list[dict]) -> None:
+    self.records = records
+
+  def find(self, query: dict, projection: dict) -> "_ChunkCursor":
+    matches = [record for record in self.records if record["sha256"] == query["sha256"]]
+    return _ChunkCursor(dict(record) for record in matches)
+
+
+class _ChunkCursor(list):
+  def sort(self, key: str, direction: int) -> list:
+    return sorted(self, key=lambda record: record[key], reverse=direction < 0)
+
+
+def test_load_search_index_merges_stored_chunks(monkeypatch) -> None:
+  text, payload = _search_index(["the timeline is tight", "users want a timeline", "no match"])
+  chunks = []
+  for number, (start, stop) in enumerate([(0, 2), (2, 3)]):
+    postings = {
+      term: [pair for pair in pairs if start <= pair[0] < stop]
+      for term, pairs in payload["postings"].items()
+    }
+    chunks.append(
+      {
+        "sha256": "abc",
+        "chunk": number,
+        "version": payload["version"],
+        "passages": payload["passages"][start:stop],
+        "lengths": payload["lengths"][start:stop],
+        "postings": {term: pairs for term, pairs in postings.items() if pairs},
+      }
+    )
+  database = {"document_index_chunks": _ChunkCollection(chunks[::-1])}
+  monkeypatch.setattr(pages_module, "_database", database)
+
+  assert pages_module.load_search_index("abc") == payload
+  assert pages_module.load_search_index("missing") is None
@@ -0,0 +1,251 @@
+"""Tests for the shared LLM client layer."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+from project_agents.config.settings import Settings
+from project_agents.llm import LLMClient, LLMError, LLMResponseCache, make_cache_key
+from project_agents.llm import cache as cache_module
+from project_agents.metrics import REGISTRY
+
+
+def _settings(**overrides) -> Settings:
+  values = {
+    "OPENAI_API_KEY": "test-key",
+    "LLM_BACKOFF_BASE_SECONDS": 0,
+    "LLM_MAX_RETRIES": 3,
+  }
+  values.update(overrides)
+  return Settings(**values)
+
+
+def _completion(content: str) -> dict:
+  return {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [
+      {
+        "index": 0,
+        "finish_reason": "stop",
+        "message": {"role": "assistant", "content": content},
+      }
+    ],
+  }
+
+
+class FlakyTransport(httpx.MockTransport):
+  """Answer with the given status codes first, then succeed."""
+
+  def __init__(self, failures: list[int]) -> None:
+    self.calls = 0
+    self._failures = list(failures)
+    super().__init__(self._handle)
+
+  def _handle(self, request: httpx.Request) -> httpx.Response:
+    self.calls += 1
+    if self._failures:
+      return httpx.Response(self._failures.pop(0), json={"error": {"message": "busy"}})
+    return httpx.Response(200, json=_completion("hello"))
+
+
+def test_complete_retries_rate_limits_and_server_errors() -> None:
+  transport = FlakyTransport([429, 503])
+  client = LLMClient(_settings(), transport=transport)
+
+  content = client.complete(
+    [{"role": "user", "content": "hi"}],
+    call_site="test",
+    model="gpt-4o-mini",
+    temperature=0,
+    max_tokens=5,
+  )
+
+  assert content == "hello"
+  assert transport.calls == 3
+
+
+def test_complete_records_latency_retries_and_tokens() -> None:
+  def _handle(request: httpx.Request) -> httpx.Response:
+    body = _completion("hello")
+    body["usage"] = {"prompt_tokens": 12, "completion_tokens": 3, "total_tokens": 15}
+    return httpx.Response(200, json=body)
+
+  calls = {"count": 0}
+
+  def _flaky(request: httpx.Request) -> httpx.Response:
+    calls["count"] += 1
+    if calls["count"] == 1:
+      return httpx.Response(503, json={"error": {"message": "busy"}})
+    return _handle(request)
+
+  client = LLMClient(_settings(), transport=httpx.MockTransport(_flaky))
+  def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, {"call_site": "metrics-test", **labels}) or 0.0
+
+  retries = sample("agents_llm_retries_total")
+  prompt_tokens = sample("agents_llm_tokens_total", direction="prompt")
+
+  client.complete(
+    [{"role": "user", "content": "hi"}],
+    call_site="metrics-test",
+    temperature=0,
+    max_tokens=5,
+  )
+
+  assert sample("agents_llm_retries_total") == retries + 1
+  assert sample("agents_llm_tokens_total", direction="prompt") == prompt_tokens + 12
+  assert sample("agents_llm_request_duration_seconds_count", outcome="ok") >= 1
+
+
+def test_acomplete_gives_up_after_retry_budget() -> None:
+  transport = FlakyTransport([500, 500, 500])
+  client = LLMClient(_settings(LLM_MAX_RETRIES=2), transport=transport)
+
+  with pytest.raises(LLMError):
+    asyncio.run(
+      client.acomplete(
+        [{"role": "user", "content": "hi"}],
+        call_site="test",
+        model="gpt-4o-mini",
+        temperature=0,
+        max_tokens=5,
+      )
+    )
+  assert transport.calls == 3
+
+
+def test_client_errors_are_not_retried() -> None:
+  transport = FlakyTransport([400])
+  client = LLMClient(_settings(), transport=transport)
+
+  with pytest.raises(LLMError):
+    client.complete(
+      [{"role": "user", "content": "hi"}],
+      call_site="test",
+      model="gpt-4o-mini",
+      temperature=0,
+      max_tokens=5,
+    )
+  assert transport.calls == 1
+
+
+class FakeCollection:
+  """Minimal stand-in for the Mongo cache collection."""
+
+  def __init__(self, down: bool = False) -> None:
+    self.records: dict[str, dict] = {}
+    self.indexes: list[str] = []
+    self.down = down
+
+  def create_index(self, keys, **kwargs) -> str:
+    if self.down:
+      raise ServerSelectionTimeoutError("no servers")
+    self.indexes.append(kwargs["name"])
+    return kwargs["name"]
+
+  def find_one(self, query: dict) -> dict | None:
+    if self.down:
+      raise ServerSelectionTimeoutError("no servers")
+    return self.records.get(query["_id"])
+
+  def replace_one(self, query: dict, record: dict, upsert: bool = False) -> None:
+    self.records[query["_id"]] = record
+
+
+def test_cached_completion_skips_the_round_trip() -> None:
+  transport = FlakyTransport([])
+  cache = LLMResponseCache(max_entries=8, ttl_seconds=60, collection=FakeCollection())
+  client = LLMClient(_settings(), transport=transport, cache=cache)
+  kwargs = {"call_site": "test", "model": "gpt-4o-mini", "temperature": 0.3, "max_tokens": 5}
+
+  first = client.complete([{"role": "user", "content": "Plan  the\nlaunch"}], **kwargs)
+  second = asyncio.run(client.acomplete([{"role": "user", "content": "Plan the launch"}], **kwargs))
+
+  assert first == second == "hello"
+  assert transport.calls == 1
+  assert cache.stats()["memory_hits"] == 1
+
+
+def test_mongo_tier_backs_the_memory_tier() -> None:
+  collection = FakeCollection()
+  key = make_cache_key("gpt-4o-mini", [{"role": "user", "content": "hi"}], 0.3, ["b.pdf", "a.pdf"])
+  LLMResponseCache(max_entries=8, ttl_seconds=60, collection=collection).set(key, "stored")
+
+  fresh = LLMResponseCache(max_entries=8, ttl_seconds=60, collection=collection)
+  same_key = make_cache_key("gpt-4o-mini", [{"role": "user", "content": "hi"}], 0.3, ["a.pdf", "b.pdf"])
+
+  assert fresh.get(same_key) == "stored"
+  assert fresh.get(same_key) == "stored"
+  assert fresh.get("missing") is None
+  assert fresh.stats() == {"memory_hits": 1, "mongo_hits": 1, "misses": 1, "stores": 1, "entries": 1}
+
+
+def test_cache_key_covers_output_parameters() -> None:
+  messages = [{"role": "user", "content": "hi"}]
+  base = make_cache_key("gpt-4o-mini", messages, 0.3, max_tokens=256)
+
+  assert base == make_cache_key("gpt-4o-mini", messages, 0.3, max_tokens=256)
+  assert base != make_cache_key("gpt-4o-mini", messages, 0.3, max_tokens=1000)
+  assert base != make_cache_key(
+    "gpt-4o-mini", messages, 0.3, max_tokens=256, response_format={"type": "json_object"}
+  )
+
+
+def test_mongo_tier_is_retried_after_an_outage(monkeypatch) -> None:
+  now = [1000.0]
+  monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+  collection = FakeCollection(down=True)
+  cache = LLMResponseCache(max_entries=8, ttl_seconds=60, collection=collection)
+
+  assert cache.ensure_index() is False
+  cache.set("key", "value")
+  assert collection.records == {}
+
+  collection.down = False
+  cache.set("other", "value")
+  assert collection.records == {}  # still backing off
+
+  now[0] += cache_module._MONGO_RETRY_SECONDS
+  cache.set("other", "value")
+  assert collection.indexes == ["llm_cache_ttl"]
+  assert "other" in collection.records
+
+
+def test_astream_delivers_tokens_in_order() -> None:
+  def _chunk(content: str) -> str:
+    body = {
+      "id": "chatcmpl-test",
+      "object": "chat.completion.chunk",
+      "created": 0,
+      "model": "gpt-4o-mini",
+      "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+    }
+    return f"data: {json.dumps(body)}\n\n"
+
+  def handler(request: httpx.Request) -> httpx.Response:
+    assert json.loads(request.content)["stream"] is True
+    stream = "".join(_chunk(token) for token in ["Hel", "lo", "!"]) + "data: [DONE]\n\n"
+    return httpx.Response(200, text=stream, headers={"content-type": "text/event-stream"})
+
+  client = LLMClient(_settings(), transport=httpx.MockTransport(handler))
+  tokens: list[str] = []
+
+  content = asyncio.run(
+    client.astream(
+      [{"role": "user", "content": "hi"}],
+      call_site="test",
+      model="gpt-4o-mini",
+      temperature=0,
+      max_tokens=5,
+      on_token=tokens.append,
+    )
+  )
+
+  assert tokens == ["Hel", "lo", "!"]
+  assert content == "Hello!"
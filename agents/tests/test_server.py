@@ -1,8 +1,13 @@
 """API tests for agents service."""
 
+import json
+
 from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 
+from project_agents.config.settings import get_settings
 from project_agents.server import app
+from project_agents.tracing import set_exporter
 
 client = TestClient(app)
 
@@ -28,3 +33,145 @@ def test_workflow_endpoint_returns_summary() -> None:
   assert "brief" in data
   assert "assistant_message" in data
   assert isinstance(data["assistant_message"], str)
+
+
+def test_live_after_startup_warm_up(monkeypatch) -> None:
+  monkeypatch.setattr(get_settings(), "graph_warmup_enabled", True)
+  with TestClient(app) as started_client:
+    response = started_client.get("/health/live")
+  assert response.status_code == 200
+  assert response.json() == {"status": "ok"}
+
+
+def test_continuation_restores_thread_from_checkpoint() -> None:
+  first = client.post(
+    "/workflow/run",
+    json={
+      "conversation": [{"role": "user", "content": "The problem is scattered design feedback."}],
+      "documents": [{"id": "doc-1", "name": "Discovery Doc", "text": "Notes"}],
+    },
+  ).json()
+
+  response = client.post(
+    "/workflow/run",
+    json={
+      "conversation": [{"role": "user", "content": "Our target users are product designers."}],
+      "thread_id": first["thread_id"],
+      "continuation": True,
+    },
+  )
+
+  assert response.status_code == 200
+  summary = response.json()["summary"]
+  assert summary["problem"] == "The problem is scattered design feedback"
+  assert summary["target_users"] == ["Our target users are product designers"]
+  assert summary["documents"] == ["Discovery Doc"]
+
+
+def test_continuation_requires_thread_id() -> None:
+  response = client.post(
+    "/workflow/run",
+    json={"conversation": [{"role": "user", "content": "More details."}], "continuation": True},
+  )
+  assert response.status_code == 422
+
+
+def test_workflow_stream_emits_progress_events() -> None:
+  payload = {
+    "conversation": [{"role": "user", "content": "The problem is slow design reviews."}],
+  }
+  with client.stream("POST", "/workflow/stream", json=payload) as response:
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    body = "".join(response.iter_text())
+
+  frames = [frame for frame in body.split("\n\n") if frame]
+  events = [frame.split("\n", 1)[0].removeprefix("event: ") for frame in frames]
+  assert events[0] == "started"
+  assert events[-1] == "result"
+  assert events.index("assistant_token") < events.index("intake_summary") < events.index("brief")
+
+  result = json.loads(frames[-1].split("\n", 1)[1].removeprefix("data: "))
+  assert result["summary"]["problem"] == "The problem is slow design reviews"
+  assert result["assistant_message"]
+
+
+def test_metrics_endpoint_exposes_node_and_fallback_series() -> None:
+  client.post(
+    "/workflow/run",
+    json={"conversation": [{"role": "user", "content": "The problem is slow onboarding."}]},
+  )
+
+  response = client.get("/metrics")
+
+  assert response.status_code == 200
+  assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+  body = response.text
+  assert "# TYPE agents_node_duration_seconds histogram" in body
+  assert 'agents_node_duration_seconds_count{node="intake_agent"}' in body
+  assert 'agents_node_duration_seconds_bucket{le="+Inf",node="brief_agent"}' in body
+  assert 'agents_heuristic_fallbacks_total{call_site="extraction",reason="disabled"}' in body
+  assert 'agents_checkpointer_duration_seconds_count{operation="put"}' in body
+  assert 'agents_requests_in_flight{endpoint="run"} 0.0' in body
+
+
+def test_workflow_run_continues_the_callers_trace() -> None:
+  exporter = InMemorySpanExporter()
+  set_exporter(exporter)
+  trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+  try:
+    response = client.post(
+      "/workflow/run",
+      json={"conversation": [{"role": "user", "content": "The problem is slow onboarding."}]},
+      headers={"traceparent": f"00-{trace_id}-{parent_id}-01"},
+    )
+  finally:
+    set_exporter(None)
+
+  assert response.status_code == 200
+  finished = exporter.get_finished_spans()
+  spans = {span.name: span for span in finished}
+  assert {f"{span.context.trace_id:032x}" for span in finished} == {trace_id}
+  server = spans["POST /workflow/run"]
+  assert f"{server.parent.span_id:016x}" == parent_id
+  assert spans["node intake_agent"].parent.span_id == server.context.span_id
+  assert "node brief_agent" in spans
+  assert "checkpointer put" in spans
+
+
+def test_unsampled_callers_get_no_spans() -> None:
+  exporter = InMemorySpanExporter()
+  set_exporter(exporter)
+  try:
+    response = client.post(
+      "/workflow/run",
+      json={"conversation": [{"role": "user", "content": "The problem is slow onboarding."}]},
+      headers={"traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00"},
+    )
+  finally:
+    set_exporter(None)
+
+  assert response.status_code == 200
+  assert exporter.get_finished_spans() == ()
+
+
+def test_profiling_requires_the_configured_token(monkeypatch, tmp_path) -> None:
+  settings = get_settings()
+  monkeypatch.setattr(settings, "profiling_token", "secret")
+  monkeypatch.setattr(settings, "profiling_interval_ms", 1.0)
+  monkeypatch.setattr(settings, "profiling_dir", tmp_path)
+  payload = {"conversation": [{"role": "user", "content": "The problem is slow onboarding."}]}
+
+  denied = client.post("/workflow/run", json=payload, headers={"X-Profile": "wrong"})
+  profiled = client.post("/workflow/run?profile=secret", json=payload)
+
+  assert denied.status_code == 403
+  assert profiled.status_code == 200
+  assert "summary" in profiled.json()
+  profile_id = profiled.headers["X-Profile-Id"]
+  assert str(tmp_path) not in profile_id
+  (profile,) = tmp_path.glob(f"*-{profile_id}.folded")
+  lines = profile.read_text(encoding="utf-8").splitlines()
+  assert int(profiled.headers["X-Profile-Samples"]) > 0
+  assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+  assert any(line.startswith("event-loop;") for line in lines)
@@ -0,0 +1,83 @@
+"""Tests for the OpenAI-compatible LLM stand-in."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from project_agents.config.settings import Settings
+from project_agents.intake.analyzer import _extraction_messages
+from project_agents.llm import LLMClient, LLMError
+from project_agents.llm.standin import StandInConfig, create_standin_app
+
+
+def _client(config: StandInConfig, **settings) -> LLMClient:
+  """An LLM client whose HTTP traffic goes straight into the stand-in app."""
+
+  values = {
+    "OPENAI_API_KEY": "local",
+    "LLM_BASE_URL": "http://standin/v1",
+    "LLM_MODEL": "stand-in",
+    "LLM_BACKOFF_BASE_SECONDS": 0,
+  }
+  values.update(settings)
+  transport = httpx.ASGITransport(app=create_standin_app(config))
+  return LLMClient(Settings(**values), transport=transport)
+
+
+def test_json_mode_returns_a_parseable_summary() -> None:
+  client = _client(StandInConfig(latency_ms=0))
+  messages = _extraction_messages("The problem is churn. Our users are clinics.", [])
+
+  content = asyncio.run(
+    client.acomplete(
+      messages,
+      call_site="test",
+      response_format={"type": "json_object"},
+      temperature=0,
+      max_tokens=500,
+    )
+  )
+
+  data = json.loads(content)
+  assert data["problem"] == "The problem is churn"
+  assert data["target_users"] == ["Our users are clinics"]
+  assert data["assistant_message"]
+
+
+def test_streaming_delivers_tokens_incrementally() -> None:
+  client = _client(StandInConfig(latency_ms=0, tokens_per_second=10_000))
+  tokens: list[str] = []
+
+  content = asyncio.run(
+    client.astream(
+      [{"role": "user", "content": "Hello"}],
+      call_site="test",
+      temperature=0,
+      max_tokens=5,
+      on_token=tokens.append,
+    )
+  )
+
+  assert len(tokens) == 5
+  assert content == "".join(tokens)
+
+
+def test_error_rate_exhausts_client_retries() -> None:
+  client = _client(StandInConfig(latency_ms=0, error_rate=1.0), LLM_MAX_RETRIES=1)
+
+  with pytest.raises(LLMError):
+    asyncio.run(
+      client.acomplete([{"role": "user", "content": "Hi"}], call_site="test", temperature=0, max_tokens=5)
+    )
+
+
+def test_rate_limits_carry_retry_after() -> None:
+  app = create_standin_app(StandInConfig(rate_limit_rate=1.0, retry_after_seconds=2))
+
+  response = TestClient(app).post("/v1/chat/completions", json={"messages": []})
+
+  assert response.status_code == 429
+  assert response.headers["retry-after"] == "2"
@@ -1,6 +1,12 @@
 """Tests for the LangGraph project brief workflow."""
 
-from project_agents.service import run_project_brief_workflow
+import asyncio
+import threading
+
+from project_agents.graphs import nodes
+from project_agents.graphs.registry import get_project_brief_graph
+from project_agents.intake import analyzer, pages
+from project_agents.service import arun_project_brief_workflow, run_project_brief_workflow
 
 
 def test_workflow_returns_summary_and_brief() -> None:
@@ -30,3 +36,167 @@ def test_workflow_returns_summary_and_brief() -> None:
   assert isinstance(brief["expected_outcomes"], list)
   assert "thread_id" in result
   assert "assistant_message" in result
+
+
+def test_async_workflow_handles_concurrent_threads() -> None:
+  """Async runs should share one event loop and keep their threads separate."""
+
+  async def _run_all() -> list[dict]:
+    runs = [
+      arun_project_brief_workflow(
+        [{"role": "user", "content": f"Project called Atlas {index}. The problem is onboarding."}],
+        thread_id=f"async-thread-{index}",
+      )
+      for index in range(8)
+    ]
+    return await asyncio.gather(*runs)
+
+  results = asyncio.run(_run_all())
+
+  assert [result["thread_id"] for result in results] == [f"async-thread-{index}" for index in range(8)]
+  for result in results:
+    assert result["summary"]["problem"]
+    assert result["brief"]["project_title"]
+    assert result["assistant_message"]
+
+
+def test_compiled_graph_is_reused() -> None:
+  """The registry should hand out one compiled graph per checkpointer."""
+
+  assert get_project_brief_graph() is get_project_brief_graph()
+
+
+def test_follow_up_turns_only_analyze_new_content(monkeypatch) -> None:
+  """A continued thread should extract from new turns and merge into the checkpoint."""
+
+  prompts: list[str] = []
+  original = analyzer._extract_with_keywords
+
+  def recording(prompt, documents=None):
+    prompts.append(prompt)
+    return original(prompt, documents)
+
+  monkeypatch.setattr(analyzer, "_extract_with_keywords", recording)
+  first_turn = {"role": "user", "content": "The problem is slow onboarding for new hires."}
+
+  run_project_brief_workflow([first_turn], thread_id="incremental-thread")
+  result = run_project_brief_workflow(
+    [
+      first_turn,
+      {"role": "assistant", "content": "Thanks! Who is this for?"},
+      {"role": "user", "content": "Our target users are HR managers."},
+    ],
+    thread_id="incremental-thread",
+  )
+
+  assert prompts == [
+    "The problem is slow onboarding for new hires.",
+    "Our target users are HR managers.",
+  ]
+  summary = result["summary"]
+  assert summary["problem"] == "The problem is slow onboarding for new hires"
+  assert summary["target_users"] == ["Our target users are HR managers"]
+  assert summary["project_title"] == "The problem is slow onboarding for new hires"
+
+
+def test_explicit_titles_replace_the_first_sentence_guess() -> None:
+  """A named title in a later turn wins over the guessed one, but a guess never does."""
+
+  turns = [{"role": "user", "content": "The problem is slow onboarding for new hires."}]
+  run_project_brief_workflow(turns, thread_id="title-thread")
+
+  named = "Our project called Atlas is an onboarding tool for new hires."
+  title = analyzer._extract_with_keywords(named).project_title
+  turns.append({"role": "user", "content": named})
+  result = run_project_brief_workflow(turns, thread_id="title-thread")
+  assert result["summary"]["project_title"] == title
+
+  turns.append({"role": "user", "content": "Success means new hires ship code in week one."})
+  result = run_project_brief_workflow(turns, thread_id="title-thread")
+  assert result["summary"]["project_title"] == title
+
+
+def test_documents_without_text_are_analyzed_once_they_have_it(monkeypatch) -> None:
+  """A document that is still parsing must not be marked as processed."""
+
+  prompts: list[str] = []
+  original = analyzer._extract_with_keywords
+
+  def recording(prompt, documents=None):
+    prompts.append(prompt)
+    return original(prompt, documents)
+
+  monkeypatch.setattr(analyzer, "_extract_with_keywords", recording)
+  turns = [{"role": "user", "content": "The problem is slow onboarding for new hires."}]
+  document = {"id": "doc-1", "name": "Plan"}
+
+  run_project_brief_workflow(turns, documents=[document], thread_id="parsing-thread")
+  assert "HR managers" not in prompts[-1]
+
+  document["text"] = "Our target users are HR managers."
+  result = run_project_brief_workflow(turns, documents=[document], thread_id="parsing-thread")
+  assert "HR managers" in prompts[-1]
+  assert result["summary"]["target_users"] == ["Our target users are HR managers"]
+
+
+def test_documents_with_missing_pages_are_retried(monkeypatch) -> None:
+  """Pages that cannot be loaded keep the document out of the processed set."""
+
+  stored = {0: "Our target users are HR managers."}
+  available: dict[int, str] = {}
+  loads: list[list[int]] = []
+
+  def load_pages(sha256, numbers):
+    loads.append(numbers)
+    return {number: available[number] for number in numbers if number in available}
+
+  monkeypatch.setattr(pages, "load_pages", load_pages)
+  monkeypatch.setattr(pages, "load_search_index", lambda sha256: None)
+  turns = [{"role": "user", "content": "The problem is slow onboarding for new hires."}]
+  document = {"id": "doc-1", "name": "Plan", "sha256": "abc", "pages": [[0, len(stored[0])]]}
+
+  result = asyncio.run(
+    arun_project_brief_workflow(turns, documents=[document], thread_id="missing-pages-thread")
+  )
+  assert loads == [[0]]
+  assert result["summary"]["target_users"] == []
+
+  available.update(stored)
+  result = asyncio.run(
+    arun_project_brief_workflow(turns, documents=[document], thread_id="missing-pages-thread")
+  )
+  assert loads == [[0], [0]]
+  assert result["summary"]["target_users"] == ["Our target users are HR managers"]
+
+
+def test_async_intake_selects_inline_evidence_off_the_event_loop(monkeypatch) -> None:
+  threads: list[str] = []
+  select_passages = nodes.select_passages
+
+  def recording_select(text, search_index, top_k):
+    threads.append(threading.current_thread().name)
+    return select_passages(text, search_index, top_k)
+
+  monkeypatch.setattr(nodes, "select_passages", recording_select)
+  turns = [{"role": "user", "content": "The problem is slow onboarding for new hires."}]
+  document = {"id": "doc-1", "name": "Plan", "text": "Our target users are HR managers."}
+
+  asyncio.run(arun_project_brief_workflow(turns, documents=[document], thread_id="inline-doc"))
+
+  assert threads and threading.main_thread().name not in threads
+
+
+def test_async_intake_assembles_the_prompt_off_the_event_loop(monkeypatch) -> None:
+  threads: list[str] = []
+  assemble_prompt = nodes.assemble_prompt
+
+  def recording_assemble(*args, **kwargs):
+    threads.append(threading.current_thread().name)
+    return assemble_prompt(*args, **kwargs)
+
+  monkeypatch.setattr(nodes, "assemble_prompt", recording_assemble)
+  turns = [{"role": "user", "content": "The problem is slow onboarding. " * 200}]
+
+  asyncio.run(arun_project_brief_workflow(turns, thread_id="large-paste"))
+
+  assert threads and threading.main_thread().name not in threads
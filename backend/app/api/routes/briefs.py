@@ -1,14 +1,31 @@
 """Routes for coordinating project brief generation."""
 
+import logging
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, AsyncIterator
 
 from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
+from project_brief_common.sse import format_sse
 from pydantic import BaseModel, Field, model_validator
 
+from app.core.config import get_settings
+from app.core.tracing import start_span
 from app.dependencies.mongo import get_database
-from app.models import AgentRunModel, BriefModel, ConversationTurn, DocumentReference, SummaryModel
+from app.models import (
+    AgentRunModel,
+    BriefModel,
+    ConversationTurn,
+    DocumentReference,
+    DocumentStatus,
+    SummaryModel,
+)
 from app.services.agents_client import AgentsClient, get_agents_client
+from app.services.documents import PARSING_STATUSES, fetch_documents, wait_for_documents
+
+logger = logging.getLogger(__name__)
+
+_STORED_DOCUMENT_FIELDS = ("id", "name", "sha256")
 
 router = APIRouter()
 
@@ -24,16 +41,33 @@ class BriefRequest(BaseModel):
     thread_id: str | None = Field(
         default=None, description="Optional thread identifier for LangGraph checkpoints."
     )
+    continuation: bool = Field(
+        default=False,
+        description=(
+            "Send only the new turns and document IDs for an existing thread; "
+            "the agents service restores earlier context from its checkpoint."
+        ),
+    )
 
     @model_validator(mode="after")
     def ensure_conversation(self) -> "BriefRequest":
         if not self.conversation and not self.prompt:
             raise ValueError("Either prompt or conversation must be provided.")
+        if self.continuation and not self.thread_id:
+            raise ValueError("thread_id is required when continuation is true.")
         if self.prompt and not self.conversation:
             self.conversation = [ConversationTurn(role="user", content=self.prompt)]
         return self
 
 
+class SkippedDocument(BaseModel):
+    """A referenced upload left out of the run because it was still being parsed."""
+
+    id: str
+    name: str
+    status: DocumentStatus
+
+
 class BriefResponse(BaseModel):
     """Structured brief response returned to clients."""
 
@@ -43,6 +77,10 @@ class BriefResponse(BaseModel):
     thread_id: str
     run_id: str
     assistant_message: str
+    skipped_documents: list[SkippedDocument] = Field(
+        default_factory=list,
+        description="Uploads not ready within PARSE_WAIT_SECONDS; send them again once ready.",
+    )
 
 
 @router.post(
@@ -58,30 +96,132 @@ async def run_brief_generation(
     """Trigger the agents workflow, persist the result, and return the structured brief."""
 
     conversation_payload = [turn.model_dump() for turn in payload.conversation or []]
-    document_payload = []
-    for doc in payload.documents:
-        doc_data = doc.model_dump()
-        text = doc_data.get("text")
-        doc_id = doc_data.get("id")
-        if doc_id:
-            stored = await database["documents"].find_one({"id": doc_id})
-            if stored:
-                text = stored.get("text")
-                doc_data.setdefault("name", stored.get("name"))
-        if text:
-            doc_data["text"] = text
-        document_payload.append(doc_data)
+    document_payload, skipped = await _hydrate_documents(payload.documents, database)
 
     workflow_output = await agents_client.run_workflow(
         conversation=conversation_payload,
         documents=document_payload,
         thread_id=payload.thread_id,
+        continuation=payload.continuation,
     )
 
     agent_model = AgentRunModel.model_validate(workflow_output)
+    run_id = await _persist_run(database, conversation_payload, document_payload, agent_model)
+
+    return BriefResponse(
+        summary=agent_model.summary,
+        brief=agent_model.brief,
+        follow_up_questions=agent_model.follow_up_questions,
+        thread_id=agent_model.thread_id,
+        assistant_message=agent_model.assistant_message,
+        run_id=run_id,
+        skipped_documents=skipped,
+    )
+
+
+@router.post("/briefs/stream", status_code=status.HTTP_200_OK)
+async def stream_brief_generation(
+    payload: BriefRequest,
+    agents_client: AgentsClient = Depends(get_agents_client),
+    database=Depends(get_database),
+) -> StreamingResponse:
+    """Proxy the agents workflow stream as Server-Sent Events.
+
+    Progress events are forwarded as they arrive. The final ``result`` event
+    is persisted like `/briefs/run` and re-emitted with its ``run_id`` and
+    ``skipped_documents``.
+    """
+
+    conversation_payload = [turn.model_dump() for turn in payload.conversation or []]
+    document_payload, skipped = await _hydrate_documents(payload.documents, database)
+
+    async def _events() -> AsyncIterator[str]:
+        try:
+            async for event, data in agents_client.stream_workflow(
+                conversation=conversation_payload,
+                documents=document_payload,
+                thread_id=payload.thread_id,
+                continuation=payload.continuation,
+            ):
+                if event == "result":
+                    agent_model = AgentRunModel.model_validate(data)
+                    run_id = await _persist_run(
+                        database, conversation_payload, document_payload, agent_model
+                    )
+                    data = {
+                        **agent_model.model_dump(),
+                        "run_id": run_id,
+                        "skipped_documents": [doc.model_dump() for doc in skipped],
+                    }
+                yield format_sse(event, data)
+        except Exception as exc:  # noqa: BLE001 - surfaced to the client
+            yield format_sse("error", {"detail": str(exc)})
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _hydrate_documents(
+    documents: list[DocumentReference], database
+) -> tuple[list[dict[str, Any]], list[SkippedDocument]]:
+    """Attach stored text (page offsets for paged content) and the content hash.
+
+    The agents look up the search index (and pages) by ``sha256``.
+
+    Uploads still being parsed get up to ``PARSE_WAIT_SECONDS`` to finish and
+    are left out of the run if they have not; they are returned separately so
+    the client can be told.
+    """
+
+    document_ids = [doc.id for doc in documents if doc.id]
+    with start_span("mongo hydrate documents", kind="client", documents=len(documents)):
+        stored_documents = await fetch_documents(database, document_ids) if document_ids else {}
+        stored_documents = await wait_for_documents(
+            database, stored_documents, get_settings().parse_wait_seconds
+        )
+
+    document_payload = []
+    skipped = []
+    for doc in documents:
+        doc_data = doc.model_dump()
+        text = doc_data.get("text")
+        stored = stored_documents.get(doc_data.get("id"))
+        if stored and stored["status"] in PARSING_STATUSES:
+            logger.info("Skipping document %s: still %s", doc.id, stored["status"])
+            skipped.append(SkippedDocument(id=doc.id, name=doc.name, status=stored["status"]))
+            continue
+        if stored:
+            text = stored["text"]
+            doc_data.setdefault("name", stored["name"])
+            if stored.get("sha256"):
+                doc_data["sha256"] = stored["sha256"]
+            if stored.get("pages"):
+                # Paged content: the agents load the pages they need themselves.
+                doc_data["pages"] = stored["pages"]
+        if text:
+            doc_data["text"] = text
+        document_payload.append(doc_data)
+    return document_payload, skipped
+
+
+async def _persist_run(
+    database,
+    conversation_payload: list[dict[str, Any]],
+    document_payload: list[dict[str, Any]],
+    agent_model: AgentRunModel,
+) -> str:
+    """Store a completed run in ``brief_runs`` and return its id."""
+
     document = {
         "conversation": conversation_payload,
-        "documents": document_payload,
+        # References only: text and page offsets live with the content.
+        "documents": [
+            {key: doc[key] for key in _STORED_DOCUMENT_FIELDS if doc.get(key) is not None}
+            for doc in document_payload
+        ],
         "summary": agent_model.summary.model_dump(),
         "brief": agent_model.brief.model_dump(),
         "follow_up_questions": agent_model.follow_up_questions,
@@ -90,14 +230,6 @@ async def run_brief_generation(
         "created_at": datetime.now(timezone.utc),
     }
 
-    result = await database["brief_runs"].insert_one(document)
-
-    return BriefResponse(
-        summary=agent_model.summary,
-        brief=agent_model.brief,
-        follow_up_questions=agent_model.follow_up_questions,
-        thread_id=agent_model.thread_id,
-        assistant_message=agent_model.assistant_message,
-        run_id=str(result.inserted_id),
-    )
-
+    with start_span("mongo insert brief_runs", kind="client"):
+        result = await database["brief_runs"].insert_one(document)
+    return str(result.inserted_id)
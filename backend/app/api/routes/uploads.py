@@ -1,10 +1,12 @@
 """File upload endpoints."""
 
-from fastapi import APIRouter, Depends, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, status
 
+from app.core.limits import too_large
 from app.dependencies.mongo import get_database
-from app.models import DocumentCreateResponse, DocumentModel
-from app.services.documents import save_and_parse_upload
+from app.models import DocumentCreateResponse
+from app.services.documents import UploadTooLargeError, get_upload, store_upload
+from app.services.parsing import ParseQueueFullError, get_parse_queue
 
 router = APIRouter()
 
@@ -12,9 +14,40 @@ router = APIRouter()
 @router.post("/uploads", response_model=DocumentCreateResponse)
 async def upload_document(
     file: UploadFile,
+    background_tasks: BackgroundTasks,
     database=Depends(get_database),
 ) -> DocumentCreateResponse:
-    document = await save_and_parse_upload(file)
-    record = document.model_dump()
-    await database["documents"].insert_one(record)
+    """Store the file and queue its text extraction unless the same bytes were parsed before."""
+
+    parse_queue = get_parse_queue()
+    try:
+        parse_queue.reserve()
+    except ParseQueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "5"},
+        ) from exc
+    try:
+        try:
+            document, parse_path = await store_upload(database, file)
+        except UploadTooLargeError as exc:
+            raise too_large(exc.limit) from exc
+    except BaseException:
+        parse_queue.release()
+        raise
+    if parse_path is None:
+        parse_queue.release()
+    else:
+        background_tasks.add_task(parse_queue.run, database, document.sha256, parse_path)
+    return DocumentCreateResponse(document=document)
+
+
+@router.get("/uploads/{document_id}", response_model=DocumentCreateResponse)
+async def get_upload_status(document_id: str, database=Depends(get_database)) -> DocumentCreateResponse:
+    """Report an upload's parsing status."""
+
+    document = await get_upload(database, document_id)
+    if document is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found.")
     return DocumentCreateResponse(document=document)
@@ -2,6 +2,7 @@
 
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -24,10 +25,39 @@ class Settings(BaseSettings):
         default="mongodb://localhost:27017/project_brief", alias="MONGODB_URI"
     )
     mongo_database: str = Field(default="project_brief", alias="MONGODB_DATABASE")
+    mongo_index_bootstrap: bool = Field(default=True, alias="MONGODB_INDEX_BOOTSTRAP")
+    brief_runs_ttl_days: int = Field(
+        default=0,
+        alias="BRIEF_RUNS_TTL_DAYS",
+        description="Expire brief runs after this many days; 0 keeps them forever.",
+    )
 
     uploads_dir: Path = Field(
         default=Path("/var/project-brief/uploads"), alias="UPLOADS_DIR"
     )
+    max_upload_bytes: int = Field(
+        default=100 * 1024 * 1024, alias="MAX_UPLOAD_BYTES"
+    )
+    parse_workers: int = Field(default=2, alias="PARSE_WORKERS")
+    parse_queue_max: int = Field(
+        default=32,
+        alias="PARSE_QUEUE_MAX",
+        description="Uploads waiting to be parsed before new ones get a 503.",
+    )
+    parse_wait_seconds: float = Field(
+        default=5.0,
+        alias="PARSE_WAIT_SECONDS",
+        description="How long a brief run waits for documents still being parsed.",
+    )
+    search_passage_chars: int = Field(
+        default=800, alias="SEARCH_PASSAGE_CHARS"
+    )
+    document_cache_max_entries: int = Field(
+        default=256, alias="DOCUMENT_CACHE_MAX_ENTRIES"
+    )
+    document_cache_max_chars: int = Field(
+        default=64_000_000, alias="DOCUMENT_CACHE_MAX_CHARS"
+    )
     allowed_origins: list[str] = Field(
         default_factory=lambda: ["*"], alias="BACKEND_CORS_ALLOWED_ORIGINS"
     )
@@ -38,6 +68,48 @@ class Settings(BaseSettings):
     agents_timeout_seconds: int = Field(
         default=60, alias="AGENTS_TIMEOUT_SECONDS"
     )
+    agents_connect_timeout_seconds: float = Field(
+        default=5.0, alias="AGENTS_CONNECT_TIMEOUT_SECONDS"
+    )
+    agents_max_connections: int = Field(default=100, alias="AGENTS_MAX_CONNECTIONS")
+    agents_max_keepalive_connections: int = Field(
+        default=20, alias="AGENTS_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    agents_keepalive_expiry_seconds: float = Field(
+        default=30.0, alias="AGENTS_KEEPALIVE_EXPIRY_SECONDS"
+    )
+    agents_http2: bool = Field(
+        default=False,
+        alias="AGENTS_HTTP2",
+        description="Requires the h2 package (httpx[http2]).",
+    )
+    agents_max_retries: int = Field(default=2, alias="AGENTS_MAX_RETRIES")
+    agents_backoff_base_seconds: float = Field(
+        default=0.2, alias="AGENTS_BACKOFF_BASE_SECONDS"
+    )
+    agents_breaker_failure_threshold: int = Field(
+        default=5, alias="AGENTS_BREAKER_FAILURE_THRESHOLD"
+    )
+    agents_breaker_reset_seconds: float = Field(
+        default=30.0, alias="AGENTS_BREAKER_RESET_SECONDS"
+    )
+
+    trace_exporter: Literal["none", "file", "otlp"] = Field(
+        default="none", alias="TRACE_EXPORTER"
+    )
+    trace_file: Path = Field(default=Path("traces.jsonl"), alias="TRACE_FILE")
+    trace_otlp_endpoint: str = Field(
+        default="http://localhost:4318/v1/traces", alias="TRACE_OTLP_ENDPOINT"
+    )
+
+    profiling_token: str = Field(
+        default="",
+        alias="PROFILING_TOKEN",
+        description="Secret enabling per-request profiling; empty disables it.",
+    )
+    profiling_interval_ms: float = Field(default=5.0, alias="PROFILING_INTERVAL_MS")
+    profiling_dir: Path = Field(default=Path("profiles"), alias="PROFILING_DIR")
+    profiling_max_files: int = Field(default=100, alias="PROFILING_MAX_FILES")
 
 
 @lru_cache
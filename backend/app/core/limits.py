@@ -0,0 +1,63 @@
+"""Request body size limits.
+
+Starlette spools a multipart upload to a temporary file before the route
+runs, so a size check in the route alone would only fire after the whole
+body had been received. `BodySizeLimitMiddleware` rejects oversized uploads
+up front from ``Content-Length`` and, for chunked requests without one,
+stops reading as soon as the running byte count passes the limit.
+"""
+
+from __future__ import annotations
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+# Room for multipart boundaries and part headers on top of the file itself.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Upload exceeds the {limit}-byte limit.",
+    )
+
+
+class BodySizeLimitMiddleware:
+    """Cap request bodies on ``paths`` at ``MAX_UPLOAD_BYTES`` plus multipart overhead."""
+
+    def __init__(self, app: ASGIApp, paths: frozenset[str]) -> None:
+        self.app = app
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        limit = get_settings().max_upload_bytes
+        allowed = limit + MULTIPART_OVERHEAD_BYTES
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > allowed:
+            exc = too_large(limit)
+            response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > allowed:
+                    raise too_large(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
@@ -0,0 +1,37 @@
+"""OpenTelemetry tracing for the backend.
+
+Every request opens a server span (continuing an incoming ``traceparent``
+if the caller sent one), Mongo lookups and writes open child spans, and
+`AgentsClient` forwards the context to the agents service in a
+``traceparent`` header. The setup is shared with the agents service (see
+`project_brief_common.tracing`).
+"""
+
+from project_brief_common.tracing import (
+    ServiceTracing,
+    current_traceparent,
+    parse_traceparent,
+    set_span_attributes,
+)
+
+from app.core.config import get_settings
+
+SERVICE_NAME = "project-brief-backend"
+
+_tracing = ServiceTracing(SERVICE_NAME, get_settings)
+
+get_tracer = _tracing.get_tracer
+set_exporter = _tracing.set_exporter
+shutdown_tracing = _tracing.shutdown
+start_span = _tracing.start_span
+
+__all__ = [
+    "SERVICE_NAME",
+    "current_traceparent",
+    "get_tracer",
+    "parse_traceparent",
+    "set_exporter",
+    "set_span_attributes",
+    "shutdown_tracing",
+    "start_span",
+]
@@ -1,14 +1,26 @@
 """MongoDB connection helpers."""
 
+import asyncio
+import logging
 from collections.abc import AsyncIterator
 from typing import Optional
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure, PyMongoError
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
 
 _client: Optional[AsyncIOMotorClient] = None
 
+# Mongo error codes for "an index with this name/key exists with other options".
+_INDEX_CONFLICT_CODES = frozenset({85, 86})
+_INDEX_NOT_FOUND_CODE = 27
+# Startup should not wait out the driver's 30s server selection when Mongo is down.
+_BOOTSTRAP_TIMEOUT_SECONDS = 10.0
+
 
 def get_mongo_client() -> AsyncIOMotorClient:
     """Return a singleton Motor client."""
@@ -37,3 +49,95 @@ async def close_client() -> None:
         _client = None
 
 
+async def ensure_indexes(database: AsyncIOMotorDatabase, settings: Settings) -> None:
+    """Create the indexes the backend's queries rely on (idempotent).
+
+    * ``documents.id`` (unique) and ``document_contents.sha256`` (unique)
+      back the ``$in`` hydration lookups in `fetch_documents`; the
+      ``sha256`` index also keeps concurrent uploads of the same bytes
+      from creating two content records.
+    * ``document_pages(sha256, page)`` (unique) serves page-range loads and
+      ``document_index_chunks(sha256, chunk)`` (unique) search index loads.
+    * ``brief_runs(thread_id, created_at)`` serves per-thread history.
+    * With ``BRIEF_RUNS_TTL_DAYS`` set, a TTL index on ``brief_runs.created_at``
+      expires old runs server-side; changing the value updates the index in
+      place and setting it back to 0 drops the index.
+    """
+
+    await database["documents"].create_indexes(
+        [IndexModel([("id", ASCENDING)], name="documents_id", unique=True)]
+    )
+    await database["document_contents"].create_indexes(
+        [IndexModel([("sha256", ASCENDING)], name="document_contents_sha256", unique=True)]
+    )
+    await database["document_pages"].create_indexes(
+        [
+            IndexModel(
+                [("sha256", ASCENDING), ("page", ASCENDING)],
+                name="document_pages_sha256_page",
+                unique=True,
+            )
+        ]
+    )
+    await database["document_index_chunks"].create_indexes(
+        [
+            IndexModel(
+                [("sha256", ASCENDING), ("chunk", ASCENDING)],
+                name="document_index_chunks_sha256_chunk",
+                unique=True,
+            )
+        ]
+    )
+    await database["brief_runs"].create_indexes(
+        [
+            IndexModel(
+                [("thread_id", ASCENDING), ("created_at", ASCENDING)],
+                name="brief_runs_thread_created",
+            )
+        ]
+    )
+    if settings.brief_runs_ttl_days > 0:
+        await _ensure_ttl_index(
+            database, "brief_runs", "created_at", settings.brief_runs_ttl_days * 86400
+        )
+    else:
+        await _drop_ttl_index(database, "brief_runs")
+
+
+async def _ensure_ttl_index(
+    database: AsyncIOMotorDatabase, collection: str, field: str, seconds: int
+) -> None:
+    try:
+        await database[collection].create_index(
+            field, expireAfterSeconds=seconds, name=f"{collection}_ttl"
+        )
+    except OperationFailure as exc:
+        if exc.code not in _INDEX_CONFLICT_CODES:
+            raise
+        # Same index, different expiry: collMod changes it without a rebuild.
+        await database.command(
+            "collMod",
+            collection,
+            index={"keyPattern": {field: 1}, "expireAfterSeconds": seconds},
+        )
+
+
+async def _drop_ttl_index(database: AsyncIOMotorDatabase, collection: str) -> None:
+    try:
+        await database[collection].drop_index(f"{collection}_ttl")
+    except OperationFailure as exc:
+        if exc.code != _INDEX_NOT_FOUND_CODE:
+            raise
+
+
+async def bootstrap_indexes() -> None:
+    """Run `ensure_indexes` at startup without letting Mongo trouble block it."""
+
+    settings = get_settings()
+    if not settings.mongo_index_bootstrap:
+        return
+    database = get_mongo_client()[settings.mongo_database]
+    try:
+        await asyncio.wait_for(ensure_indexes(database, settings), _BOOTSTRAP_TIMEOUT_SECONDS)
+    except (PyMongoError, asyncio.TimeoutError) as exc:
+        logger.warning("Index bootstrap failed; queries may scan collections: %s", exc)
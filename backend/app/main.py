@@ -1,21 +1,57 @@
 """FastAPI application entrypoint."""
 
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+import httpx
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from project_brief_common.profiling import (
+    PROFILE_HEADER,
+    PROFILE_ID_HEADER,
+    PROFILE_QUERY,
+    PROFILE_SAMPLES_HEADER,
+    SamplingProfiler,
+    is_authorized,
+)
 
 from app.api.router import api_router
 from app.core.config import get_settings
-from app.dependencies.mongo import close_client
+from app.core.limits import BodySizeLimitMiddleware
+from app.core.tracing import parse_traceparent, set_span_attributes, shutdown_tracing, start_span
+from app.dependencies.mongo import bootstrap_indexes, close_client, get_mongo_client
+from app.services.agents_client import (
+    AgentsUnavailableError,
+    close_agents_client,
+    get_shared_agents_client,
+)
+from app.services.parsing import shutdown_parse_queue, watch_stale_parses
+
+logger = logging.getLogger(__name__)
+
+_PROFILED_PATHS = frozenset({"/api/briefs/run", "/api/uploads"})
+_UPLOAD_PATHS = frozenset({"/api/uploads"})
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # pragma: no cover - simple resource teardown
     """Manage startup/shutdown events."""
 
+    await bootstrap_indexes()
+    # One pooled client to the agents service for the app's lifetime.
+    get_shared_agents_client()
+    # Uploads left mid-parse by a previous process are parsed again.
+    stale_parses = asyncio.create_task(
+        watch_stale_parses(get_mongo_client()[get_settings().mongo_database])
+    )
     yield
+    stale_parses.cancel()
+    await close_agents_client()
+    shutdown_parse_queue()
     await close_client()
+    shutdown_tracing()
 
 
 def create_app() -> FastAPI:
@@ -35,6 +71,63 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    application.add_middleware(BodySizeLimitMiddleware, paths=_UPLOAD_PATHS)
+
+    @application.middleware("http")
+    async def trace_requests(request: Request, call_next):
+        # Streaming responses end this span once headers are sent; the body is
+        # covered by the agents-side spans of the same trace.
+        with start_span(
+            f"{request.method} {request.url.path}",
+            parent=parse_traceparent(request.headers.get("traceparent")),
+            kind="server",
+        ):
+            response = await call_next(request)
+            set_span_attributes(status_code=response.status_code)
+            return response
+
+    @application.middleware("http")
+    async def profile_request(request: Request, call_next):
+        # Opt-in per request with a valid X-Profile token; see project_brief_common.profiling.
+        supplied = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY)
+        if supplied is None or request.url.path not in _PROFILED_PATHS:
+            return await call_next(request)
+
+        if not is_authorized(supplied, settings.profiling_token):
+            return JSONResponse(
+                {"detail": "Profiling is disabled or the token is invalid."},
+                status_code=status.HTTP_403_FORBIDDEN,
+            )
+        with SamplingProfiler(settings.profiling_interval_ms / 1000) as profiler:
+            response = await call_next(request)
+        profile_id = await asyncio.to_thread(
+            profiler.save, settings.profiling_dir, request.url.path, settings.profiling_max_files
+        )
+        logger.info(
+            "Profiled %s: %d samples, profile %s", request.url.path, profiler.samples, profile_id
+        )
+        response.headers[PROFILE_ID_HEADER] = profile_id
+        response.headers[PROFILE_SAMPLES_HEADER] = str(profiler.samples)
+        return response
+
+    @application.exception_handler(AgentsUnavailableError)
+    async def agents_unavailable(request: Request, exc: AgentsUnavailableError) -> JSONResponse:
+        headers = None
+        if exc.retry_after_seconds is not None:
+            headers = {"Retry-After": str(max(int(exc.retry_after_seconds), 1))}
+        return JSONResponse(
+            {"detail": str(exc)},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers=headers,
+        )
+
+    @application.exception_handler(httpx.TimeoutException)
+    async def agents_timed_out(request: Request, exc: httpx.TimeoutException) -> JSONResponse:
+        # A slow run, not an outage: the circuit stays closed.
+        return JSONResponse(
+            {"detail": f"Agents service timed out: {exc}"},
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        )
 
     application.include_router(api_router, prefix="/api")
     return application
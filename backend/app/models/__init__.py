@@ -7,7 +7,7 @@ from .brief import (
     DocumentReference,
     SummaryModel,
 )
-from .document import DocumentCreateResponse, DocumentModel
+from .document import DocumentCreateResponse, DocumentModel, DocumentStatus
 
 __all__ = [
     "AgentRunModel",
@@ -17,4 +17,5 @@ __all__ = [
     "SummaryModel",
     "DocumentModel",
     "DocumentCreateResponse",
+    "DocumentStatus",
 ]
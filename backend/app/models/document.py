@@ -3,17 +3,26 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
 
+DocumentStatus = Literal["pending", "parsing", "indexing", "ready", "failed"]
+
+
 class DocumentModel(BaseModel):
     id: str = Field(..., description="Document identifier")
     name: str = Field(..., min_length=1)
     url: Optional[str] = None
     notes: Optional[str] = None
     text: Optional[str] = None
+    sha256: Optional[str] = Field(default=None, description="SHA-256 of the uploaded file")
+    size_bytes: Optional[int] = None
+    status: DocumentStatus = Field(default="ready", description="Text extraction progress")
+    error: Optional[str] = None
+    page_count: Optional[int] = None
+    preview: Optional[str] = Field(default=None, description="Leading text of the document")
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -1,51 +1,324 @@
-"""HTTP client for interacting with the LangGraph agents service."""
+"""HTTP client for interacting with the LangGraph agents service.
+
+One `AgentsClient` (and so one pooled `httpx.AsyncClient`) lives for the
+whole application: connections to the agents service are kept alive between
+briefs instead of paying TCP setup on every request. Connection failures are
+retried with jittered exponential backoff, and a circuit breaker fails fast
+with `AgentsUnavailableError` while the agents service is down rather than
+making every request wait out the timeouts.
+"""
 
 from __future__ import annotations
 
-from typing import Any, Iterable, Mapping
+import asyncio
+import importlib.util
+import json
+import logging
+import random
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Mapping
 
 import httpx
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core.tracing import current_traceparent, start_span
+
+logger = logging.getLogger(__name__)
+
+# Failures that mean the agents service could not be reached at all. The
+# request never got there, so retrying a POST is safe.
+_CONNECTION_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+# Failures that count against the circuit: no connection could be made or
+# taken from the pool. Read and write timeouts do not; a long LLM-bound run
+# on a healthy service must not open the circuit for everyone.
+_BREAKER_ERRORS = (*_CONNECTION_ERRORS, httpx.PoolTimeout)
+# Status codes a proxy or the service returns while it is down or overloaded.
+_UNAVAILABLE_STATUSES = frozenset({502, 503, 504})
+
+
+class AgentsUnavailableError(RuntimeError):
+    """Raised when the agents service is unreachable or the circuit is open."""
+
+    def __init__(self, message: str, retry_after_seconds: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
+class CircuitBreaker:
+    """Open after consecutive failures; allow one trial call after a cool-down.
+
+    States follow the usual pattern: *closed* lets calls through, *open*
+    rejects them until ``reset_timeout_seconds`` has passed, then *half-open*
+    lets a single trial through whose outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout_seconds: float) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self._reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Raise `AgentsUnavailableError` if the call must not go out."""
+
+        state = self.state
+        if state == "closed":
+            return
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        retry_after = max(self._reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+        raise AgentsUnavailableError(
+            "Agents service unavailable (circuit open).", retry_after_seconds=retry_after
+        )
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give back a half-open trial slot without judging the service."""
+
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            if self._opened_at is None:
+                logger.warning(
+                    "Agents circuit opened after %d consecutive failures", self._failures
+                )
+            self._opened_at = time.monotonic()
 
 
 class AgentsClient:
-    """Thin wrapper around the agents workflow endpoint."""
+    """Pooled client for the agents workflow endpoints."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout_seconds: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+        *,
+        connect_timeout_seconds: float = 5.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry_seconds: float = 30.0,
+        http2: bool = False,
+        max_retries: int = 2,
+        backoff_base_seconds: float = 0.2,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base_seconds
+        self._breaker = breaker or CircuitBreaker(failure_threshold=5, reset_timeout_seconds=30)
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("AGENTS_HTTP2 is set but the h2 package is missing; using HTTP/1.1")
+            http2 = False
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry_seconds,
+            ),
+            http2=http2,
+            transport=transport,
+        )
 
-    def __init__(self, base_url: str, timeout_seconds: int) -> None:
-        self._base_url = base_url
-        self._timeout_seconds = timeout_seconds
+    @classmethod
+    def from_settings(cls, settings: Settings) -> AgentsClient:
+        return cls(
+            base_url=settings.agents_base_url,
+            timeout_seconds=settings.agents_timeout_seconds,
+            connect_timeout_seconds=settings.agents_connect_timeout_seconds,
+            max_connections=settings.agents_max_connections,
+            max_keepalive_connections=settings.agents_max_keepalive_connections,
+            keepalive_expiry_seconds=settings.agents_keepalive_expiry_seconds,
+            http2=settings.agents_http2,
+            max_retries=settings.agents_max_retries,
+            backoff_base_seconds=settings.agents_backoff_base_seconds,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.agents_breaker_failure_threshold,
+                reset_timeout_seconds=settings.agents_breaker_reset_seconds,
+            ),
+        )
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+
+        await self._client.aclose()
 
     async def run_workflow(
         self,
         conversation: Iterable[Mapping[str, str]],
         documents: Iterable[Mapping[str, str | None]] | None = None,
         thread_id: str | None = None,
+        continuation: bool = False,
     ) -> dict[str, Any]:
-        """Invoke the workflow run endpoint."""
+        """Invoke the workflow run endpoint.
 
-        async with httpx.AsyncClient(
-            base_url=self._base_url,
-            timeout=self._timeout_seconds,
-        ) as client:
-            response = await client.post(
+        With ``continuation`` only the new turns and documents are sent and the
+        agents service rebuilds the rest of the thread from its checkpoint.
+        """
+
+        with start_span("POST /workflow/run", kind="client"):
+            payload = _workflow_payload(conversation, documents, thread_id, continuation)
+            response = await self._call(
                 "/workflow/run",
-                json={
-                    "conversation": list(conversation),
-                    "documents": list(documents or []),
-                    "thread_id": thread_id,
-                },
+                lambda: self._client.post("/workflow/run", json=payload, headers=_trace_headers()),
             )
             response.raise_for_status()
             return response.json()
 
+    async def stream_workflow(
+        self,
+        conversation: Iterable[Mapping[str, str]],
+        documents: Iterable[Mapping[str, str | None]] | None = None,
+        thread_id: str | None = None,
+        continuation: bool = False,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Invoke the workflow stream endpoint and yield ``(event, data)`` pairs."""
+
+        with start_span("POST /workflow/stream", kind="client"):
+            payload = _workflow_payload(conversation, documents, thread_id, continuation)
+            request = self._client.build_request(
+                "POST", "/workflow/stream", json=payload, headers=_trace_headers()
+            )
+            response = await self._call(
+                "/workflow/stream", lambda: self._client.send(request, stream=True)
+            )
+            try:
+                response.raise_for_status()
+                async for event in _iter_sse(response.aiter_lines()):
+                    yield event
+            finally:
+                await response.aclose()
+
+    async def _call(self, path: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Send one request through the circuit breaker, retrying connection errors.
+
+        Connect and pool failures and 502/503/504 answers count against the
+        circuit and surface as `AgentsUnavailableError`; any other response
+        closes the circuit again. Read and write timeouts propagate as is
+        and leave the circuit alone.
+        """
+
+        self._breaker.before_call()
+        try:
+            response = await self._send_with_retries(send)
+        except _BREAKER_ERRORS as exc:
+            self._breaker.record_failure()
+            raise AgentsUnavailableError(f"Agents service unreachable on {path}: {exc}") from exc
+        except BaseException:
+            # Not a sign the service is down (slow run, or the caller went away).
+            self._breaker.release()
+            raise
+        if response.status_code in _UNAVAILABLE_STATUSES:
+            await response.aclose()
+            self._breaker.record_failure()
+            raise AgentsUnavailableError(f"Agents service answered {response.status_code} on {path}.")
+        self._breaker.record_success()
+        return response
+
+    async def _send_with_retries(
+        self, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                return await send()
+            except _CONNECTION_ERRORS as exc:
+                if attempt >= self._max_retries:
+                    raise
+                # Full jitter, as in the agents' LLM client.
+                delay = random.uniform(0, self._backoff_base * (2**attempt))
+                logger.warning(
+                    "Agents call failed (%s); retry %d/%d in %.2fs",
+                    type(exc).__name__,
+                    attempt + 1,
+                    self._max_retries,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+
+def _workflow_payload(
+    conversation: Iterable[Mapping[str, str]],
+    documents: Iterable[Mapping[str, str | None]] | None,
+    thread_id: str | None,
+    continuation: bool,
+) -> dict[str, Any]:
+    return {
+        "conversation": list(conversation),
+        "documents": list(documents or []),
+        "thread_id": thread_id,
+        "continuation": continuation,
+    }
+
+
+def _trace_headers() -> dict[str, str]:
+    traceparent = current_traceparent()
+    return {"traceparent": traceparent} if traceparent else {}
+
+
+async def _iter_sse(lines: AsyncIterator[str]) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """Parse a Server-Sent Events line stream into ``(event, data)`` pairs."""
+
+    event = "message"
+    data_lines: list[str] = []
+    async for line in lines:
+        if not line:
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+    if data_lines:
+        yield event, json.loads("\n".join(data_lines))
+
+
+_client: AgentsClient | None = None
+
+
+def get_shared_agents_client() -> AgentsClient:
+    """Return the application-wide client, creating it on first use."""
+    global _client  # noqa: PLW0603 - module-level singleton
+
+    if _client is None:
+        _client = AgentsClient.from_settings(get_settings())
+    return _client
+
 
 async def get_agents_client() -> AgentsClient:
-    """FastAPI dependency factory for AgentsClient."""
+    """FastAPI dependency returning the shared AgentsClient."""
+
+    return get_shared_agents_client()
+
 
-    settings = get_settings()
-    return AgentsClient(
-        base_url=settings.agents_base_url,
-        timeout_seconds=settings.agents_timeout_seconds,
-    )
+async def close_agents_client() -> None:
+    """Close the shared client's connection pool."""
+    global _client  # noqa: PLW0603
 
+    if _client is not None:
+        await _client.aclose()
+        _client = None
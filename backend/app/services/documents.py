@@ -2,57 +2,579 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Any, BinaryIO, Iterable, NamedTuple
 from uuid import uuid4
 
 from fastapi import UploadFile
 from langchain_community.document_loaders import PyPDFLoader, TextLoader
 
 from app.core.config import get_settings
-from app.models import DocumentModel
+from app.models import DocumentModel, DocumentStatus
 
 
-async def save_and_parse_upload(upload: UploadFile) -> DocumentModel:
-    settings = get_settings()
-    uploads_dir = Path(settings.uploads_dir)
-    uploads_dir.mkdir(parents=True, exist_ok=True)
+# Read size when copying uploads to disk; memory use per upload stays at one chunk.
+UPLOAD_CHUNK_BYTES = 1024 * 1024
 
-    file_id = str(uuid4())
-    sanitized_name = upload.filename or f"document-{file_id}"
-    target_path = uploads_dir / f"{file_id}-{sanitized_name}"
+# Parsed text lives in ``document_pages``, one record per page; the document's
+# full text is the pages joined with this separator, and page offsets and
+# search-index passages are positions in that text. The agents intake
+# (``project_agents.intake.pages``) relies on the same layout.
+PAGE_SEPARATOR = "\n\n"
+# Page size for files without pages of their own (plain text, Markdown).
+TEXT_PAGE_CHARS = 20_000
+# Leading text kept on the content record for listings and status checks.
+PREVIEW_CHARS = 500
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload is larger than ``MAX_UPLOAD_BYTES``."""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(f"Upload exceeds the {limit}-byte limit.")
+        self.limit = limit
+
+
+class StagedUpload(NamedTuple):
+    """An upload streamed to a temporary file, with its content hash."""
+
+    path: Path
+    sha256: str
+    size_bytes: int
 
-    content = await upload.read()
-    target_path.write_bytes(content)
 
-    text = _extract_text(target_path)
+async def store_upload(database, upload: UploadFile) -> tuple[DocumentModel, Path | None]:
+    """Store ``upload`` by content and insert its ``documents`` reference.
 
-    return DocumentModel(
+    Identical bytes share one blob under ``UPLOADS_DIR/blobs`` and one
+    ``document_contents`` record holding page offsets and a preview (page
+    texts go to ``document_pages``, the search index to
+    ``document_index_chunks``); each upload only adds a small reference (id,
+    name, hash) to ``documents``. Returns the
+    reference and, when the content still has to be parsed, the blob path to
+    hand to `app.services.parsing.ParseQueue`; repeat uploads return ``None``
+    and skip parsing.
+    """
+
+    staged = await stage_upload(upload)
+    try:
+        target = blob_path(staged.sha256, Path(upload.filename or "").suffix.lower())
+        status, claimed = await claim_content(database, staged, target)
+        if claimed:
+            await asyncio.to_thread(_move_into_place, staged.path, target)
+    finally:
+        staged.path.unlink(missing_ok=True)
+
+    file_id = str(uuid4())
+    document = DocumentModel(
         id=file_id,
-        name=sanitized_name,
-        text=text,
+        name=upload.filename or f"document-{file_id}",
+        sha256=staged.sha256,
+        size_bytes=staged.size_bytes,
+        status=status,
+    )
+    # No ``text`` key: that is what tells references from pre-dedup records.
+    await database["documents"].insert_one(
+        document.model_dump(exclude={"text", "status", "error"})
+    )
+    return document, target if claimed else None
+
+
+async def stage_upload(upload: UploadFile) -> StagedUpload:
+    """Stream ``upload`` to a temporary file in ``UPLOADS_DIR``, hashing it on the way."""
+
+    settings = get_settings()
+    incoming = Path(settings.uploads_dir) / "incoming"
+    incoming.mkdir(parents=True, exist_ok=True)
+    path = incoming / uuid4().hex
+    sha256, size_bytes = await asyncio.to_thread(
+        _stream_to_disk, upload.file, path, settings.max_upload_bytes
+    )
+    return StagedUpload(path, sha256, size_bytes)
+
+
+def blob_path(sha256: str, suffix: str) -> Path:
+    """Where the blob with this hash lives; the suffix picks the text loader."""
+
+    return Path(get_settings().uploads_dir) / "blobs" / sha256[:2] / f"{sha256}{suffix}"
+
+
+async def claim_content(
+    database, staged: StagedUpload, storage_path: Path
+) -> tuple[DocumentStatus, bool]:
+    """Find or create the ``document_contents`` record for ``staged``.
+
+    Returns the content's status and whether the caller must store the blob
+    and parse it: true for new content, content whose parse failed, and
+    content left mid-parse for ``_STALE_PARSE_SECONDS`` (e.g. by a restart).
+    """
+
+    contents = database["document_contents"]
+    now = datetime.now(timezone.utc)
+    result = await contents.update_one(
+        {"sha256": staged.sha256},
+        {
+            "$setOnInsert": {
+                "sha256": staged.sha256,
+                "size_bytes": staged.size_bytes,
+                "storage_path": str(storage_path),
+                "status": "pending",
+                "created_at": now,
+                "updated_at": now,
+            }
+        },
+        upsert=True,
+    )
+    if result.upserted_id is not None:
+        return "pending", True
+
+    reclaimed = await contents.find_one_and_update(
+        {"sha256": staged.sha256, "$or": [{"status": "failed"}, _stale_parse_filter(now)]},
+        {
+            "$set": {
+                "status": "pending",
+                "error": None,
+                "storage_path": str(storage_path),
+                "updated_at": now,
+            }
+        },
+        projection={"_id": 0, "status": 1},
+    )
+    if reclaimed is not None:
+        return "pending", True
+    existing = await contents.find_one({"sha256": staged.sha256}, {"_id": 0, "status": 1})
+    return (existing or {}).get("status", "pending"), False
+
+
+async def reclaim_stale_content(database) -> tuple[str, Path] | None:
+    """Claim one content record left mid-parse for ``_STALE_PARSE_SECONDS``.
+
+    The record is reset to ``pending`` atomically, so several backend
+    processes sweeping at once never claim the same content. Returns its
+    hash and blob path, or None when there is nothing left to reclaim.
+    """
+
+    now = datetime.now(timezone.utc)
+    reclaimed = await database["document_contents"].find_one_and_update(
+        _stale_parse_filter(now),
+        {"$set": {"status": "pending", "error": None, "updated_at": now}},
+        projection={"_id": 0, "sha256": 1, "storage_path": 1},
+    )
+    if reclaimed is None:
+        return None
+    return reclaimed["sha256"], Path(reclaimed["storage_path"])
+
+
+def _stale_parse_filter(now: datetime) -> dict[str, Any]:
+    return {
+        "status": {"$in": sorted(PARSING_STATUSES)},
+        "updated_at": {"$lt": now - timedelta(seconds=_STALE_PARSE_SECONDS)},
+    }
+
+
+async def get_upload(database, document_id: str) -> DocumentModel | None:
+    """Return an upload's reference with its content's parsing status, without text."""
+
+    record = await database["documents"].find_one({"id": document_id}, _STATUS_PROJECTION)
+    if record is None:
+        return None
+    if "status" not in record and record.get("sha256"):
+        # A reference; records from before dedup carry their own status (or none: ready).
+        content = await database["document_contents"].find_one(
+            {"sha256": record["sha256"]},
+            {"_id": 0, "status": 1, "error": 1, "page_count": 1, "preview": 1},
+        )
+        record.update(content or {})
+    return DocumentModel.model_validate(record)
+
+
+def _move_into_place(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(source, target)
+
+
+def _stream_to_disk(source: BinaryIO, target: Path, max_bytes: int) -> tuple[str, int]:
+    """Copy ``source`` to ``target`` chunk by chunk; return its SHA-256 and size.
+
+    Raises `UploadTooLargeError` (removing the partial file) as soon as more
+    than ``max_bytes`` have been read.
+    """
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with target.open("wb") as sink:
+            while chunk := source.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                sink.write(chunk)
+    except BaseException:
+        target.unlink(missing_ok=True)
+        raise
+    return digest.hexdigest(), size
+
+
+# Index format shared with the agents intake (``project_agents.intake.retrieval``).
+# Bump the version whenever tokenization or the layout changes.
+SEARCH_INDEX_VERSION = 1
+# Passages per ``document_index_chunks`` record; at ``SEARCH_PASSAGE_CHARS``
+# characters each this keeps every record far below Mongo's 16 MB limit.
+SEARCH_INDEX_CHUNK_PASSAGES = 256
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def build_search_index(text: str, passage_chars: int) -> dict[str, Any]:
+    """Build a BM25 inverted index over passages of ``text``.
+
+    Passages are stored as ``[start, end]`` character offsets into the text
+    rather than copies of it. ``postings`` maps each term to
+    ``[passage, term_frequency]`` pairs and ``lengths`` holds the term count
+    of every passage, which is all BM25 needs at query time.
+    """
+
+    passages = _passage_spans(text, passage_chars)
+    postings: dict[str, list[list[int]]] = {}
+    lengths: list[int] = []
+    for position, (start, end) in enumerate(passages):
+        counts = Counter(index_terms(text[start:end]))
+        lengths.append(sum(counts.values()))
+        for term, frequency in counts.items():
+            postings.setdefault(term, []).append([position, frequency])
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "passages": [[start, end] for start, end in passages],
+        "lengths": lengths,
+        "postings": postings,
+    }
+
+
+def page_spans(pages: list[str]) -> list[list[int]]:
+    """``[start, end]`` of every page in ``PAGE_SEPARATOR.join(pages)``."""
+
+    spans = []
+    start = 0
+    for page in pages:
+        spans.append([start, start + len(page)])
+        start += len(page) + len(PAGE_SEPARATOR)
+    return spans
+
+
+async def store_pages(database, sha256: str, pages: list[str]) -> None:
+    """Replace the ``document_pages`` records of a content hash."""
+
+    collection = database["document_pages"]
+    await collection.delete_many({"sha256": sha256})
+    if pages:
+        await collection.insert_many(
+            [
+                {"sha256": sha256, "page": number, "start": start, "end": end, "text": page}
+                for number, (page, (start, end)) in enumerate(zip(pages, page_spans(pages)))
+            ]
+        )
+
+
+def split_search_index(
+    index: dict[str, Any], passages_per_chunk: int = SEARCH_INDEX_CHUNK_PASSAGES
+) -> list[dict[str, Any]]:
+    """Partition ``index`` into consecutive passage ranges.
+
+    Each chunk holds the spans, lengths and postings of its passages;
+    positions stay document-wide, so concatenating the chunks in order
+    rebuilds the index.
+    """
+
+    passages = index["passages"]
+    chunks = [
+        {
+            "version": index["version"],
+            "passages": passages[first:first + passages_per_chunk],
+            "lengths": index["lengths"][first:first + passages_per_chunk],
+            "postings": {},
+        }
+        for first in range(0, len(passages), passages_per_chunk)
+    ]
+    for term, postings in index["postings"].items():
+        for position, frequency in postings:
+            chunk = chunks[position // passages_per_chunk]["postings"]
+            chunk.setdefault(term, []).append([position, frequency])
+    return chunks
+
+
+async def store_search_index(database, sha256: str, index: dict[str, Any] | None) -> None:
+    """Replace the ``document_index_chunks`` records of a content hash.
+
+    The agents load the index by hash, so it never travels with a workflow
+    request or lands in a checkpoint.
+    """
+
+    collection = database["document_index_chunks"]
+    await collection.delete_many({"sha256": sha256})
+    if index and index["passages"]:
+        await collection.insert_many(
+            [
+                {"sha256": sha256, "chunk": number, **chunk}
+                for number, chunk in enumerate(split_search_index(index))
+            ]
+        )
+
+
+async def index_text(text: str | None) -> dict[str, Any] | None:
+    """Build the search index of ``text`` off the event loop (``None`` for no text)."""
+
+    if not text:
+        return None
+    settings = get_settings()
+    return await asyncio.to_thread(build_search_index, text, settings.search_passage_chars)
+
+
+# Rough in-memory cost of one ``[start, end]`` page offset, in characters.
+_PAGE_SPAN_CHARS = 32
+
+
+class DocumentCache:
+    """Bounded LRU of hydrated documents (name, text, page offsets) keyed by ID.
+
+    Bounded by entry count and by an estimated size in characters (text,
+    name and page offsets), so a few huge PDFs cannot crowd out memory.
+    Only parsed documents are cached; their content is immutable (content
+    records are keyed by hash and upload IDs are never reused), so entries
+    never need invalidating. Entries are treated as read-only.
+    """
+
+    def __init__(self, max_entries: int, max_chars: int) -> None:
+        self._max_entries = max_entries
+        self._max_chars = max_chars
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, document_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        found: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for document_id in document_ids:
+                entry = self._entries.get(document_id)
+                if entry is None:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(document_id)
+                self.hits += 1
+                found[document_id] = entry
+        return found
+
+    def put(self, document_id: str, entry: dict[str, Any]) -> None:
+        size = _entry_size(entry)
+        if self._max_entries <= 0 or size > self._max_chars:
+            return
+        with self._lock:
+            self._discard(document_id)
+            self._entries[document_id] = entry
+            self._chars += size
+            while len(self._entries) > self._max_entries or self._chars > self._max_chars:
+                self._discard(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+    def _discard(self, document_id: str) -> None:
+        entry = self._entries.pop(document_id, None)
+        if entry is not None:
+            self._chars -= _entry_size(entry)
+
+
+def _entry_size(entry: dict[str, Any]) -> int:
+    return (
+        len(entry.get("text") or "")
+        + len(entry.get("name") or "")
+        + _PAGE_SPAN_CHARS * len(entry.get("pages") or ())
     )
 
 
-def _extract_text(path: Path) -> str:
+_document_cache: DocumentCache | None = None
+
+
+def get_document_cache() -> DocumentCache:
+    """Return the process-wide document cache."""
+    global _document_cache  # noqa: PLW0603 - module-level singleton
+
+    if _document_cache is None:
+        settings = get_settings()
+        _document_cache = DocumentCache(
+            settings.document_cache_max_entries, settings.document_cache_max_chars
+        )
+    return _document_cache
+
+
+# Only what the brief workflow needs; ``_id`` and upload metadata stay behind.
+_DOCUMENT_PROJECTION = {"_id": 0, "id": 1, "name": 1, "sha256": 1, "text": 1, "status": 1}
+_CONTENT_PROJECTION = {"_id": 0, "sha256": 1, "text": 1, "pages": 1, "status": 1}
+_STATUS_PROJECTION = {"_id": 0, "text": 0, "storage_path": 0}
+
+# Statuses of an upload whose text is still being extracted or indexed.
+PARSING_STATUSES = frozenset({"pending", "parsing", "indexing"})
+_PARSE_POLL_SECONDS = 0.25
+# A parse that has not moved for this long is assumed lost and may be retried.
+_STALE_PARSE_SECONDS = 600
+
+
+async def fetch_documents(database, document_ids: list[str]) -> dict[str, dict[str, Any]]:
+    """Return ``{id: {"name", "text", "status", ...}}`` for the stored documents.
+
+    Entries for paged content carry ``sha256`` and ``pages`` (page offsets)
+    instead of ``text``. Search indexes stay in ``document_index_chunks``;
+    the agents load them by ``sha256``.
+
+    Cached documents cost nothing; the rest are loaded with one ``$in`` query
+    on ``documents`` and one on ``document_contents``, whatever their number.
+    Unknown IDs are left out, and only fully parsed documents are cached.
+    """
+
+    cache = get_document_cache()
+    found = cache.get_many(document_ids)
+    missing = [
+        document_id for document_id in dict.fromkeys(document_ids) if document_id not in found
+    ]
+    if not missing:
+        return found
+
+    stored = await database["documents"].find(
+        {"id": {"$in": missing}}, _DOCUMENT_PROJECTION
+    ).to_list(length=None)
+    if not stored:
+        return found
+    # References point at a shared content record; records from before dedup
+    # still hold their own text.
+    hashes = [
+        record["sha256"] for record in stored if "text" not in record and record.get("sha256")
+    ]
+    content_by_hash = {}
+    if hashes:
+        contents = await database["document_contents"].find(
+            {"sha256": {"$in": list(dict.fromkeys(hashes))}}, _CONTENT_PROJECTION
+        ).to_list(length=None)
+        content_by_hash = {content["sha256"]: content for content in contents}
+
+    for record in stored:
+        if "text" in record:
+            entry = {
+                "name": record.get("name"),
+                "text": record.get("text"),
+                # Records stored before background parsing carry no status.
+                "status": record.get("status", "ready"),
+            }
+        else:
+            content = content_by_hash.get(record.get("sha256"), {"status": "failed"})
+            entry = {
+                "name": record.get("name"),
+                # Paged content has no text here; the agents load the pages they need.
+                "text": content.get("text"),
+                "sha256": content.get("sha256"),
+                "pages": content.get("pages"),
+                "status": content.get("status", "ready"),
+            }
+        if entry["status"] == "ready":
+            cache.put(record["id"], entry)
+        found[record["id"]] = entry
+    return found
+
+
+async def wait_for_documents(
+    database, documents: dict[str, dict[str, Any]], timeout_seconds: float
+) -> dict[str, dict[str, Any]]:
+    """Re-fetch ``documents`` still being parsed until they finish or time runs out.
+
+    Returns ``documents`` updated in place; entries that are still parsing
+    after ``timeout_seconds`` keep their parsing status.
+    """
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_seconds
+    pending = [key for key, entry in documents.items() if entry["status"] in PARSING_STATUSES]
+    while pending and (remaining := deadline - loop.time()) > 0:
+        await asyncio.sleep(min(_PARSE_POLL_SECONDS, remaining))
+        documents.update(await fetch_documents(database, pending))
+        pending = [key for key in pending if documents[key]["status"] in PARSING_STATUSES]
+    return documents
+
+
+def index_terms(text: str) -> list[str]:
+    """Lowercase word tokens with a plural ``s`` folded away ("users" -> "user")."""
+
+    return [_fold_plural(token) for token in _TOKEN.findall(text.lower())]
+
+
+def _fold_plural(token: str) -> str:
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def _passage_spans(text: str, passage_chars: int) -> list[tuple[int, int]]:
+    """Split text into paragraph passages, windowing paragraphs that run long."""
+
+    spans: list[tuple[int, int]] = []
+    start = 0
+    for match in [*_PARAGRAPH_BREAK.finditer(text), None]:
+        end = match.start() if match else len(text)
+        while end - start > passage_chars:
+            cut = text.rfind(" ", start, start + passage_chars)
+            if cut <= start:
+                cut = start + passage_chars
+            spans.append((start, cut))
+            start = cut
+        if text[start:end].strip():
+            spans.append((start, end))
+        start = match.end() if match else end
+    return spans
+
+
+def extract_pages(path: Path) -> list[str]:
+    """Extract a stored upload's text page by page (runs in the parse worker processes).
+
+    PDFs give one entry per page, empty pages included so numbering holds;
+    other files are cut into ``TEXT_PAGE_CHARS`` pages at paragraph breaks.
+    """
+
     suffix = path.suffix.lower()
     try:
         if suffix in {'.txt', '.md'}:
             loader = TextLoader(str(path), autodetect_encoding=True)
-            return _join_documents(loader.load())
+            return _paginate(PAGE_SEPARATOR.join(_page_texts(loader.load())))
         if suffix in {'.pdf'}:
             loader = PyPDFLoader(str(path))
-            return _join_documents(loader.load())
-        return path.read_text(encoding='utf-8', errors='ignore')
+            return _page_texts(loader.load())
+        return _paginate(path.read_text(encoding='utf-8', errors='ignore'))
     except Exception:  # noqa: BLE001
-        return path.read_text(encoding='utf-8', errors='ignore')
+        return _paginate(path.read_text(encoding='utf-8', errors='ignore'))
+
+
+def _page_texts(documents: Iterable) -> list[str]:
+    return [(getattr(doc, 'page_content', '') or '').strip() for doc in documents]
 
 
-def _join_documents(documents: Iterable) -> str:
-    parts = []
-    for doc in documents:
-        content = getattr(doc, 'page_content', '')
-        if content:
-            parts.append(content.strip())
-    return "\n\n".join(parts)
+def _paginate(text: str) -> list[str]:
+    pages: list[list[str]] = []
+    size = 0
+    for start, end in _passage_spans(text, TEXT_PAGE_CHARS):
+        paragraph = text[start:end].strip()
+        if pages and size + len(PAGE_SEPARATOR) + len(paragraph) <= TEXT_PAGE_CHARS:
+            pages[-1].append(paragraph)
+            size += len(PAGE_SEPARATOR) + len(paragraph)
+        else:
+            pages.append([paragraph])
+            size = len(paragraph)
+    return [PAGE_SEPARATOR.join(paragraphs) for paragraphs in pages]
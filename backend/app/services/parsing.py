@@ -0,0 +1,194 @@
+"""Background text extraction for uploaded documents.
+
+`/api/uploads` stores the file and answers straight away with
+``status="pending"``; `ParseQueue.run` then extracts the text in a process
+pool, so a slow PDF never holds the event loop, stores it page by page in
+``document_pages``, stores the search index in ``document_index_chunks``
+and records each step
+(``parsing``, ``indexing``, then ``ready`` or ``failed``) on the shared
+``document_contents`` record, where ``GET /api/uploads/{id}`` reports it.
+Content that was already parsed is never queued again; content left
+mid-parse (e.g. by a restart) is picked up again by `watch_stale_parses`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from pymongo.errors import PyMongoError
+
+from app.core.config import get_settings
+from app.models import DocumentStatus
+from app.services.documents import (
+    PAGE_SEPARATOR,
+    PREVIEW_CHARS,
+    extract_pages,
+    index_text,
+    page_spans,
+    reclaim_stale_content,
+    store_pages,
+    store_search_index,
+)
+
+logger = logging.getLogger(__name__)
+
+# How often `watch_stale_parses` looks for abandoned parses.
+_STALE_SWEEP_SECONDS = 60.0
+
+
+class ParseQueueFullError(RuntimeError):
+    """Raised when ``PARSE_QUEUE_MAX`` uploads are already waiting to be parsed."""
+
+
+class ParseQueue:
+    """Process pool for text extraction with a bound on outstanding jobs.
+
+    Callers `reserve` a slot before storing an upload and hand it to `run`,
+    which gives the slot back when the document is parsed or has failed.
+    At most ``workers`` documents are parsed at once; the rest wait in the
+    pool's queue.
+    """
+
+    def __init__(self, workers: int, max_queued: int) -> None:
+        self._workers = workers
+        self._max_queued = max_queued
+        self._queued = 0
+        self._pool: ProcessPoolExecutor | None = None
+        self._requeued: set[asyncio.Task[None]] = set()
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def reserve(self) -> None:
+        if self._queued >= self._max_queued:
+            raise ParseQueueFullError(
+                f"{self._queued} uploads are already waiting to be parsed; try again shortly."
+            )
+        self._queued += 1
+
+    def release(self) -> None:
+        self._queued = max(self._queued - 1, 0)
+
+    async def run(self, database, sha256: str, path: Path) -> None:
+        """Parse and index one reserved blob, recording progress on its content record."""
+
+        try:
+            await _set_status(database, sha256, "parsing", parse_started_at=_now())
+            loop = asyncio.get_running_loop()
+            pages = await loop.run_in_executor(self._executor(), extract_pages, path)
+            await _set_status(database, sha256, "indexing", page_count=len(pages))
+            text = PAGE_SEPARATOR.join(pages)
+            search_index = await index_text(text)
+            await store_pages(database, sha256, pages)
+            await store_search_index(database, sha256, search_index)
+            await _set_status(
+                database,
+                sha256,
+                "ready",
+                pages=page_spans(pages),
+                text_chars=len(text),
+                preview=text[:PREVIEW_CHARS],
+                parsed_at=_now(),
+            )
+        except Exception as exc:  # noqa: BLE001 - recorded on the content record
+            logger.exception("Parsing content %s failed", sha256)
+            try:
+                await _set_status(database, sha256, "failed", error=str(exc) or type(exc).__name__)
+            except Exception:  # noqa: BLE001
+                logger.exception("Could not record the failure of content %s", sha256)
+        finally:
+            self.release()
+
+    async def requeue_stale(self, database) -> int:
+        """Queue content whose parse was abandoned, as long as there is room.
+
+        Returns how many records were queued; the rest wait for a later sweep.
+        """
+
+        queued = 0
+        while self._queued < self._max_queued:
+            self.reserve()
+            try:
+                reclaimed = await reclaim_stale_content(database)
+            except BaseException:
+                self.release()
+                raise
+            if reclaimed is None:
+                self.release()
+                break
+            sha256, path = reclaimed
+            logger.info("Re-queueing abandoned parse of content %s", sha256)
+            task = asyncio.create_task(self.run(database, sha256, path))
+            self._requeued.add(task)
+            task.add_done_callback(self._requeued.discard)
+            queued += 1
+        return queued
+
+    def shutdown(self) -> None:
+        for task in self._requeued:
+            task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned, not forked: the parent has driver and exporter threads running.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+
+async def _set_status(database, sha256: str, status: DocumentStatus, **fields: Any) -> None:
+    # ``updated_at`` lets a later upload of the same bytes spot an abandoned parse.
+    await database["document_contents"].update_one(
+        {"sha256": sha256}, {"$set": {"status": status, "updated_at": _now(), **fields}}
+    )
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+_parse_queue: ParseQueue | None = None
+
+
+def get_parse_queue() -> ParseQueue:
+    """Return the process-wide parse queue."""
+    global _parse_queue  # noqa: PLW0603 - module-level singleton
+
+    if _parse_queue is None:
+        settings = get_settings()
+        _parse_queue = ParseQueue(settings.parse_workers, settings.parse_queue_max)
+    return _parse_queue
+
+
+async def watch_stale_parses(database, interval: float = _STALE_SWEEP_SECONDS) -> None:
+    """Re-queue abandoned parses at startup and every ``interval`` seconds after.
+
+    Runs until cancelled; Mongo errors only delay the next sweep.
+    """
+
+    while True:
+        try:
+            await get_parse_queue().requeue_stale(database)
+        except PyMongoError as exc:
+            logger.warning("Could not look for abandoned parses: %s", exc)
+        await asyncio.sleep(interval)
+
+
+def shutdown_parse_queue() -> None:
+    """Stop the worker processes."""
+    global _parse_queue  # noqa: PLW0603
+
+    if _parse_queue is not None:
+        _parse_queue.shutdown()
+        _parse_queue = None
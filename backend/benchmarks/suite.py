@@ -0,0 +1,158 @@
+"""Micro-benchmarks for the backend hot paths.
+
+    python -m benchmarks.suite                       # compare with baseline.json
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --update-baseline
+
+Uploads are parsed from the fixtures next to this file into a temporary
+``UPLOADS_DIR``; brief runs use a fake agents client and an in-memory stand-in
+for Mongo, so only the backend's own work is measured.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable
+from uuid import uuid4
+
+from fastapi import UploadFile
+from project_brief_common.benchmarks import Case, main
+
+from app.api.routes.briefs import BriefRequest, run_brief_generation
+from app.core.config import get_settings
+from app.services.agents_client import AgentsClient
+from app.services.documents import blob_path, extract_pages, get_document_cache, stage_upload
+
+BASELINE = Path(__file__).with_name("baseline.json")
+FIXTURES = Path(__file__).with_name("fixtures")
+
+_AGENT_RESPONSE = {
+    "summary": {"project_title": "Atlas", "target_users": ["clinic staff"]},
+    "brief": {
+        "project_title": "Atlas",
+        "project_description": "Scheduling assistant for dental clinics.",
+        "purpose": "Reduce patient churn.",
+        "expected_outcomes": ["Higher retention"],
+        "business_model": [],
+        "constraints": [],
+        "timeline": "Q3 pilot",
+        "target_users": ["clinic staff"],
+        "documents": ["notes.txt"],
+        "opportunity_areas": [],
+        "suggested_reads": [],
+        "ideas_board": [],
+        "success_metrics": ["90-day retention"],
+    },
+    "follow_up_questions": ["What budget do you have?"],
+    "thread_id": "thread-bench",
+    "assistant_message": "Thanks! What budget do you have?",
+}
+
+
+class FakeAgentsClient(AgentsClient):
+    async def run_workflow(
+        self, conversation, documents=None, thread_id=None, continuation=False
+    ) -> dict[str, Any]:
+        return _AGENT_RESPONSE
+
+
+class _InsertResult:
+    def __init__(self) -> None:
+        self.inserted_id = uuid4()
+
+
+class MemoryCollection:
+    def __init__(self) -> None:
+        self.documents: dict[str, dict[str, Any]] = {}
+
+    async def insert_one(self, document: dict[str, Any]) -> _InsertResult:
+        self.documents[document.get("id") or document.get("document_id") or str(uuid4())] = document
+        return _InsertResult()
+
+    async def find_one(self, query: dict[str, Any]) -> dict[str, Any] | None:
+        return self.documents.get(query.get("id") or query.get("document_id"))
+
+    def find(self, query: dict[str, Any], projection: dict[str, Any] | None = None) -> "MemoryCursor":
+        (condition,) = query.values()
+        return MemoryCursor(
+            [dict(self.documents[key]) for key in condition["$in"] if key in self.documents]
+        )
+
+
+class MemoryCursor:
+    def __init__(self, documents: list[dict[str, Any]]) -> None:
+        self._documents = documents
+
+    async def to_list(self, length: int | None = None) -> list[dict[str, Any]]:
+        return self._documents
+
+
+class MemoryDatabase(dict):
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self:
+            self[name] = MemoryCollection()
+        return super().__getitem__(name)
+
+
+def _upload_case(fixture: str) -> Callable[[], Any]:
+    uploads_dir = tempfile.mkdtemp(prefix="bench-uploads-")
+    atexit.register(shutil.rmtree, uploads_dir, ignore_errors=True)
+    get_settings().uploads_dir = Path(uploads_dir)
+    content = (FIXTURES / fixture).read_bytes()
+    loop = asyncio.new_event_loop()
+
+    def _run() -> Any:
+        # First-seen content: staging, the blob move and the extraction a
+        # parse worker would run, all in-process.
+        upload = UploadFile(file=BytesIO(content), filename=fixture)
+        staged = loop.run_until_complete(stage_upload(upload))
+        path = blob_path(staged.sha256, Path(fixture).suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged.path, path)
+        return extract_pages(path)
+
+    return _run
+
+
+def _brief_case(cached: bool = True) -> Callable[[], Any]:
+    database = MemoryDatabase()
+    database["documents"].documents["doc-1"] = {
+        "id": "doc-1",
+        "name": "notes.txt",
+        "text": (FIXTURES / "sample.txt").read_text(encoding="utf-8"),
+    }
+    payload = BriefRequest(
+        conversation=[
+            {"role": "user", "content": "Atlas is a scheduling assistant for dental clinics."}
+        ],
+        documents=[{"id": "doc-1", "name": "notes.txt"}],
+    )
+    client = FakeAgentsClient(base_url="http://agents.invalid", timeout_seconds=1)
+    loop = asyncio.new_event_loop()
+    cache = get_document_cache()
+
+    def _run() -> Any:
+        if not cached:
+            cache.clear()
+        return loop.run_until_complete(run_brief_generation(payload, client, database))
+
+    return _run
+
+
+def build_cases() -> list[Case]:
+    return [
+        ("backend.save_and_parse_upload.txt", lambda: _upload_case("sample.txt")),
+        ("backend.save_and_parse_upload.pdf", lambda: _upload_case("sample.pdf")),
+        ("backend.run_brief_generation.fake_agents", _brief_case),
+        ("backend.run_brief_generation.fake_agents.cold_cache", lambda: _brief_case(cached=False)),
+    ]
+
+
+if __name__ == "__main__":
+    main("backend", build_cases(), BASELINE)
@@ -0,0 +1,144 @@
+"""Tests for the pooled agents client."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.dependencies.mongo import get_database
+from app.main import app
+from app.services.agents_client import (
+    AgentsClient,
+    AgentsUnavailableError,
+    CircuitBreaker,
+    get_agents_client,
+)
+
+RESULT = {"thread_id": "thread-1"}
+
+
+class ScriptedTransport(httpx.AsyncBaseTransport):
+    """Raise or answer from a script, then succeed."""
+
+    def __init__(self, script: list) -> None:
+        self.calls = 0
+        self._script = list(script)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        step = self._script.pop(0) if self._script else 200
+        if isinstance(step, Exception):
+            raise step
+        return httpx.Response(step, json=RESULT)
+
+
+def _client(transport: ScriptedTransport, **overrides) -> AgentsClient:
+    options = {"max_retries": 2, "backoff_base_seconds": 0}
+    options.update(overrides)
+    return AgentsClient("http://agents", timeout_seconds=5, transport=transport, **options)
+
+
+def _run(client: AgentsClient) -> dict:
+    return asyncio.run(client.run_workflow([{"role": "user", "content": "hi"}]))
+
+
+def test_connection_errors_are_retried() -> None:
+    transport = ScriptedTransport([httpx.ConnectError("refused"), httpx.ConnectError("refused")])
+
+    assert _run(_client(transport)) == RESULT
+    assert transport.calls == 3
+
+
+def test_circuit_opens_and_fails_fast_until_reset() -> None:
+    transport = ScriptedTransport([httpx.ConnectError("refused")] * 2 + [503])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=60)
+    client = _client(transport, max_retries=0, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(AgentsUnavailableError):
+            _run(client)
+    assert breaker.state == "open"
+    with pytest.raises(AgentsUnavailableError) as rejected:
+        _run(client)
+    assert transport.calls == 2
+    assert rejected.value.retry_after_seconds > 0
+
+    # After the cool-down a single trial goes out; a 503 re-opens the circuit.
+    breaker._opened_at -= 60  # noqa: SLF001 - fast-forward the cool-down
+    assert breaker.state == "half-open"
+    with pytest.raises(AgentsUnavailableError):
+        _run(client)
+    assert transport.calls == 3
+    assert breaker.state == "open"
+
+    breaker._opened_at -= 60  # noqa: SLF001
+    assert _run(client) == RESULT
+    assert breaker.state == "closed"
+
+
+def test_read_timeouts_do_not_open_the_circuit() -> None:
+    transport = ScriptedTransport([httpx.ReadTimeout("slow run")] * 3)
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=60)
+    client = _client(transport, max_retries=0, breaker=breaker)
+
+    for _ in range(3):
+        with pytest.raises(httpx.ReadTimeout):
+            _run(client)
+    assert breaker.state == "closed"
+    assert _run(client) == RESULT
+
+    pool_exhausted = _client(
+        ScriptedTransport([httpx.PoolTimeout("no connection")] * 2), max_retries=0, breaker=breaker
+    )
+    for _ in range(2):
+        with pytest.raises(AgentsUnavailableError):
+            _run(pool_exhausted)
+    assert breaker.state == "open"
+
+
+def test_dependency_shares_one_client() -> None:
+    first = asyncio.run(get_agents_client())
+    second = asyncio.run(get_agents_client())
+
+    assert first is second
+
+
+def test_unavailable_agents_map_to_503() -> None:
+    client = _client(ScriptedTransport([httpx.ConnectError("refused")] * 3))
+
+    async def override_agents() -> AgentsClient:
+        return client
+
+    async def override_db():
+        return {}
+
+    app.dependency_overrides[get_agents_client] = override_agents
+    app.dependency_overrides[get_database] = override_db
+    try:
+        response = TestClient(app).post("/api/briefs/run", json={"prompt": "Launch an app."})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 503
+    assert "unreachable" in response.json()["detail"]
+
+
+def test_slow_agents_runs_map_to_504() -> None:
+    client = _client(ScriptedTransport([httpx.ReadTimeout("slow run")]))
+
+    async def override_agents() -> AgentsClient:
+        return client
+
+    async def override_db():
+        return {}
+
+    app.dependency_overrides[get_agents_client] = override_agents
+    app.dependency_overrides[get_database] = override_db
+    try:
+        response = TestClient(app).post("/api/briefs/run", json={"prompt": "Launch an app."})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 504
+    assert client.breaker.state == "closed"
@@ -1,23 +1,41 @@
 """Tests for brief generation endpoint."""
 
+import json
 from uuid import uuid4
 
+import httpx
 from fastapi.testclient import TestClient
+from opentelemetry import trace
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 
+from app.core.config import get_settings
+from app.core.tracing import parse_traceparent, set_exporter
 from app.dependencies.mongo import get_database
 from app.main import app
 from app.services.agents_client import AgentsClient, get_agents_client
+from app.services.documents import get_document_cache
 
 
 class StubAgentsClient(AgentsClient):
     def __init__(self, response: dict) -> None:
         self._response = response
 
-    async def run_workflow(self, conversation, documents=None, thread_id=None) -> dict:
+    async def run_workflow(
+        self, conversation, documents=None, thread_id=None, continuation=False
+    ) -> dict:
         self.last_conversation = list(conversation)  # type: ignore[attr-defined]
         self.last_documents = list(documents or [])  # type: ignore[attr-defined]
+        self.last_continuation = continuation  # type: ignore[attr-defined]
         return self._response
 
+    async def stream_workflow(
+        self, conversation, documents=None, thread_id=None, continuation=False
+    ):
+        self.last_documents = list(documents or [])  # type: ignore[attr-defined]
+        yield "started", {"thread_id": self._response["thread_id"]}
+        yield "assistant_token", {"token": "Thanks!"}
+        yield "result", self._response
+
 
 class StubCollection:
     def __init__(self) -> None:
@@ -38,6 +56,20 @@ class StubCollection:
                 return document
         return None
 
+    def find(self, query: dict, projection: dict | None = None) -> "StubCursor":
+        self.find_calls = getattr(self, "find_calls", 0) + 1
+        (key, condition), = query.items()
+        matches = [document for document in self.documents if document.get(key) in condition["$in"]]
+        return StubCursor([dict(document) for document in matches])
+
+
+class StubCursor:
+    def __init__(self, documents: list[dict]) -> None:
+        self._documents = documents
+
+    async def to_list(self, length=None) -> list[dict]:
+        return self._documents
+
 
 class StubDatabase(dict):
     def __getitem__(self, item: str) -> StubCollection:
@@ -46,37 +78,40 @@ class StubDatabase(dict):
         return super().__getitem__(item)
 
 
+RESPONSE_PAYLOAD = {
+    "summary": {
+        "project_title": "Test Project",
+        "target_users": ["designers"],
+        "success_metrics": ["increase adoption"],
+        "constraints": ["Budget"],
+        "timeline": "Q3",
+        "resources": ["Product roadmap"],
+        "documents": ["Discovery Doc"],
+        "opportunity_areas": ["Deliver the solution: Build the best app"],
+    },
+    "brief": {
+        "project_title": "Test Project",
+        "project_description": "Details",
+        "purpose": "Help teams stay productive.",
+        "expected_outcomes": ["increase adoption"],
+        "business_model": ["Subscription model"],
+        "constraints": ["Budget"],
+        "timeline": "Q3",
+        "target_users": ["designers"],
+        "documents": ["Discovery Doc"],
+        "opportunity_areas": ["Expand feature set"],
+        "suggested_reads": ["Add foundational research or industry reports to guide the team."],
+        "ideas_board": ["Capture brainstorm ideas and potential experiments here."],
+        "success_metrics": ["increase adoption"],
+    },
+    "follow_up_questions": ["What is the timeline?"],
+    "thread_id": "thread-123",
+    "assistant_message": "Thanks! I captured the target users and success metrics. Could you share the problem we are solving and the proposed solution?",
+}
+
+
 def test_run_brief_generation_endpoint_returns_brief(monkeypatch):
-    response_payload = {
-        "summary": {
-            "project_title": "Test Project",
-            "target_users": ["designers"],
-            "success_metrics": ["increase adoption"],
-            "constraints": ["Budget"],
-            "timeline": "Q3",
-            "resources": ["Product roadmap"],
-            "documents": ["Discovery Doc"],
-            "opportunity_areas": ["Deliver the solution: Build the best app"],
-        },
-        "brief": {
-            "project_title": "Test Project",
-            "project_description": "Details",
-            "purpose": "Help teams stay productive.",
-            "expected_outcomes": ["increase adoption"],
-            "business_model": ["Subscription model"],
-            "constraints": ["Budget"],
-            "timeline": "Q3",
-            "target_users": ["designers"],
-            "documents": ["Discovery Doc"],
-            "opportunity_areas": ["Expand feature set"],
-            "suggested_reads": ["Add foundational research or industry reports to guide the team."],
-            "ideas_board": ["Capture brainstorm ideas and potential experiments here."],
-            "success_metrics": ["increase adoption"],
-        },
-        "follow_up_questions": ["What is the timeline?"],
-        "thread_id": "thread-123",
-        "assistant_message": "Thanks! I captured the target users and success metrics. Could you share the problem we are solving and the proposed solution?",
-    }
+    response_payload = RESPONSE_PAYLOAD
     agents_stub = StubAgentsClient(response=response_payload)
     db_stub = StubDatabase()
 
@@ -90,6 +125,7 @@ def test_run_brief_generation_endpoint_returns_brief(monkeypatch):
     app.dependency_overrides[get_database] = override_db
 
     client = TestClient(app)
+    get_document_cache().clear()
     db_stub["documents"].documents.append({"id": "1", "name": "Discovery Doc", "text": "Remote teams notes"})
     payload = {
         "prompt": "Launch a new app for remote teams to stay organized.",
@@ -107,5 +143,317 @@ def test_run_brief_generation_endpoint_returns_brief(monkeypatch):
 
     stored_docs = db_stub["brief_runs"].documents
     assert stored_docs[0]["assistant_message"] == response_payload["assistant_message"]
+    assert stored_docs[0]["documents"] == [{"id": "1", "name": "Discovery Doc"}]
 
     app.dependency_overrides.clear()
+
+
+def test_continuation_forwards_only_new_turns():
+    agents_stub = StubAgentsClient(response=RESPONSE_PAYLOAD)
+    db_stub = StubDatabase()
+
+    async def override_agents() -> AgentsClient:
+        return agents_stub
+
+    async def override_db():
+        return db_stub
+
+    app.dependency_overrides[get_agents_client] = override_agents
+    app.dependency_overrides[get_database] = override_db
+
+    client = TestClient(app)
+    resp = client.post(
+        "/api/briefs/run",
+        json={
+            "conversation": [{"role": "user", "content": "Add offline support."}],
+            "thread_id": "thread-123",
+            "continuation": True,
+        },
+    )
+    missing_thread = client.post(
+        "/api/briefs/run",
+        json={"prompt": "Add offline support.", "continuation": True},
+    )
+
+    assert resp.status_code == 200
+    assert agents_stub.last_continuation is True
+    assert agents_stub.last_conversation == [{"role": "user", "content": "Add offline support."}]
+    assert missing_thread.status_code == 422
+
+    app.dependency_overrides.clear()
+
+
+def test_stream_brief_generation_forwards_events_and_persists_result():
+    agents_stub = StubAgentsClient(response=RESPONSE_PAYLOAD)
+    db_stub = StubDatabase()
+
+    async def override_agents() -> AgentsClient:
+        return agents_stub
+
+    async def override_db():
+        return db_stub
+
+    app.dependency_overrides[get_agents_client] = override_agents
+    app.dependency_overrides[get_database] = override_db
+
+    client = TestClient(app)
+    get_document_cache().clear()
+    db_stub["documents"].documents.append({"id": "1", "name": "Discovery Doc", "text": "Remote teams notes"})
+    with client.stream(
+        "POST",
+        "/api/briefs/stream",
+        json={"prompt": "Launch an app for remote teams.", "documents": [{"id": "1", "name": "Discovery Doc"}]},
+    ) as resp:
+        assert resp.status_code == 200
+        body = "".join(resp.iter_text())
+
+    frames = [frame for frame in body.split("\n\n") if frame]
+    assert [frame.split("\n", 1)[0] for frame in frames] == [
+        "event: started",
+        "event: assistant_token",
+        "event: result",
+    ]
+    result = json.loads(frames[-1].split("\n", 1)[1].removeprefix("data: "))
+    assert result["run_id"]
+    assert result["assistant_message"] == RESPONSE_PAYLOAD["assistant_message"]
+    assert agents_stub.last_documents[0]["text"] == "Remote teams notes"
+    assert db_stub["brief_runs"].documents[0]["thread_id"] == "thread-123"
+
+    app.dependency_overrides.clear()
+
+
+def test_run_propagates_trace_context_to_agents():
+    received: list[str | None] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        received.append(request.headers.get("traceparent"))
+        return httpx.Response(200, json=RESPONSE_PAYLOAD)
+
+    agents = AgentsClient(
+        base_url="http://agents", timeout_seconds=5, transport=httpx.MockTransport(handle)
+    )
+    db_stub = StubDatabase()
+
+    async def override_agents() -> AgentsClient:
+        return agents
+
+    async def override_db():
+        return db_stub
+
+    app.dependency_overrides[get_agents_client] = override_agents
+    app.dependency_overrides[get_database] = override_db
+    exporter = InMemorySpanExporter()
+    set_exporter(exporter)
+    try:
+        resp = TestClient(app).post("/api/briefs/run", json={"prompt": "Launch an app."})
+    finally:
+        set_exporter(None)
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 200
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    server = spans["POST /api/briefs/run"]
+    agents_call = spans["POST /workflow/run"]
+    forwarded = trace.get_current_span(parse_traceparent(received[0])).get_span_context()
+    assert forwarded.trace_id == server.context.trace_id
+    assert forwarded.span_id == agents_call.context.span_id
+    assert agents_call.parent.span_id == server.context.span_id
+    assert spans["mongo hydrate documents"].context.trace_id == server.context.trace_id
+    assert "mongo insert brief_runs" in spans
+
+
+def test_profiled_run_stores_a_folded_profile(monkeypatch, tmp_path):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "profiling_token", "secret")
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1.0)
+    monkeypatch.setattr(settings, "profiling_dir", tmp_path)
+    monkeypatch.setattr(settings, "profiling_max_files", 1)
+    agents_stub = StubAgentsClient(response=RESPONSE_PAYLOAD)
+    db_stub = StubDatabase()
+
+    async def override_agents() -> AgentsClient:
+        return agents_stub
+
+    async def override_db():
+        return db_stub
+
+    app.dependency_overrides[get_agents_client] = override_agents
+    app.dependency_overrides[get_database] = override_db
+    client = TestClient(app)
+    payload = {"prompt": "Launch an app."}
+    try:
+        unprofiled = client.post("/api/briefs/run", json=payload)
+        denied = client.post("/api/briefs/run", json=payload, headers={"X-Profile": "nope"})
+        earlier = client.post("/api/briefs/run", json=payload, headers={"X-Profile": "secret"})
+        profiled = client.post("/api/briefs/run", json=payload, headers={"X-Profile": "secret"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert "X-Profile-Id" not in unprofiled.headers
+    assert denied.status_code == 403
+    assert profiled.status_code == 200
+    assert profiled.json()["thread_id"] == "thread-123"
+    # Only the newest PROFILING_MAX_FILES profiles are kept.
+    stored = [path.name for path in tmp_path.glob("*-api-briefs-run-*.folded")]
+    assert len(stored) == 1
+    assert stored[0].endswith(f"-{profiled.headers['X-Profile-Id']}.folded")
+    assert earlier.headers["X-Profile-Id"] != profiled.headers["X-Profile-Id"]
+
+
+def test_hydration_batches_lookups_and_caches_texts():
+    agents_stub = StubAgentsClient(response=RESPONSE_PAYLOAD)
+    db_stub = StubDatabase()
+    for index in range(3):
+        db_stub["documents"].documents.append(
+            {"id": f"doc-{index}", "name": f"Doc {index}", "text": f"Notes {index}"}
+        )
+
+    async def override_agents() -> AgentsClient:
+        return agents_stub
+
+    async def override_db():
+        return db_stub
+
+    app.dependency_overrides[get_agents_client] = override_agents
+    app.dependency_overrides[get_database] = override_db
+    get_document_cache().clear()
+    payload = {
+        "prompt": "Launch an app.",
+        "documents": [{"id": f"doc-{index}", "name": f"Doc {index}"} for index in range(3)]
+        + [{"id": "unknown", "name": "Missing", "text": "inline"}],
+    }
+    try:
+        client = TestClient(app)
+        first = client.post("/api/briefs/run", json=payload)
+        second = client.post("/api/briefs/run", json=payload)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == second.status_code == 200
+    assert db_stub["documents"].find_calls == 2  # one $in per run; only "unknown" misses again
+    sent = agents_stub.last_documents
+    assert [doc["text"] for doc in sent] == ["Notes 0", "Notes 1", "Notes 2", "inline"]
+    assert all("search_index" not in doc for doc in sent)
+
+
+def test_run_skips_documents_still_parsing():
+    agents_stub = StubAgentsClient(response=RESPONSE_PAYLOAD)
+    db_stub = StubDatabase()
+    db_stub["documents"].documents.extend(
+        [
+            {"id": "ready", "name": "Ready", "text": "Parsed notes", "status": "ready"},
+            {"id": "slow", "name": "Slow", "text": None, "status": "parsing"},
+        ]
+    )
+
+    async def override_agents() -> AgentsClient:
+        return agents_stub
+
+    async def override_db():
+        return db_stub
+
+    settings = get_settings()
+    previous_wait = settings.parse_wait_seconds
+    settings.parse_wait_seconds = 0.3
+    app.dependency_overrides[get_agents_client] = override_agents
+    app.dependency_overrides[get_database] = override_db
+    get_document_cache().clear()
+    payload = {
+        "prompt": "Launch an app.",
+        "documents": [{"id": "ready", "name": "Ready"}, {"id": "slow", "name": "Slow"}],
+    }
+    try:
+        resp = TestClient(app).post("/api/briefs/run", json=payload)
+    finally:
+        settings.parse_wait_seconds = previous_wait
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 200
+    assert [doc["id"] for doc in agents_stub.last_documents] == ["ready"]
+    assert resp.json()["skipped_documents"] == [{"id": "slow", "name": "Slow", "status": "parsing"}]
+    # The first lookup plus the polls while waiting for "slow".
+    assert db_stub["documents"].find_calls > 1
+    assert get_document_cache().get_many(["slow"]) == {}
+
+
+def test_hydration_resolves_references_to_shared_content():
+    agents_stub = StubAgentsClient(response=RESPONSE_PAYLOAD)
+    db_stub = StubDatabase()
+    db_stub["documents"].documents.extend(
+        [
+            {"id": "ref-1", "name": "Deck", "sha256": "abc"},
+            {"id": "ref-2", "name": "Deck (copy)", "sha256": "abc"},
+        ]
+    )
+    db_stub["document_contents"].documents.append(
+        {
+            "sha256": "abc",
+            "status": "ready",
+            "text": "Shared deck notes",
+        }
+    )
+
+    async def override_agents() -> AgentsClient:
+        return agents_stub
+
+    async def override_db():
+        return db_stub
+
+    app.dependency_overrides[get_agents_client] = override_agents
+    app.dependency_overrides[get_database] = override_db
+    get_document_cache().clear()
+    payload = {
+        "prompt": "Launch an app.",
+        "documents": [{"id": "ref-1", "name": "Deck"}, {"id": "ref-2", "name": "Deck (copy)"}],
+    }
+    try:
+        resp = TestClient(app).post("/api/briefs/run", json=payload)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 200
+    sent = agents_stub.last_documents
+    assert [doc["text"] for doc in sent] == ["Shared deck notes", "Shared deck notes"]
+    # The agents load the search index by hash.
+    assert [doc["sha256"] for doc in sent] == ["abc", "abc"]
+    assert all("search_index" not in doc for doc in sent)
+    assert db_stub["document_contents"].find_calls == 1
+
+
+def test_paged_content_is_sent_as_page_offsets():
+    agents_stub = StubAgentsClient(response=RESPONSE_PAYLOAD)
+    db_stub = StubDatabase()
+    db_stub["documents"].documents.append({"id": "ref-1", "name": "Report", "sha256": "def"})
+    db_stub["document_contents"].documents.append(
+        {
+            "sha256": "def",
+            "status": "ready",
+            "pages": [[0, 120], [122, 300]],
+            "preview": "Executive summary",
+        }
+    )
+
+    async def override_agents() -> AgentsClient:
+        return agents_stub
+
+    async def override_db():
+        return db_stub
+
+    app.dependency_overrides[get_agents_client] = override_agents
+    app.dependency_overrides[get_database] = override_db
+    get_document_cache().clear()
+    try:
+        resp = TestClient(app).post(
+            "/api/briefs/run",
+            json={"prompt": "Launch an app.", "documents": [{"id": "ref-1", "name": "Report"}]},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 200
+    (sent,) = agents_stub.last_documents
+    assert sent["sha256"] == "def"
+    assert sent["pages"] == [[0, 120], [122, 300]]
+    assert sent.get("text") is None
+    (stored,) = db_stub["brief_runs"].documents[0]["documents"]
+    assert stored == {"id": "ref-1", "name": "Report", "sha256": "def"}
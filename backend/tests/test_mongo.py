@@ -0,0 +1,93 @@
+"""Tests for the Mongo index bootstrap."""
+
+import asyncio
+
+from pymongo.errors import OperationFailure
+
+from app.core.config import Settings
+from app.dependencies.mongo import ensure_indexes
+
+
+class StubCollection:
+    def __init__(self, conflict: bool = False) -> None:
+        self.indexes = []
+        self.dropped = []
+        self.conflict = conflict
+
+    async def create_indexes(self, models) -> list[str]:
+        self.indexes.extend(model.document for model in models)
+        return [model.document["name"] for model in models]
+
+    async def create_index(self, keys, **kwargs) -> str:
+        if self.conflict:
+            raise OperationFailure("Index already exists with different options", code=85)
+        self.indexes.append({"key": keys, **kwargs})
+        return kwargs["name"]
+
+    async def drop_index(self, name: str) -> None:
+        if not any(index.get("name") == name for index in self.indexes):
+            raise OperationFailure(f"index not found with name [{name}]", code=27)
+        self.indexes = [index for index in self.indexes if index.get("name") != name]
+        self.dropped.append(name)
+
+
+class StubDatabase(dict):
+    def __init__(self) -> None:
+        super().__init__()
+        self.commands = []
+
+    def __getitem__(self, item: str) -> StubCollection:
+        if item not in self:
+            self[item] = StubCollection()
+        return super().__getitem__(item)
+
+    async def command(self, name, value, **kwargs) -> dict:
+        self.commands.append((name, value, kwargs))
+        return {"ok": 1}
+
+
+def test_ensure_indexes_creates_lookup_indexes():
+    database = StubDatabase()
+
+    asyncio.run(ensure_indexes(database, Settings(BRIEF_RUNS_TTL_DAYS=0)))
+
+    (documents_index,) = database["documents"].indexes
+    assert dict(documents_index["key"]) == {"id": 1}
+    assert documents_index["unique"] is True
+    assert database["document_contents"].indexes[0]["unique"] is True
+    (chunks_index,) = database["document_index_chunks"].indexes
+    assert list(chunks_index["key"]) == ["sha256", "chunk"]
+    assert chunks_index["unique"] is True
+    (pages_index,) = database["document_pages"].indexes
+    assert list(pages_index["key"]) == ["sha256", "page"]
+    (runs_index,) = database["brief_runs"].indexes
+    assert list(runs_index["key"]) == ["thread_id", "created_at"]
+
+
+def test_ensure_indexes_adds_or_updates_ttl():
+    database = StubDatabase()
+    asyncio.run(ensure_indexes(database, Settings(BRIEF_RUNS_TTL_DAYS=30)))
+    assert database["brief_runs"].indexes[-1]["expireAfterSeconds"] == 30 * 86400
+
+    database = StubDatabase()
+    database["brief_runs"] = StubCollection(conflict=True)
+    asyncio.run(ensure_indexes(database, Settings(BRIEF_RUNS_TTL_DAYS=7)))
+    assert database.commands == [
+        (
+            "collMod",
+            "brief_runs",
+            {"index": {"keyPattern": {"created_at": 1}, "expireAfterSeconds": 7 * 86400}},
+        )
+    ]
+
+
+def test_ensure_indexes_drops_ttl_when_disabled():
+    database = StubDatabase()
+    asyncio.run(ensure_indexes(database, Settings(BRIEF_RUNS_TTL_DAYS=30)))
+    asyncio.run(ensure_indexes(database, Settings(BRIEF_RUNS_TTL_DAYS=0)))
+
+    assert database["brief_runs"].dropped == ["brief_runs_ttl"]
+    assert all("expireAfterSeconds" not in index for index in database["brief_runs"].indexes)
+
+    # Nothing to drop on a fresh database.
+    asyncio.run(ensure_indexes(StubDatabase(), Settings(BRIEF_RUNS_TTL_DAYS=0)))
@@ -1,6 +1,10 @@
 """Tests for upload endpoint."""
 
+import asyncio
+import hashlib
+from datetime import datetime, timedelta, timezone
 from io import BytesIO
+from pathlib import Path
 from tempfile import TemporaryDirectory
 
 from fastapi.testclient import TestClient
@@ -8,15 +12,87 @@ from fastapi.testclient import TestClient
 from app.dependencies.mongo import get_database
 from app.main import app
 from app.core.config import get_settings
+from app.services.documents import (
+    PAGE_SEPARATOR,
+    TEXT_PAGE_CHARS,
+    DocumentCache,
+    build_search_index,
+    extract_pages,
+    page_spans,
+    split_search_index,
+)
+from app.services.parsing import ParseQueue
+
+
+def matches(document: dict, query: dict) -> bool:
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(document, option) for option in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = document.get(key)
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$lt" in condition and not (value is not None and value < condition["$lt"]):
+                return False
+        elif document.get(key) != condition:
+            return False
+    return True
+
+
+def project(document: dict, projection: dict | None) -> dict:
+    shown = {key for key, value in (projection or {}).items() if value}
+    hidden = {key for key, value in (projection or {}).items() if not value}
+    return {
+        key: value
+        for key, value in document.items()
+        if key not in hidden and (not shown or key in shown)
+    }
 
 
 class StubCollection:
     def __init__(self) -> None:
         self.documents = []
+        self.updates = []
 
     async def insert_one(self, document: dict) -> None:
         self.documents.append(document)
 
+    async def insert_many(self, documents: list[dict]) -> None:
+        self.documents.extend(documents)
+
+    async def delete_many(self, query: dict) -> None:
+        self.documents = [document for document in self.documents if not matches(document, query)]
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False):
+        class Result:
+            upserted_id = None
+
+        if "$set" in update:
+            self.updates.append(update["$set"]["status"])
+        for document in self.documents:
+            if matches(document, query):
+                document.update(update.get("$set", {}))
+                return Result()
+        if upsert:
+            self.documents.append(dict(update["$setOnInsert"]))
+            Result.upserted_id = len(self.documents)
+        return Result()
+
+    async def find_one_and_update(self, query: dict, update: dict, projection=None):
+        for document in self.documents:
+            if matches(document, query):
+                before = dict(document)
+                document.update(update["$set"])
+                return before
+        return None
+
+    async def find_one(self, query: dict, projection: dict | None = None) -> dict | None:
+        for document in self.documents:
+            if matches(document, query):
+                return project(document, projection)
+        return None
+
 
 class StubDatabase(dict):
     def __getitem__(self, item: str) -> StubCollection:
@@ -45,6 +121,222 @@ def test_upload_document(monkeypatch):
         data = response.json()["document"]
         assert data["name"] == "notes.txt"
         assert data["id"]
-        assert "hello world" in stub_db["documents"].documents[0]["text"]
+        assert data["status"] == "pending"
+        assert data["text"] is None
+        assert data["sha256"] == hashlib.sha256(b"hello world").hexdigest()
+        assert data["size_bytes"] == 11
+        # TestClient returns once the background parse job has finished.
+        (content,) = stub_db["document_contents"].documents
+        assert stub_db["document_contents"].updates == ["parsing", "indexing", "ready"]
+        assert content["sha256"] == data["sha256"]
+        assert content["pages"] == [[0, 11]]
+        assert content["preview"] == "hello world"
+        assert "text" not in content
+        assert "search_index" not in content
+        (chunk,) = stub_db["document_index_chunks"].documents
+        assert (chunk["sha256"], chunk["chunk"]) == (data["sha256"], 0)
+        assert chunk["postings"]["hello"] == [[0, 1]]
+        (page,) = stub_db["document_pages"].documents
+        assert page == {"sha256": data["sha256"], "page": 0, "start": 0, "end": 11, "text": "hello world"}
+        (reference,) = stub_db["documents"].documents
+        assert reference["id"] == data["id"]
+        assert "text" not in reference
+
+        status = client.get(f"/api/uploads/{data['id']}")
+        assert status.status_code == 200
+        assert status.json()["document"]["status"] == "ready"
+        assert status.json()["document"]["text"] is None
+        assert status.json()["document"]["page_count"] == 1
+        assert status.json()["document"]["preview"] == "hello world"
+        assert client.get("/api/uploads/unknown").status_code == 404
 
         app.dependency_overrides.clear()
+
+
+def test_repeat_upload_reuses_stored_content():
+    settings = get_settings()
+    with TemporaryDirectory() as tmpdir:
+        settings.uploads_dir = tmpdir
+        stub_db = StubDatabase()
+
+        async def override_db():
+            return stub_db
+
+        app.dependency_overrides[get_database] = override_db
+        client = TestClient(app)
+        try:
+            first = client.post(
+                "/api/uploads",
+                files={"file": ("deck.txt", BytesIO(b"same bytes"), "text/plain")},
+            ).json()["document"]
+            second = client.post(
+                "/api/uploads",
+                files={"file": ("deck-copy.txt", BytesIO(b"same bytes"), "text/plain")},
+            ).json()["document"]
+        finally:
+            app.dependency_overrides.clear()
+
+        assert first["id"] != second["id"]
+        assert first["sha256"] == second["sha256"]
+        assert second["status"] == "ready"
+        # Parsed once, stored once, referenced twice.
+        assert stub_db["document_contents"].updates == ["parsing", "indexing", "ready"]
+        assert len(stub_db["document_contents"].documents) == 1
+        assert [doc["name"] for doc in stub_db["documents"].documents] == ["deck.txt", "deck-copy.txt"]
+        assert [path.name for path in Path(tmpdir).rglob("*") if path.is_file()] == [
+            f"{first['sha256']}.txt"
+        ]
+
+
+def test_upload_rejected_when_parse_queue_is_full(monkeypatch):
+    settings = get_settings()
+    with TemporaryDirectory() as tmpdir:
+        settings.uploads_dir = tmpdir
+        stub_db = StubDatabase()
+
+        async def override_db():
+            return stub_db
+
+        app.dependency_overrides[get_database] = override_db
+        monkeypatch.setattr(
+            "app.api.routes.uploads.get_parse_queue", lambda: ParseQueue(workers=1, max_queued=0)
+        )
+        try:
+            response = TestClient(app).post(
+                "/api/uploads",
+                files={"file": ("notes.txt", BytesIO(b"hello world"), "text/plain")},
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+        assert "documents" not in stub_db
+
+
+def test_abandoned_parses_are_requeued(tmp_path):
+    now = datetime.now(timezone.utc)
+    db = StubDatabase()
+    db["document_contents"].documents.extend(
+        [
+            {
+                "sha256": "stale",
+                "status": "parsing",
+                "storage_path": str(tmp_path / "stale.txt"),
+                "updated_at": now - timedelta(hours=1),
+            },
+            {
+                "sha256": "live",
+                "status": "parsing",
+                "storage_path": str(tmp_path / "live.txt"),
+                "updated_at": now,
+            },
+        ]
+    )
+    queue = ParseQueue(workers=1, max_queued=4)
+    runs = []
+
+    async def run(database, sha256, path):
+        runs.append((sha256, path))
+        queue.release()
+
+    queue.run = run
+
+    async def sweep():
+        queued = await queue.requeue_stale(db)
+        await asyncio.sleep(0)
+        return queued
+
+    assert asyncio.run(sweep()) == 1
+    assert runs == [("stale", tmp_path / "stale.txt")]
+    assert [content["status"] for content in db["document_contents"].documents] == [
+        "pending",
+        "parsing",
+    ]
+    assert queue.queued == 0
+
+
+def test_upload_over_limit_is_rejected():
+    settings = get_settings()
+    previous_limit = settings.max_upload_bytes
+    with TemporaryDirectory() as tmpdir:
+        settings.uploads_dir = tmpdir
+        stub_db = StubDatabase()
+
+        async def override_db():
+            return stub_db
+
+        app.dependency_overrides[get_database] = override_db
+        client = TestClient(app)
+        try:
+            settings.max_upload_bytes = 5
+            # Within the multipart allowance, so the limit trips while streaming.
+            response = client.post(
+                "/api/uploads",
+                files={"file": ("notes.txt", BytesIO(b"hello world"), "text/plain")},
+            )
+            assert response.status_code == 413
+            assert [path for path in Path(tmpdir).rglob("*") if path.is_file()] == []
+
+            # Far over the limit: refused from Content-Length alone.
+            response = client.post(
+                "/api/uploads",
+                files={"file": ("big.txt", BytesIO(b"x" * 200_000), "text/plain")},
+            )
+            assert response.status_code == 413
+            assert "documents" not in stub_db
+        finally:
+            settings.max_upload_bytes = previous_limit
+            app.dependency_overrides.clear()
+
+
+def test_text_files_are_cut_into_pages_at_paragraph_breaks(tmp_path):
+    paragraphs = [f"Paragraph {index} " + "x" * 4_000 for index in range(12)]
+    path = tmp_path / "notes.md"
+    path.write_text("\n\n".join(paragraphs), encoding="utf-8")
+
+    pages = extract_pages(path)
+
+    assert len(pages) > 1
+    assert all(len(page) <= TEXT_PAGE_CHARS for page in pages)
+    text = PAGE_SEPARATOR.join(pages)
+    assert text == "\n\n".join(paragraphs)
+    assert [text[start:end] for start, end in page_spans(pages)] == pages
+
+
+def test_build_search_index_windows_long_paragraphs():
+    text = "Our users are clinics.\n\n" + "filler " * 300 + "\n\nThe main risk is churn."
+
+    index = build_search_index(text, passage_chars=400)
+
+    spans = index["passages"]
+    assert len(spans) > 3
+    assert all(end - start <= 400 for start, end in spans)
+    assert index["postings"]["user"] == [[0, 1]]
+    last = len(spans) - 1
+    assert text[spans[last][0]:spans[last][1]].strip() == "The main risk is churn."
+    assert index["postings"]["risk"] == [[last, 1]]
+    assert len(index["lengths"]) == len(spans)
+
+
+def test_split_search_index_keeps_document_wide_positions():
+    text = "\n\n".join(f"Passage {index} mentions churn." for index in range(5))
+    index = build_search_index(text, passage_chars=400)
+
+    chunks = split_search_index(index, passages_per_chunk=2)
+
+    assert [len(chunk["passages"]) for chunk in chunks] == [2, 2, 1]
+    assert chunks[2]["postings"]["churn"] == [[4, 1]]
+    merged = [pair for chunk in chunks for pair in chunk["postings"]["churn"]]
+    assert merged == index["postings"]["churn"]
+    assert [span for chunk in chunks for span in chunk["passages"]] == index["passages"]
+
+
+def test_document_cache_counts_page_offsets_toward_its_size():
+    cache = DocumentCache(max_entries=10, max_chars=1_000)
+    paged = {"name": "Report", "text": None, "sha256": "abc", "pages": [[0, 10]] * 40}
+
+    cache.put("too-big", paged)
+    cache.put("small", {"name": "Notes", "text": "hello", "status": "ready"})
+
+    assert cache.get_many(["too-big", "small"]).keys() == {"small"}
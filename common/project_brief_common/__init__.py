@@ -0,0 +1 @@
+"""Code shared by the backend and agents services."""
@@ -0,0 +1,118 @@
+"""Timing harness shared by the micro-benchmark suites of both services.
+
+Each case is timed with `timeit`: the loop count is calibrated so one sample
+takes at least ~0.2s, then several samples are taken and the per-call median
+and minimum recorded. Results are compared against a committed baseline on
+the minimum, which is far less sensitive to noisy neighbours than the median;
+a case that got slower by more than the tolerance counts as a regression.
+Baselines are machine specific, so refresh them (``--update-baseline``) on the
+machine that runs the comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+# A case name and a factory. The factory runs right before the case is timed,
+# does any setup, and returns the callable to time.
+Case = tuple[str, Callable[[], Callable[[], Any]]]
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> dict[str, float]:
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    samples = [total / loops for total in timer.repeat(repeat=repeat, number=loops)]
+    return {
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "min_us": round(min(samples) * 1e6, 3),
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[dict[str, Any]]:
+    rows = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            rows.append({"name": name, "min_us": result["min_us"], "status": "new"})
+            continue
+        ratio = result["min_us"] / reference["min_us"]
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 - tolerance:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append(
+            {
+                "name": name,
+                "min_us": result["min_us"],
+                "baseline_us": reference["min_us"],
+                "ratio": round(ratio, 3),
+                "status": status,
+            }
+        )
+    return rows
+
+
+def main(suite: str, cases: list[Case], default_baseline: Path) -> None:
+    parser = argparse.ArgumentParser(description=f"Run the {suite} micro-benchmarks.")
+    parser.add_argument("--output", type=Path, help="Write results JSON here.")
+    parser.add_argument("--baseline", type=Path, default=default_baseline)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown before a case counts as a regression.",
+    )
+    parser.add_argument("--filter", default="", help="Only run cases containing this text.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Overwrite the baseline with these results instead of comparing.",
+    )
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    for name, factory in cases:
+        if args.filter in name:
+            results[name] = measure(factory(), repeat=args.repeat)
+            print(f"{name:<45} {results[name]['median_us']:>14.1f} us")  # noqa: T201
+
+    report = {
+        "suite": suite,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")  # noqa: T201
+        return
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; skipping comparison.")  # noqa: T201
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+    rows = compare(results, baseline, args.tolerance)
+    print()  # noqa: T201
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if "ratio" in row else "-"
+        print(f"{row['name']:<45} {ratio:>8}  {row['status']}")  # noqa: T201
+    if any(row["status"] == "regression" for row in rows):
+        sys.exit(1)
@@ -0,0 +1,139 @@
+"""Opt-in sampling profiler for single requests, shared by both services.
+
+A request that carries ``X-Profile: <PROFILING_TOKEN>`` (or
+``?profile=<token>``) is profiled: a background thread samples the Python
+stacks of the event-loop thread and the default executor's worker threads
+every ``PROFILING_INTERVAL_MS`` while the request runs. The samples are
+written under ``PROFILING_DIR`` in the folded-stack format
+(``frame;frame;frame count`` per line) read by ``flamegraph.pl``, speedscope
+and inferno. Only the newest ``PROFILING_MAX_FILES`` profiles are kept, and
+the response names the profile by an opaque ID in ``X-Profile-Id`` rather
+than by its server path.
+
+Sampling is wall-clock, so time spent awaiting I/O (MongoDB, the LLM, the
+agents service) shows up under the event loop's ``select``; other requests
+running at the same time appear in the profile too.
+"""
+
+from __future__ import annotations
+
+import hmac
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from uuid import uuid4
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY = "profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_SAMPLES_HEADER = "X-Profile-Samples"
+
+_SUFFIX = ".folded"
+
+# asyncio's default executor (``asyncio.to_thread``) names its threads this way.
+_EXECUTOR_PREFIX = "asyncio_"
+_LIBRARY_PATH = re.compile(r".*/(?:site-packages|lib/python\d+\.\d+)/(.*)")
+
+
+def is_authorized(supplied: str, token: str) -> bool:
+    """Whether ``supplied`` matches the configured token; no token disables profiling."""
+
+    return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
+
+
+class SamplingProfiler:
+    """Collect folded stacks of the calling thread and executor workers."""
+
+    def __init__(self, interval_seconds: float) -> None:
+        self._interval = interval_seconds
+        self._target = threading.get_ident()
+        self._stacks: Counter[str] = Counter()
+        self._labels: dict[object, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self.samples = 0
+
+    def __enter__(self) -> SamplingProfiler:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        """Return the profile in folded-stack format, heaviest stacks first."""
+
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def save(self, directory: Path, request_path: str, max_files: int) -> str:
+        """Write the folded profile under ``directory`` and return its ID.
+
+        The file is named ``<time>-<request path>-<ID>.folded``. Older
+        profiles beyond the newest ``max_files`` are deleted.
+        """
+
+        directory.mkdir(parents=True, exist_ok=True)
+        profile_id = uuid4().hex
+        slug = re.sub(r"[^a-z0-9]+", "-", request_path.lower()).strip("-") or "root"
+        path = directory / f"{time.strftime('%Y%m%dT%H%M%S')}-{slug}-{profile_id}{_SUFFIX}"
+        path.write_text(self.folded(), encoding="utf-8")
+        prune_profiles(directory, max_files, keep=path)
+        return profile_id
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        threads = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():  # noqa: SLF001 - sampling API
+            name = threads.get(ident, "")
+            if ident != self._target and not name.startswith(_EXECUTOR_PREFIX):
+                continue
+            stack = self._stack(frame)
+            if ident != self._target and stack.endswith(" _worker"):
+                # An idle executor thread blocked on its work queue.
+                continue
+            self._stacks[f"{'event-loop' if ident == self._target else name};{stack}"] += 1
+        self.samples += 1
+
+    def _stack(self, frame: FrameType | None) -> str:
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _label(code.co_filename, code.co_name)
+            labels.append(label)
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+
+def prune_profiles(directory: Path, max_files: int, keep: Path | None = None) -> None:
+    """Delete all but the newest ``max_files`` profiles in ``directory``.
+
+    ``keep`` (the profile just written) always survives: profiles saved in
+    quick succession can share a modification time.
+    """
+
+    others = sorted(
+        (path for path in directory.glob(f"*{_SUFFIX}") if path != keep),
+        key=lambda path: (path.stat().st_mtime_ns, path.name),
+        reverse=True,
+    )
+    for path in others[max(max_files, 1) - (keep is not None):]:
+        path.unlink(missing_ok=True)
+
+
+def _label(filename: str, function: str) -> str:
+    """``module/path.py function`` with site-packages and stdlib prefixes trimmed."""
+
+    path = filename.replace("\\", "/")
+    match = _LIBRARY_PATH.match(path)
+    path = match.group(1) if match else "/".join(path.split("/")[-2:])
+    return f"{path} {function}".replace(";", ":")
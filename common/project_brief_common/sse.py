@@ -0,0 +1,15 @@
+"""Server-Sent Events framing shared by the streaming endpoints of both services."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+def format_sse(event: str, data: dict[str, Any]) -> str:
+    """Serialize one Server-Sent Event frame.
+
+    Values JSON cannot encode (datetimes, ObjectIds) are sent as strings.
+    """
+
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
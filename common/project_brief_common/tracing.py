@@ -0,0 +1,174 @@
+"""OpenTelemetry tracing shared by the backend and the agents service.
+
+Each service binds a `ServiceTracing` to its name and settings (see
+``app.core.tracing`` and ``project_agents.tracing``). The backend opens a
+server span per request and forwards the context to the agents service in a
+``traceparent`` header; the agents endpoints continue that trace through
+their graph nodes, LLM calls and Mongo operations, so one request's latency
+can be broken down end to end. Finished spans go through a
+`BatchSpanProcessor`, which exports from a worker thread: as JSON lines to a
+file (``TRACE_EXPORTER=file``) or over OTLP/HTTP to a collector
+(``TRACE_EXPORTER=otlp``). With the default ``none`` a no-op tracer only
+carries the incoming context along.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Protocol
+
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanProcessor,
+)
+from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+
+_KINDS = {
+    "internal": trace.SpanKind.INTERNAL,
+    "server": trace.SpanKind.SERVER,
+    "client": trace.SpanKind.CLIENT,
+}
+_PROPAGATOR = TraceContextTextMapPropagator()
+
+
+class TraceSettings(Protocol):
+    """The settings fields `ServiceTracing` reads."""
+
+    trace_exporter: str
+    trace_file: Path
+    trace_otlp_endpoint: str
+
+
+class FileSpanExporter(ConsoleSpanExporter):
+    """Append one JSON object per finished span to a local file."""
+
+    def __init__(self, path: Path, service_name: str) -> None:
+        self._sink = path.open("a", encoding="utf-8")
+        super().__init__(
+            service_name=service_name,
+            out=self._sink,
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+
+    def shutdown(self) -> None:
+        self._sink.close()
+
+
+class ServiceTracing:
+    """Lazily configured tracer provider of one service."""
+
+    def __init__(self, service_name: str, settings: Callable[[], TraceSettings]) -> None:
+        self._service_name = service_name
+        self._settings = settings
+        self._provider: TracerProvider | None = None
+        self._configured = False
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def get_tracer(self) -> trace.Tracer:
+        """Return the service tracer; a no-op tracer when tracing is off."""
+
+        if not self._configured:
+            with self._lock:
+                if not self._configured:
+                    exporter = self._configured_exporter()
+                    if exporter is not None:
+                        self._provider = self._build_provider(BatchSpanProcessor(exporter))
+                    self._configured = True
+        if self._provider is None:
+            return trace.NoOpTracer()
+        return self._provider.get_tracer(self._service_name)
+
+    def set_exporter(self, exporter: SpanExporter | None) -> None:
+        """Replace the exporter (used in tests and scripts).
+
+        Spans are exported synchronously as they end, so they can be inspected
+        right after the traced call returns.
+        """
+
+        with self._lock:
+            if self._provider is not None:
+                self._provider.shutdown()
+            self._provider = None
+            if exporter is not None:
+                self._provider = self._build_provider(SimpleSpanProcessor(exporter))
+            self._configured = True
+
+    def shutdown(self) -> None:
+        """Flush pending spans and drop the provider."""
+
+        with self._lock:
+            if self._provider is not None:
+                self._provider.shutdown()
+            self._provider = None
+            self._configured = False
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        *,
+        parent: Context | None = None,
+        kind: str = "internal",
+        **attributes: Any,
+    ) -> Iterator[trace.Span]:
+        """Open a child of ``parent`` (or of the current span) for the block.
+
+        Under an unsampled parent the span is non-recording but still becomes
+        current, so nested spans inherit the decision instead of starting new
+        traces.
+        """
+
+        with self.get_tracer().start_as_current_span(
+            name, context=parent, kind=_KINDS[kind], attributes=attributes
+        ) as span:
+            yield span
+
+    def _build_provider(self, processor: SpanProcessor) -> TracerProvider:
+        provider = TracerProvider(resource=Resource.create({"service.name": self._service_name}))
+        provider.add_span_processor(processor)
+        return provider
+
+    def _configured_exporter(self) -> SpanExporter | None:
+        settings = self._settings()
+        if settings.trace_exporter == "file":
+            return FileSpanExporter(settings.trace_file, self._service_name)
+        if settings.trace_exporter == "otlp":
+            return OTLPSpanExporter(endpoint=settings.trace_otlp_endpoint)
+        return None
+
+
+def parse_traceparent(header: str | None) -> Context | None:
+    """Return the context of a W3C ``traceparent`` header; invalid headers are ignored."""
+
+    if not header:
+        return None
+    context = _PROPAGATOR.extract({"traceparent": header})
+    if not trace.get_current_span(context).get_span_context().is_valid:
+        return None
+    return context
+
+
+def current_traceparent() -> str | None:
+    """Return the ``traceparent`` header value for the current span, if any."""
+
+    carrier: dict[str, str] = {}
+    _PROPAGATOR.inject(carrier)
+    return carrier.get("traceparent")
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """Add attributes to the current span, if one is being recorded."""
+
+    trace.get_current_span().set_attributes(attributes)
@@ -18,6 +18,7 @@ function AppContent() {
     runWorkflow,
     isLoading,
     data,
+    skippedDocuments,
     error,
     reset,
   } = useBriefWorkflow()
@@ -49,6 +50,7 @@ function AppContent() {
           <ConversationHistory conversation={conversation} />
           <UploadsPlaceholder
             documents={documents}
+            skippedDocuments={skippedDocuments}
             onUpload={uploadDocument}
           />
           <ChatComposer onSend={handleSend} disabled={isLoading} />
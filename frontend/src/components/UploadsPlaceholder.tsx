@@ -1,12 +1,17 @@
 import { useState, type ChangeEvent } from 'react'
-import type { DocumentReference } from '../types/brief'
+import type { DocumentReference, SkippedDocument } from '../types/brief'
 
 interface UploadsPlaceholderProps {
   documents: DocumentReference[]
+  skippedDocuments?: SkippedDocument[]
   onUpload: (file: File) => Promise<void>
 }
 
-export function UploadsPlaceholder({ documents, onUpload }: UploadsPlaceholderProps) {
+export function UploadsPlaceholder({
+  documents,
+  skippedDocuments = [],
+  onUpload,
+}: UploadsPlaceholderProps) {
   const [isUploading, setUploading] = useState(false)
   const [error, setError] = useState<string | null>(null)
 
@@ -33,6 +38,12 @@ export function UploadsPlaceholder({ documents, onUpload }: UploadsPlaceholderPr
       </label>
       {isUploading && <span className="loading">Uploading...</span>}
       {error && <span className="error">{error}</span>}
+      {skippedDocuments.length > 0 && (
+        <p className="notice">
+          Still processing, left out of this brief (they will be included with your
+          next message): {skippedDocuments.map((doc) => doc.name).join(', ')}
+        </p>
+      )}
       {documents.length > 0 && (
         <ul>
           {documents.map((doc) => (
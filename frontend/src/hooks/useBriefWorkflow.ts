@@ -1,5 +1,5 @@
 import { useMutation } from '@tanstack/react-query'
-import { useState } from 'react'
+import { useRef, useState } from 'react'
 import { apiConfig } from '../config/api'
 import type {
   BriefPayload,
@@ -10,19 +10,45 @@ import type {
 
 const ENDPOINT = `${apiConfig.baseUrl}/briefs/run`
 
+interface SyncedState {
+  turns: number
+  documentIds: Set<string>
+}
+
+const emptySync = (): SyncedState => ({ turns: 0, documentIds: new Set() })
+
 export function useBriefWorkflow() {
   const [conversation, setConversation] = useState<ConversationTurn[]>([])
   const [documents, setDocuments] = useState<DocumentReference[]>([])
   const [threadId, setThreadId] = useState<string | undefined>(undefined)
+  // What the agents service already holds in its checkpoint for this thread.
+  const synced = useRef<SyncedState>(emptySync())
 
   const mutation = useMutation<BriefPayload, Error, BriefRunRequest>({
     mutationFn: async (payload) => {
-      const requestBody: BriefRunRequest = {
-        conversation: payload.conversation ?? conversation,
-        documents: payload.documents ?? documents,
-        prompt: payload.prompt,
-        thread_id: payload.thread_id ?? threadId,
-      }
+      const fullConversation = payload.conversation ?? conversation
+      const fullDocuments = payload.documents ?? documents
+      const activeThread = payload.thread_id ?? threadId
+      const continuation = Boolean(activeThread) && synced.current.turns > 0
+
+      // Continuing a thread only sends the new user turns and new documents.
+      const requestBody: BriefRunRequest = continuation
+        ? {
+            conversation: fullConversation
+              .slice(synced.current.turns)
+              .filter((turn) => turn.role === 'user'),
+            documents: fullDocuments.filter(
+              (doc) => !synced.current.documentIds.has(doc.id),
+            ),
+            thread_id: activeThread,
+            continuation: true,
+          }
+        : {
+            conversation: fullConversation,
+            documents: fullDocuments,
+            prompt: payload.prompt,
+            thread_id: activeThread,
+          }
 
       const response = await fetch(ENDPOINT, {
         method: 'POST',
@@ -33,7 +59,17 @@ export function useBriefWorkflow() {
       if (!response.ok) {
         throw new Error(`Workflow request failed: ${response.status}`)
       }
-      return (await response.json()) as BriefPayload
+      const data = (await response.json()) as BriefPayload
+      // Documents left out because they were still parsing go out again next run.
+      const skippedIds = new Set((data.skipped_documents ?? []).map((doc) => doc.id))
+      synced.current = {
+        // The assistant reply is appended to the conversation on success.
+        turns: fullConversation.length + (data.assistant_message ? 1 : 0),
+        documentIds: new Set(
+          fullDocuments.map((doc) => doc.id).filter((id) => !skippedIds.has(id)),
+        ),
+      }
+      return data
     },
     onSuccess: (data) => {
       setThreadId(data.thread_id)
@@ -74,6 +110,7 @@ export function useBriefWorkflow() {
     setConversation([])
     setDocuments([])
     setThreadId(undefined)
+    synced.current = emptySync()
     mutation.reset()
   }
 
@@ -85,6 +122,7 @@ export function useBriefWorkflow() {
     runWorkflow: mutation.mutate,
     isLoading: mutation.isPending,
     data: mutation.data,
+    skippedDocuments: mutation.data?.skipped_documents ?? [],
     error: mutation.error,
     reset,
     threadId,
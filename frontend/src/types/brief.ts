@@ -27,12 +27,19 @@ export interface LovableBrief {
   success_metrics: string[]
 }
 
+export interface SkippedDocument {
+  id: string
+  name: string
+  status: 'pending' | 'parsing' | 'indexing' | 'ready' | 'failed'
+}
+
 export interface BriefPayload {
   summary: SummaryPayload
   brief: LovableBrief
   follow_up_questions: string[]
   thread_id: string
   assistant_message: string
+  skipped_documents?: SkippedDocument[]
 }
 
 export interface ConversationTurn {
@@ -52,4 +59,5 @@ export interface BriefRunRequest {
   documents?: DocumentReference[]
   prompt?: string
   thread_id?: string
+  continuation?: boolean
 }